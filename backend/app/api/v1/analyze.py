@@ -12,12 +12,16 @@ Responsibilities
 - Compute content-addressable IDs and persist model XML safely.
 - Run sync predicate checks and summarize results deterministically.
 - Launch background pipeline jobs from multipart uploads (202 + Location).
+- Stream uploads to disk, hash and parser chunk by chunk (no full-body buffer).
+- Accept `.xml.gz`, `.xml.zst` and single-entry `.zip` exports (hash = XML).
 - Return typed contracts and caching headers for UI diffing.
 """
 
 from __future__ import annotations
 
+import io
 import logging
+from collections.abc import AsyncIterator
 
 from fastapi import (
     APIRouter,
@@ -25,21 +29,28 @@ from fastapi import (
     File,
     Form,
     HTTPException,
+    Query,
+    Request,
     Response,
     UploadFile,
 )
+from starlette.concurrency import run_in_threadpool
 
 from app.api.v1.serializers.jobs import to_job_payload as _payload
 from app.core import paths
 from app.core.config import settings
 from app.core.jobs_db import create_job, find_succeeded_by_sha, get_job
+from app.ingest.column_manifest import ingest_manifest
+from app.ingest.parquet_layout import layouts_from_spec
+from app.ingest.xml_source import sha256_xml
+from app.input_adapters.router import get_adapter
 from app.services.analysis import (
     post_ingest_best_effort,
     run_pipeline_job,
     run_sync_predicates,
 )
 from app.services.jobs import get_or_synthesize_job_row, persist_model_xml
-from app.utils.hashing import compute_sha256
+from app.services.upload_stream import CHUNK_BYTES, StreamingIngest, UploadTooLarge
 
 from .models import (
     AnalyzeContract,
@@ -65,7 +76,8 @@ def analyze(req: AnalyzeRequest, response: Response) -> AnalyzeContract:
     """
     Synchronous analysis (dev-only). For normal UI, use /upload + job polling.
     """
-    model_sha = compute_sha256(req.xml_bytes)
+    # Hash the decompressed XML so compressed and raw uploads share a model id.
+    model_sha = sha256_xml(io.BytesIO(req.xml_bytes))
     # Content-addressable ID: stable across identical files; used for idempotency.
     model_id = req.model_id or model_sha[:8]
     # Ensure XML exists (idempotent, no overwrite in sync path).
@@ -123,17 +135,72 @@ async def analyze_upload(
     version: str = Form(...),
     model_id: str | None = Form(None),
 ):
-    data = await file.read()
-    # Hard reject oversize uploads at the edge (consistent with infrastructure limits).
-    if len(data) > MAX_UPLOAD_MB * 1024 * 1024:
+    async def _chunks() -> AsyncIterator[bytes]:
+        # Read the (server-spooled) part in chunks instead of one `file.read()`.
+        while chunk := await file.read(CHUNK_BYTES):
+            yield chunk
+
+    return await _accept_upload(
+        _chunks(), response, background, vendor, version, model_id
+    )
+
+
+# Raw-body upload: parsing starts while the request body is still arriving.
+@router.post("/upload/stream", status_code=202)
+async def analyze_upload_stream(
+    request: Request,
+    response: Response,
+    background: BackgroundTasks,
+    vendor: Vendor = Query(...),
+    version: str = Query(...),
+    model_id: str | None = Query(None),
+):
+    # Cheap early reject when the client declares an oversize body.
+    declared = request.headers.get("content-length") or ""
+    if declared.isdigit() and int(declared) > MAX_UPLOAD_MB * 1024 * 1024:
         raise HTTPException(status_code=413, detail="file_too_large")
+    return await _accept_upload(
+        request.stream(), response, background, vendor, version, model_id
+    )
+
 
-    sha = compute_sha256(data)
+async def _accept_upload(
+    chunks: AsyncIterator[bytes],
+    response: Response,
+    background: BackgroundTasks,
+    vendor: Vendor,
+    version: str,
+    model_id: str | None,
+):
+    """Stream an upload through `StreamingIngest`, then create or reuse a job."""
+    try:
+        adapter = get_adapter(vendor.value, version)
+    except ValueError:
+        adapter = None  # unknown adapter: inferred types (pipeline decides)
+    column_types = adapter.column_types() if adapter else None
+    keep_columns = None
+    if settings.INGEST_COLUMNS == "lean":
+        keep_columns = ingest_manifest(adapter.primary_keys() if adapter else None)
+    upload = StreamingIngest(
+        column_types,
+        keep_columns=keep_columns,
+        cold=settings.INGEST_COLD_PARQUET,
+        layouts=layouts_from_spec(adapter.layouts()) if adapter else None,
+    )
+    try:
+        sha = await upload.consume(chunks)
+    except UploadTooLarge as e:
+        # Hard reject oversize uploads (consistent with infrastructure limits).
+        raise HTTPException(status_code=413, detail="file_too_large") from e
+    except ValueError as e:
+        # Corrupt .gz/.zst/.zip body (or a zip with more than one file).
+        raise HTTPException(status_code=400, detail=str(e)) from e
 
     # Reuse completed result if the same (sha, vendor, version) already succeeded
     # Idempotency: if (sha,vendor,version) already succeeded, skip to that job/result.
     existing = find_succeeded_by_sha(sha, vendor.value, version)
     if existing and existing.get("status") == "succeeded":
+        await run_in_threadpool(upload.abort)
         job_id = existing["id"]
         # Always read the canonical row so progress/message/timings/types are correct
         row = get_job(job_id)
@@ -157,11 +224,13 @@ async def analyze_upload(
     mid = model_id or sha[:8]
     job_id = create_job(sha, mid, vendor.value, version)
 
-    # Persist upload (overwrite if client re-uploads same id)
-    persist_model_xml(mid, data, overwrite=True)
+    # Move the staged upload into place (overwrite if client re-uploads same id);
+    # when the streaming parse succeeded, t_* are already published.
+    ingested = upload.parsed
+    await run_in_threadpool(upload.commit, mid)
 
-    # Kick off the pipeline in background
-    background.add_task(run_pipeline_job, job_id, mid)
+    # Kick off the pipeline in background (skips ingest if already done)
+    background.add_task(run_pipeline_job, job_id, mid, ingested=ingested)
 
     # Return a normalized snapshot (progress 0)
     row = get_or_synthesize_job_row(
@@ -75,6 +75,8 @@ class Settings(BaseSettings):
         "http://localhost:3000",
     ]
     MAX_UPLOAD_MB: int = 200
+    # Cap on the decompressed XML of a .gz/.zst/.zip upload (guards against bombs).
+    MAX_XML_MB: int = 4096
 
     # Internal/debug exposure (keep False in prod)
     EXPOSE_INTERNALS: bool = False
@@ -90,12 +92,94 @@ class Settings(BaseSettings):
     RAG_MAX_CARD_CHARS: int = 600
     DEFAULT_MODEL_ID: str = "14b92d4a"
 
-    # ---- DuckDB resource knobs (used by app.ingest.session / loader) ----
-    # Environment variables respected via existing prefix:
+    # ---- DuckDB resource knobs (resolved per connection by app.core.resources) ----
+    # Environment variables respected via existing prefix; unset means "derive
+    # from cgroup/host limits, divided across DUCKDB_JOBS":
     #   MBSE_DUCKDB_THREADS=4
     #   MBSE_DUCKDB_MEM=1GB
-    DUCKDB_THREADS: int = Field(4, ge=1, description="DuckDB PRAGMA threads")
-    DUCKDB_MEM: str = Field("1GB", description="DuckDB PRAGMA memory_limit")
+    DUCKDB_THREADS: int | None = Field(None, ge=1, description="DuckDB threads")
+    DUCKDB_MEM: str | None = Field(None, description="DuckDB memory_limit")
+    #   MBSE_DUCKDB_JOBS=4  → jobs sharing this host/container (set by batch runs)
+    DUCKDB_JOBS: int = Field(
+        1, ge=1, description="Concurrent jobs the CPU/memory budget is split across"
+    )
+    #   MBSE_DUCKDB_MEM_FRACTION=0.6  → leave more room for Python/Arrow buffers
+    DUCKDB_MEM_FRACTION: float = Field(
+        0.75, gt=0.0, le=1.0, description="Share of the memory limit given to DuckDB"
+    )
+    #   MBSE_DUCKDB_TEMP_DIR=/scratch/duckdb  → spill root (default data/duckdb_tmp)
+    DUCKDB_TEMP_DIR: Path | None = Field(
+        None, description="Root of per-process DuckDB temp_directory for spilling"
+    )
+
+    # ---- Pooled read connections (app.core.model_connections) ----
+    #   MBSE_MODEL_DB_POOL_SIZE=0      → no pooling (open per request)
+    #   MBSE_MODEL_DB_IDLE_TTL_S=30    → release file locks sooner
+    MODEL_DB_POOL_SIZE: int = Field(
+        8, ge=0, description="Model databases kept open for API reads (LRU)"
+    )
+    MODEL_DB_IDLE_TTL_S: float = Field(
+        300.0, gt=0, description="Seconds an unused model database stays open"
+    )
+
+    # ---- Ingest knobs (used by app.ingest.loader_duckdb) ----
+    #   MBSE_INGEST_ENGINE=one_pass  → parse the XML once (buffer rows per table)
+    #   MBSE_INGEST_ENGINE=fast      → one-pass with tag-filtered events (quickest)
+    #   MBSE_INGEST_ENGINE=parallel  → prescan <Table> ranges, parse in a process pool
+    INGEST_ENGINE: Literal["two_pass", "one_pass", "fast", "parallel"] = Field(
+        "two_pass", description="XML engine: discover+stream, single parse, or pool"
+    )
+    #   MBSE_INGEST_WORKERS=8  → unset means "one per CPU"
+    INGEST_WORKERS: int | None = Field(
+        None, ge=1, description="Worker processes for the parallel ingest engine"
+    )
+    #   MBSE_INGEST_OUTPUT=columnar  → Arrow batches straight to Parquet (needs pyarrow)
+    INGEST_OUTPUT: Literal["jsonl", "columnar"] = Field(
+        "jsonl", description="Row sink: per-table JSONL→COPY or Arrow→Parquet"
+    )
+    INGEST_BATCH_ROWS: int = Field(
+        10_000, ge=1, description="Rows per Arrow record batch in columnar mode"
+    )
+    #   MBSE_INGEST_PARALLEL_TABLES=2  → unset means "DuckDB threads (profile)"
+    INGEST_PARALLEL_TABLES: int | None = Field(
+        None, ge=1, description="Max concurrent per-table Parquet conversions"
+    )
+    #   MBSE_INGEST_STORAGE=table  → load t_* into model.duckdb (Parquet kept on disk)
+    INGEST_STORAGE: Literal["view", "table"] = Field(
+        "view", description="t_* as views over Parquet or native DuckDB tables"
+    )
+    #   MBSE_INGEST_PARQUET_STORE=false  → every model writes its own Parquet copies
+    INGEST_PARQUET_STORE: bool = Field(
+        True, description="Share identical tables via the content-addressed store"
+    )
+    #   MBSE_INGEST_EXTENSIONS=map  → <Extension> attributes in one MAP column
+    INGEST_EXTENSIONS: Literal["columns", "map", "json"] = Field(
+        "columns", description="Extension attributes as columns, a MAP or JSON"
+    )
+    #   MBSE_INGEST_COLUMNS=lean  → keep only the columns predicates/IR helpers read
+    INGEST_COLUMNS: Literal["full", "lean"] = Field(
+        "full", description="Ingest every column, or only the manifest's columns"
+    )
+    #   MBSE_INGEST_COLD_PARQUET=true  → lean models keep full tables in parquet/cold/
+    INGEST_COLD_PARQUET: bool = Field(
+        False, description="With lean columns, also keep full tables as cold Parquet"
+    )
+
+    # ---- Pipeline executor (used by app.core.orchestrator) ----
+    #   MBSE_PIPELINE_EXECUTOR=subprocess  → one interpreter per stage (isolation)
+    PIPELINE_EXECUTOR: Literal["inprocess", "subprocess"] = Field(
+        "inprocess", description="Run stages in this process or as subprocesses"
+    )
+
+    # ---- Batch pipeline knobs (used by app.services.batch) ----
+    #   MBSE_BATCH_WORKERS=4  → unset means "as many as cores and memory allow"
+    BATCH_WORKERS: int | None = Field(
+        None, ge=1, description="Max models processed concurrently in a batch"
+    )
+    #   MBSE_BATCH_JOB_MEM=3GB  → peak memory budgeted per model pipeline
+    BATCH_JOB_MEM: str = Field(
+        "2GB", description="Memory reserved per concurrent batch job"
+    )
 
     # ---- LLM sampling/context controls (validated to avoid provider 400s) ----
     LLM_TEMP: float = Field(0.2, ge=0.0, le=1.0, description="Sampling temperature")
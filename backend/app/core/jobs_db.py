@@ -25,6 +25,7 @@ import sqlite3
 import time
 import uuid
 from collections.abc import Mapping
+from contextlib import closing
 from typing import Any, Literal, NotRequired, TypedDict
 
 from app.core import paths
@@ -64,6 +65,8 @@ def _connect() -> sqlite3.Connection:
     -----
     - Enables WAL and sets synchronous=NORMAL for better read concurrency.
     - Uses `sqlite3.Row` so callers can access columns by name.
+    - Callers close it (`closing`): a handle left open across a fork (batch
+      workers) can reset the WAL from the child and lose committed rows.
     """
 
     paths.JOBS_DB.parent.mkdir(parents=True, exist_ok=True)
@@ -108,7 +111,7 @@ def ensure_initialized() -> None:
     - Applies WAL/synchronous PRAGMAs at the DB level.
     """
     paths.JOBS_DB.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(paths.JOBS_DB.as_posix(), timeout=30) as con:
+    with closing(sqlite3.connect(paths.JOBS_DB.as_posix(), timeout=30)) as con:
         # Set PRAGMAs once; journal_mode=WAL persists at the DB level.
         con.execute("PRAGMA journal_mode=WAL;")
         con.execute("PRAGMA synchronous=NORMAL;")
@@ -172,7 +175,7 @@ def find_succeeded_by_sha(sha256: str, vendor: str, version: str) -> JobLookup |
     -----
     - Uses `updated_at` ordering to pick the latest record.
     """
-    with _connect() as con:
+    with closing(_connect()) as con:
         cur = con.execute(
             """
             SELECT id, model_id, status FROM jobs
@@ -198,7 +201,7 @@ def create_job(sha256: str, model_id: str, vendor: str, version: str) -> str:
     """
     job_id = str(uuid.uuid4())
     now = int(time.time() * 1000)
-    with _connect() as con:
+    with closing(_connect()) as con:
         con.execute(
             """
             INSERT INTO jobs (id, sha256, model_id, vendor, version, status, progress, created_at, updated_at)
@@ -212,7 +215,7 @@ def create_job(sha256: str, model_id: str, vendor: str, version: str) -> str:
 
 def get_job(job_id: str) -> JobRow | None:
     """Load a job by id; parses timings and omits NULL fields."""
-    with _connect() as con:
+    with closing(_connect()) as con:
         cur = con.execute("SELECT * FROM jobs WHERE id=?", (job_id,))
         row = cur.fetchone()
     if not row:
@@ -223,7 +226,7 @@ def get_job(job_id: str) -> JobRow | None:
 
 def get_latest_job(model_id: str) -> JobRow | None:
     """Return most recent job for model_id (or None)."""
-    with _connect() as con:
+    with closing(_connect()) as con:
         cur = con.execute(
             "SELECT * FROM jobs WHERE model_id=? ORDER BY updated_at DESC LIMIT 1",
             (model_id,),
@@ -248,7 +251,7 @@ def update_status(
     - No error is raised if `job_id` does not exist (silent no-op).
     """
     now = int(time.time() * 1000)
-    with _connect() as con:
+    with closing(_connect()) as con:
         sets = ["status=?", "updated_at=?"]
         vals: list[object] = [status, now]
         if progress is not None:
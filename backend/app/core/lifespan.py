@@ -27,6 +27,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.core import jobs_db
+from app.core.model_connections import model_connections
 
 logger = logging.getLogger("maturity.lifespan")
 
@@ -59,6 +60,7 @@ async def lifespan(app: FastAPI):
             logger.info("shutdown begin")
             # clean up shared resources if initialized
             # await app.state.db.close()
+            model_connections.close_all()  # pooled model read connections
             logger.info("shutdown ok")
         except Exception:
             logger.exception("shutdown failed")
@@ -0,0 +1,264 @@
+# ------------------------------------------------------------
+# Module: app/core/model_connections.py
+# Purpose: Process-wide pool of DuckDB read connections, one per model.
+# ------------------------------------------------------------
+
+"""Pooled read connections to per-model DuckDB databases.
+
+API read paths used to `duckdb.connect` for every request, paying the file
+open, catalog load and object-cache warm-up each time. The pool keeps the
+most recently used model databases open and hands out cursors on them.
+
+Responsibilities
+----------------
+- Open `model.duckdb` on first use with the writers' configuration
+  (`open_duckdb`), so pooled readers and pipeline writers share one instance.
+- Hand out per-request cursors (`cursor(model_id)`), safe across threads.
+- Keep at most `MODEL_DB_POOL_SIZE` databases open, evicting the least
+  recently used; close databases idle for `MODEL_DB_IDLE_TTL_S`.
+- Drop a model's connection while a pipeline rebuilds it (`rebuilding`, which
+  waits for its cursors to come back), and reopen when the file was replaced
+  behind the pool's back.
+
+Notes
+-----
+- DuckDB refuses a second connection to a file in the same process with a
+  different configuration, so handles here are not opened read-only; read
+  paths must not write through them.
+- DuckDB locks the file: a handle held here blocks writers in other
+  processes. Pipeline runs in this process go through `rebuilding`; other
+  processes only wait for the idle TTL (a janitor thread closes idle entries).
+- While a model is rebuilt, readers get their own connection, which joins the
+  pipeline's database instance, so reads keep working during a run.
+- A connection is closed only once its last cursor is returned.
+- `MODEL_DB_POOL_SIZE=0` disables pooling (a connection per request).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import duckdb
+
+from app.core import paths
+from app.core.config import settings
+from app.ingest.duckdb_connection import open_duckdb
+
+log = logging.getLogger("maturity.core.model_connections")
+
+
+@dataclass
+class _Entry:
+    con: duckdb.DuckDBPyConnection
+    # (inode, mtime_ns) when opened; a different value means the file changed.
+    stamp: tuple[int, int]
+    last_used: float
+    leases: int = 0
+    stale: bool = False
+
+
+def _stamp(db_path: Path) -> tuple[int, int]:
+    st = db_path.stat()
+    return st.st_ino, st.st_mtime_ns
+
+
+def _open(db_path: Path) -> duckdb.DuckDBPyConnection:
+    # Same configuration as the pipeline's `open_duckdb`, never read_only:
+    # DuckDB rejects mixed configurations on one file within a process.
+    if not db_path.exists():  # a read-write open would create an empty database
+        raise FileNotFoundError(f"DuckDB not found: {db_path}")
+    return open_duckdb(db_path)
+
+
+def _close(model_id: str, entry: _Entry, reason: str) -> None:
+    try:
+        entry.con.close()
+    except Exception:  # pragma: no cover
+        log.debug("close failed model_id=%s", model_id, exc_info=True)
+    log.debug("model db closed model_id=%s reason=%s", model_id, reason)
+
+
+class ModelConnections:
+    """LRU of model read connections with idle expiry and invalidation."""
+
+    def __init__(
+        self,
+        max_open: int | None = None,
+        idle_ttl: float | None = None,
+        clock=time.monotonic,
+    ):
+        self.max_open = settings.MODEL_DB_POOL_SIZE if max_open is None else max_open
+        self.idle_ttl = settings.MODEL_DB_IDLE_TTL_S if idle_ttl is None else idle_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Signalled when a cursor is returned (`rebuilding` waits on it).
+        self._returned = threading.Condition(self._lock)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._rebuilding: dict[str, int] = {}
+        # Outstanding pooled cursors per model, including retired entries.
+        self._leases: dict[str, int] = {}
+        self._janitor: threading.Thread | None = None
+
+    # ---- public API ----
+    @contextmanager
+    def cursor(self, model_id: str) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Yield a cursor on `model_id`'s database (for reading only).
+
+        Raises `FileNotFoundError` when the model has no `model.duckdb`.
+        """
+        db_path = paths.duckdb_path(model_id)
+        entry = self._acquire(model_id, db_path)
+        if entry is None:  # pooling disabled or model being rebuilt
+            con = _open(db_path)
+            try:
+                yield con
+            finally:
+                con.close()
+            return
+        cur = entry.con.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+            self._release(model_id, entry)
+
+    def invalidate(self, model_id: str) -> None:
+        """Close `model_id`'s connection (after its open cursors are returned)."""
+        with self._lock:
+            entry = self._entries.pop(model_id, None)
+            if entry is not None:
+                self._retire(model_id, entry, "invalidated")
+
+    @contextmanager
+    def rebuilding(self, model_id: str) -> Iterator[None]:
+        """Keep `model_id` out of the pool while a pipeline writes its database.
+
+        Yields once every pooled cursor on the model has been returned and its
+        connection closed, so the pipeline never shares a stale handle.
+        """
+        with self._lock:
+            self._rebuilding[model_id] = self._rebuilding.get(model_id, 0) + 1
+            entry = self._entries.pop(model_id, None)
+            if entry is not None:
+                self._retire(model_id, entry, "rebuilding")
+            self._returned.wait_for(lambda: not self._leases.get(model_id))
+        try:
+            yield
+        finally:
+            with self._lock:
+                n = self._rebuilding.pop(model_id) - 1
+                if n:
+                    self._rebuilding[model_id] = n
+
+    def sweep(self) -> int:
+        """Close connections idle longer than the TTL; return how many closed."""
+        now = self._clock()
+        closed = 0
+        with self._lock:
+            for model_id, entry in list(self._entries.items()):
+                if entry.leases == 0 and now - entry.last_used >= self.idle_ttl:
+                    del self._entries[model_id]
+                    _close(model_id, entry, "idle")
+                    closed += 1
+        return closed
+
+    def close_all(self) -> None:
+        """Close every pooled connection (e.g. at application shutdown)."""
+        with self._lock:
+            while self._entries:
+                model_id, entry = self._entries.popitem(last=False)
+                self._retire(model_id, entry, "shutdown")
+
+    def stats(self) -> dict[str, object]:
+        """Open model ids (least recently used first) and outstanding cursors."""
+        with self._lock:
+            return {
+                "open": list(self._entries),
+                "leases": sum(e.leases for e in self._entries.values()),
+                "max_open": self.max_open,
+            }
+
+    # ---- internals ----
+    def _acquire(self, model_id: str, db_path: Path) -> _Entry | None:
+        if self.max_open <= 0:
+            return None
+        stamp = _stamp(db_path)  # raises FileNotFoundError for unknown models
+        with self._lock:
+            if self._rebuilding.get(model_id):
+                return None
+            entry = self._entries.get(model_id)
+            if entry is not None and entry.stamp != stamp:
+                # Rebuilt by another process since it was opened.
+                del self._entries[model_id]
+                self._retire(model_id, entry, "file changed")
+                entry = None
+            if entry is None:
+                entry = _Entry(_open(db_path), stamp, self._clock())
+                self._entries[model_id] = entry
+                log.debug("model db opened model_id=%s", model_id)
+                self._evict()
+                self._start_janitor()
+            self._entries.move_to_end(model_id)
+            entry.leases += 1
+            self._leases[model_id] = self._leases.get(model_id, 0) + 1
+            entry.last_used = self._clock()
+            return entry
+
+    def _release(self, model_id: str, entry: _Entry) -> None:
+        with self._lock:
+            entry.leases -= 1
+            entry.last_used = self._clock()
+            if entry.stale and entry.leases == 0:
+                _close(model_id, entry, "released")
+            n = self._leases.pop(model_id) - 1
+            if n:
+                self._leases[model_id] = n
+            self._returned.notify_all()
+
+    def _retire(self, model_id: str, entry: _Entry, reason: str) -> None:
+        """Close now, or when the last cursor comes back (lock held)."""
+        if entry.leases:
+            entry.stale = True
+        else:
+            _close(model_id, entry, reason)
+
+    def _evict(self) -> None:
+        """Close least recently used idle entries beyond `max_open` (lock held)."""
+        over = len(self._entries) - self.max_open
+        for model_id, entry in list(self._entries.items()):
+            if over <= 0:
+                break
+            if entry.leases == 0:
+                del self._entries[model_id]
+                _close(model_id, entry, "evicted")
+                over -= 1
+
+    def _start_janitor(self) -> None:
+        """Run `sweep` periodically while anything is open (lock held)."""
+        if self._janitor is not None and self._janitor.is_alive():
+            return
+        self._janitor = threading.Thread(
+            target=self._janitor_loop, name="model-db-janitor", daemon=True
+        )
+        self._janitor.start()
+
+    def _janitor_loop(self) -> None:
+        interval = max(1.0, self.idle_ttl / 2)
+        while True:
+            time.sleep(interval)
+            self.sweep()
+            with self._lock:
+                if not self._entries:
+                    self._janitor = None
+                    return
+
+
+# Process-wide pool used by the API read paths and the pipeline orchestrator.
+model_connections = ModelConnections()
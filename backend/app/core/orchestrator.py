@@ -10,23 +10,44 @@ Responsibilities
 ----------------
 - Create/validate the per-model directory layout.
 - Ingest XML into DuckDB (optional overwrite).
-- Build the IR tables required by downstream steps.
+- Build the IR tables required by downstream steps, including the `irx.*`
+  helpers predicates declare (so every caller of the pipeline gets them).
 - Execute predicates to produce evidence and (optionally) a summary.
 - Enforce a hard guardrail that evidence exists before continuing.
 - Build the per-model RAG index adjacent to evidence artifacts.
-- Return a lightweight manifest of key artifact paths.
+- Return a lightweight manifest of key artifact paths and per-stage timings.
+
+Notes
+-----
+- The default "inprocess" executor calls the stage functions directly, so
+  interpreter start-up, imports and DuckDB opens are paid once; "subprocess"
+  keeps one interpreter per stage for isolation (`PIPELINE_EXECUTOR`).
 """
 
 from __future__ import annotations
 
 import hashlib
 import json
+import logging
 import subprocess
 import sys
-from dataclasses import dataclass
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from app.core import paths
+from app.core.config import settings
+from app.core.model_connections import model_connections
+from app.core.stage_manifest import StageManifest, file_digest, fingerprint
+from app.ingest.xml_source import sha256_xml
+from app.utils.timing import log_timer
+
+log = logging.getLogger("maturity.core.orchestrator")
+
+# Stage executors: direct calls on a shared connection, or one process per stage.
+EXECUTORS = ("inprocess", "subprocess")
 
 
 def _run(cmd: list[str], *, cwd: Path | None = None) -> None:
@@ -58,18 +79,251 @@ def _run(cmd: list[str], *, cwd: Path | None = None) -> None:
 
 
 def compute_model_id(xml_path: Path) -> str:
-    """Return a stable short ID (sha256[:8]) derived from XML file bytes.
+    """Return a stable short ID (sha256[:8]) derived from the XML content.
 
     Notes
     -----
     - Reads the file in 1 MiB chunks (memory-friendly for large inputs).
+    - Compressed exports (.gz/.zst/.zip) hash their decompressed XML, so the
+      ID does not depend on how the export was shipped.
     - Output is deterministic; use as an idempotent run key.
     """
-    h = hashlib.sha256()
-    with open(xml_path, "rb") as f:
-        for chunk in iter(lambda: f.read(1 << 20), b""):
-            h.update(chunk)
-    return h.hexdigest()[:8]
+    return sha256_xml(xml_path)[:8]
+
+
+def _ingest_config(vendor: str, version: str, storage: str | None) -> dict:
+    """Settings that change what the loader writes (not how fast it runs)."""
+    return {
+        "vendor": vendor,
+        "version": version,
+        "storage": storage or settings.INGEST_STORAGE,
+        "engine": settings.INGEST_ENGINE,
+        "output": settings.INGEST_OUTPUT,
+        "columns": settings.INGEST_COLUMNS,
+        "cold_parquet": settings.INGEST_COLD_PARQUET,
+        "extensions": settings.INGEST_EXTENSIONS,
+    }
+
+
+def _schema_digest() -> str:
+    """sha256 of the RAG schema DDL (part of the rag stage's config)."""
+    return hashlib.sha256(paths.schema_sql_text().encode("utf-8")).hexdigest()
+
+
+def _stage_outputs(model_id: str) -> dict[str, tuple[Path, ...]]:
+    """Artifacts each stage leaves behind; a stage with one missing reruns."""
+    db = paths.duckdb_path(model_id)
+    return {
+        "ingest": (db,),
+        "ir": (db,),
+        "predicates": (paths.evidence_jsonl(model_id), paths.summary_json(model_id)),
+        "rag": (paths.rag_sqlite(model_id),),
+    }
+
+
+class _Plan:
+    """Which stages of one run execute, with their fingerprints and timings.
+
+    A requested stage runs when it is forced, when its recorded fingerprint
+    differs (or an output is missing), or when an earlier stage ran.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        manifest: StageManifest,
+        fingerprints: dict[str, str | None],
+        wanted: set[str],
+        force: set[str],
+        helpers: tuple[str, ...] = (),
+    ):
+        self.model_id = model_id
+        self.manifest = manifest
+        self.fingerprints = fingerprints
+        self.wanted = wanted
+        self.force = force
+        # irx helpers the IR stage builds (declared by predicates).
+        self.helpers = helpers
+        self.timings: dict[str, float] = {}
+        self.skipped: list[str] = []
+        self._outputs = _stage_outputs(model_id)
+
+    def runs(self, stage: str) -> bool:
+        """Decide (once per stage, in pipeline order) whether `stage` runs."""
+        if stage not in self.wanted:
+            return False
+        current = (
+            stage not in self.force
+            and not self.timings  # nothing upstream ran in this invocation
+            and self.manifest.is_current(stage, self.fingerprints.get(stage))
+            and all(p.exists() for p in self._outputs[stage])
+        )
+        if current:
+            self.skipped.append(stage)
+            log.info("stage-%s unchanged; skipped model_id=%s", stage, self.model_id)
+        return not current
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Run one stage: forget it (and later stages), time it, record it."""
+        self.manifest.begin(name)
+        t0 = time.perf_counter()
+        try:
+            with log_timer(f"stage-{name}", logger=log, model_id=self.model_id):
+                yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - t0, 3)
+        self.manifest.complete(name, self.fingerprints.get(name), self.timings[name])
+
+
+def _steps_subprocess(
+    *,
+    plan: _Plan,
+    model_dir: Path,
+    xml_path: Path | None,
+    vendor: str,
+    version: str,
+    storage: str | None,
+    base_model_id: str | None,
+) -> None:
+    """Steps 1-3, each in its own interpreter (`python -m ...`)."""
+    model_id = plan.model_id
+    # Step 1: Ingest XML → per-model DuckDB (optionally overwrite artifacts).
+    if plan.runs("ingest"):
+        assert xml_path is not None
+        cmd = [
+            sys.executable,
+            "-m",
+            "app.ingest.loader_duckdb",
+            "--xml",
+            str(xml_path),
+            "--model-id",
+            model_id,
+        ]
+        if "ingest" in plan.force:
+            cmd.append("--overwrite")
+        if storage:
+            cmd += ["--storage", storage]
+        if base_model_id:
+            cmd += ["--base-model-id", base_model_id]
+        if vendor:
+            # Lets the loader apply the adapter's typed column schema.
+            cmd += ["--vendor", vendor, "--version", version]
+        with plan.stage("ingest"):
+            _run(cmd)
+
+    # Step 2: Build IR from the ingested tables.
+    if plan.runs("ir"):
+        with plan.stage("ir"):
+            _run(
+                [
+                    sys.executable,
+                    "-m",
+                    "app.ingest.build_ir",
+                    "--model-dir",
+                    str(model_dir),
+                    "--helpers",
+                    ",".join(plan.helpers),
+                ]
+            )
+
+    # Step 3: Run deterministic predicates (evidence.jsonl, optional summary).
+    if plan.runs("predicates"):
+        cmd = [
+            sys.executable,
+            "-u",
+            "-m",
+            "app.criteria.runner",
+            "--model-dir",
+            str(model_dir),
+        ]
+        if vendor:
+            cmd += ["--vendor", vendor]
+        if version:
+            cmd += ["--version", version]
+        with plan.stage("predicates"):
+            _run(cmd)
+
+
+def _steps_inprocess(
+    *,
+    plan: _Plan,
+    model_dir: Path,
+    xml_path: Path | None,
+    vendor: str,
+    version: str,
+    storage: str | None,
+    base_model_id: str | None,
+) -> None:
+    """Steps 1-3 in this process on one tuned DuckDB connection."""
+    # Deferred imports: lxml/pyarrow and the predicate modules load only when
+    # the pipeline runs (and the API package imports this module).
+    from app.criteria.protocols import Context
+    from app.criteria.runner import run_and_summarize
+    from app.ingest.build_ir import build_ir
+    from app.ingest.duckdb_connection import open_duckdb
+    from app.ingest.incremental import ingest_xml_delta
+    from app.ingest.loader_duckdb import ingest_xml
+
+    model_id = plan.model_id
+    db_path = model_dir / "model.duckdb"
+    con = None
+
+    def _shared(create: bool = False):
+        nonlocal con
+        if con is None:
+            if not create and not db_path.exists():
+                raise FileNotFoundError(
+                    f"DuckDB not found: {db_path}. Run loader first."
+                )
+            con = open_duckdb(db_path)
+        return con
+
+    try:
+        if plan.runs("ingest"):
+            assert xml_path is not None
+            with plan.stage("ingest"):
+                if base_model_id:
+                    # Starts from a copy of the base database file, so the
+                    # shared connection is opened afterwards.
+                    ingest_xml_delta(
+                        xml_path,
+                        base_model_id,
+                        model_id=model_id,
+                        storage=storage,
+                        vendor=vendor or None,
+                        version=version,
+                    )
+                else:
+                    # Opened lazily: the "parallel" engine forks its parse
+                    # workers first, and must not fork with DuckDB live.
+                    ingest_xml(
+                        xml_path,
+                        model_id=model_id,
+                        overwrite="ingest" in plan.force,
+                        storage=storage,
+                        vendor=vendor or None,
+                        version=version,
+                        con=lambda: _shared(create=True),
+                    )
+
+        if plan.runs("ir"):
+            with plan.stage("ir"):
+                build_ir(model_dir, con=_shared(), helpers=plan.helpers)
+
+        if plan.runs("predicates"):
+            ctx = Context(
+                vendor=vendor,
+                version=version,
+                model_dir=model_dir,
+                model_id=model_id,
+                output_root=paths.MODELS_DIR,
+            )
+            with plan.stage("predicates"):
+                run_and_summarize(_shared(), ctx)
+    finally:
+        if con is not None:
+            con.close()
 
 
 @dataclass(frozen=True)
@@ -84,11 +338,17 @@ class RunResult:
         Root directory for all per-model artifacts.
     artifacts : dict
         Paths to key outputs (values are strings; some may be None).
+    timings : dict
+        Wall seconds per stage that ran ("ingest", "ir", "predicates", "rag").
+    skipped : tuple
+        Requested stages skipped because their fingerprint was unchanged.
     """
 
     model_id: str
     model_dir: Path
     artifacts: dict
+    timings: dict = field(default_factory=dict)
+    skipped: tuple = ()
 
 
 def run(
@@ -100,6 +360,9 @@ def run(
     run_predicates: bool = True,
     vendor: str = "",
     version: str = "",
+    storage: str | None = None,
+    base_model_id: str | None = None,
+    executor: str | None = None,
 ) -> RunResult:
     """Execute the pipeline end-to-end for a given model_id.
 
@@ -119,15 +382,27 @@ def run(
     xml_path : Path | None
         XML source to ingest. If None, reuse existing ingested data.
     overwrite : bool
-        If True, re-ingest and overwrite prior artifacts for this model.
+        If True, re-ingest (and rerun later stages) even when unchanged.
     build_rag : bool
         If True, create/refresh the RAG index after predicates complete.
     run_predicates : bool
         If True, execute predicate runner to generate evidence.
     vendor : str
-        Optional vendor name passed through to the predicate runner.
+        Optional vendor name passed through to the loader (typed columns)
+        and the predicate runner.
     version : str
-        Optional vendor version passed through to the predicate runner.
+        Optional vendor version passed through with `vendor`.
+    storage : str | None
+        Per-model override for how `t_*` are published ("view" | "table");
+        None uses `settings.INGEST_STORAGE`.
+    base_model_id : str | None
+        Ingest `xml_path` as a revision of this model: the base DuckDB is
+        copied and only the row delta is applied.
+    executor : str | None
+        "inprocess" calls the stage functions directly and shares one DuckDB
+        connection across ingest, IR and predicates; "subprocess" runs each
+        stage as `python -m ...` (isolation). None uses
+        `settings.PIPELINE_EXECUTOR`.
 
     Returns
     -------
@@ -139,49 +414,83 @@ def run(
     - Raises RuntimeError if predicates emit no evidence (fast fail).
     - Safe to call multiple times with the same `model_id` (idempotent layout).
     - Some artifacts may be None if a step was skipped (e.g., RAG disabled).
+    - Stages whose fingerprint in `stages.json` is unchanged are skipped;
+      after a failure, a rerun resumes at the first stage that did not
+      complete (see `app.core.stage_manifest`).
+    - The model's pooled read connection is closed while steps 1-3 run and
+      reopened on the next read (`model_connections.rebuilding`).
     """
 
     # Ensure the standard per-model directory layout exists (e.g., evidence/, parquet/).
     model_dir = paths.ensure_model_dirs(model_id)
     model_dir.mkdir(parents=True, exist_ok=True)
 
-    # Step 1: Ingest XML → per-model DuckDB (optionally overwrite existing artifacts).
-    if xml_path is not None:
-        cmd = [
-            sys.executable,
-            "-m",
-            "app.ingest.loader_duckdb",
-            "--xml",
-            str(xml_path),
-            "--model-id",
-            model_id,
-        ]
-        if overwrite:
-            cmd.append("--overwrite")
-        _run(cmd)
+    executor = executor or settings.PIPELINE_EXECUTOR
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"unknown pipeline executor '{executor}' (expected {EXECUTORS})"
+        )
+    steps = _steps_inprocess if executor == "inprocess" else _steps_subprocess
 
-    # Step 2: Build IR from the ingested tables.
-    _run([sys.executable, "-m", "app.ingest.build_ir", "--model-dir", str(model_dir)])
+    # Fingerprints chain: each stage's input is the previous stage's output.
+    manifest = StageManifest(model_dir)
+    if xml_path is not None:
+        base_fp = (
+            StageManifest(paths.model_dir(base_model_id)).fingerprint("ingest")
+            if base_model_id
+            else ""
+        )
+        ingest_fp = fingerprint(
+            "ingest",
+            {"xml": sha256_xml(xml_path), "base": base_fp},
+            _ingest_config(vendor, version, storage),
+        )
+    else:
+        ingest_fp = manifest.fingerprint("ingest")
+    # Deferred import: predicate modules load only when the pipeline runs.
+    from app.criteria.loader import declared_helpers
 
-    # Step 3: Run deterministic predicates (produces evidence.jsonl and optional summary).
+    helpers = tuple(sorted({h for hs in declared_helpers().values() for h in hs}))
+    ir_fp = fingerprint("ir", {"ingest": ingest_fp}, {"helpers": helpers})
+    fingerprints = {
+        "ingest": ingest_fp,
+        "ir": ir_fp,
+        "predicates": fingerprint(
+            "predicates", {"ir": ir_fp}, {"vendor": vendor, "version": version}
+        ),
+    }
+    wanted = {"ir"}
+    if xml_path is not None:
+        wanted.add("ingest")
     if run_predicates:
-        cmd = [
-            sys.executable,
-            "-u",
-            "-m",
-            "app.criteria.runner",
-            "--model-dir",
-            str(model_dir),
-        ]
-        if vendor:
-            cmd += ["--vendor", vendor]
-        if version:
-            cmd += ["--version", version]
-        _run(cmd)
+        wanted.add("predicates")
+    if build_rag:
+        wanted.add("rag")
+    plan = _Plan(
+        model_id,
+        manifest,
+        fingerprints,
+        wanted,
+        {"ingest"} if overwrite else set(),
+        helpers,
+    )
+
+    # Pooled read handles would hold the file lock these steps write under.
+    with model_connections.rebuilding(model_id):
+        steps(
+            plan=plan,
+            model_dir=model_dir,
+            xml_path=xml_path,
+            vendor=vendor,
+            version=version,
+            storage=storage,
+            base_model_id=base_model_id,
+        )
 
     # Hard guardrail: predicates must emit evidence; fail early if empty.
+    # (Callers that evaluate themselves, like the sync analyze path, skip it.)
     ej = paths.evidence_jsonl(model_id)
-    if not ej.exists() or ej.stat().st_size == 0:
+    if run_predicates and (not ej.exists() or ej.stat().st_size == 0):
         raise RuntimeError(f"predicates emitted no evidence: expected {ej.as_posix()}")
 
     # If the runner didn't write a summary, emit a minimal stub for UI consumption.
@@ -208,8 +517,22 @@ def run(
 
     # Step 4: Build per-model RAG index (rag.sqlite) next to evidence.
     rag_db = None
+    # The index is built from evidence.jsonl, whatever produced it.
+    plan.fingerprints["rag"] = fingerprint(
+        "rag", {"evidence": file_digest(ej)}, {"schema": _schema_digest()}
+    )
+    if plan.runs("rag"):
+        with plan.stage("rag"):
+            if executor == "inprocess":
+                from app.rag.bootstrap_index import build_index
+
+                build_index(ej)
+            else:
+                _run(
+                    [sys.executable, "-m", "app.rag.bootstrap_index", str(ej)],
+                    cwd=model_dir,
+                )
     if build_rag:
-        _run([sys.executable, "-m", "app.rag.bootstrap_index", str(ej)], cwd=model_dir)
         rag_db = paths.rag_sqlite(model_id)
 
     # Return paths to key artifacts so callers (API/tests) can link or inspect.
@@ -220,4 +543,17 @@ def run(
         "rag_sqlite": str(rag_db) if rag_db else None,
         "model_dir": str(model_dir),
     }
-    return RunResult(model_id=model_id, model_dir=model_dir, artifacts=artifacts)
+    log.info(
+        "pipeline done model_id=%s executor=%s timings=%s skipped=%s",
+        model_id,
+        executor,
+        plan.timings,
+        plan.skipped,
+    )
+    return RunResult(
+        model_id=model_id,
+        model_dir=model_dir,
+        artifacts=artifacts,
+        timings=plan.timings,
+        skipped=tuple(plan.skipped),
+    )
@@ -25,8 +25,17 @@ APP_ROOT: Path = BACKEND_ROOT / "app"
 DATA_DIR: Path = BACKEND_ROOT / "data"
 MODELS_DIR: Path = DATA_DIR / "models"
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
+# Per-table Parquet shared by all models (see app.ingest.parquet_store).
+PARQUET_STORE_DIR: Path = DATA_DIR / "parquet_store"
 RAG_DIR: Path = APP_ROOT / "rag"
 JOBS_DB: Path = (DATA_DIR / "jobs.sqlite").resolve()
+# Stored export per codec (see app.ingest.xml_source); kept compressed on disk.
+MODEL_XML_NAMES: dict[str, str] = {
+    "xml": "model.xml",
+    "gzip": "model.xml.gz",
+    "zstd": "model.xml.zst",
+    "zip": "model.zip",
+}
 
 
 # ---- Repository Paths ----
@@ -49,8 +58,33 @@ def model_dir(model_id: str) -> Path:
 
 
 def xml_path(model_id: str) -> Path:
-    """Return the path to `model.xml` for a given model."""
-    return (model_dir(model_id) / "model.xml").resolve()
+    """Return the path to a model's stored export.
+
+    Notes
+    -----
+    - Returns the first existing `MODEL_XML_NAMES` entry (raw or compressed).
+    - Falls back to `model.xml` when nothing has been stored yet.
+    """
+    mdir = model_dir(model_id)
+    for name in MODEL_XML_NAMES.values():
+        if (mdir / name).exists():
+            return (mdir / name).resolve()
+    return (mdir / MODEL_XML_NAMES["xml"]).resolve()
+
+
+def replace_xml_path(model_id: str, codec: str) -> Path:
+    """Return where a `codec` export of the model goes; drop other stored variants.
+
+    Notes
+    -----
+    - Keeps exactly one stored export per model, so `xml_path` is unambiguous.
+    """
+    mdir = model_dir(model_id)
+    target = MODEL_XML_NAMES[codec]
+    for name in MODEL_XML_NAMES.values():
+        if name != target:
+            (mdir / name).unlink(missing_ok=True)
+    return (mdir / target).resolve()
 
 
 def duckdb_path(model_id: str) -> Path:
@@ -127,6 +161,7 @@ def log_path_map() -> dict[str, str]:
         "APP_ROOT": str(APP_ROOT),
         "DATA_DIR": str(DATA_DIR),
         "MODELS_DIR": str(MODELS_DIR),
+        "PARQUET_STORE_DIR": str(PARQUET_STORE_DIR),
         "RAG_DIR": str(RAG_DIR),
         "JOBS_DB": str(JOBS_DB),
         "schema.sql (pkg)": "app/rag/schema.sql",
@@ -0,0 +1,240 @@
+# ------------------------------------------------------------
+# Module: app/core/resources.py
+# Purpose: Size DuckDB threads, memory and spill space from cgroup/host limits.
+# ------------------------------------------------------------
+
+"""Resource profile for DuckDB connections.
+
+Fixed `threads=4` / `memory_limit=1GB` defaults waste cores on big hosts and
+get containers OOM-killed when several jobs share a small one. The profile
+starts from what this process may actually use (cgroup CPU quota and memory
+limit, else the host), divides it across the jobs running concurrently, and
+is applied to every DuckDB connection the backend opens
+(`app.ingest.duckdb_connection`).
+
+Responsibilities
+----------------
+- Read cgroup v2 (`cpu.max`, `memory.max`) or v1 (`cpu.cfs_*`,
+  `memory.limit_in_bytes`) limits; fall back to CPU affinity and RAM.
+- Split CPUs and memory across `DUCKDB_JOBS` concurrent jobs (and across
+  connections a job opens side by side, via `share`).
+- Give each process its own `temp_directory` so DuckDB can spill to disk.
+- Apply the profile to a connection (`apply_profile`).
+
+Notes
+-----
+- Explicit `DUCKDB_THREADS` / `DUCKDB_MEM` settings override the computed
+  values; `DUCKDB_MEM_FRACTION` keeps headroom for Python and Arrow.
+- `DUCKDB_JOBS` is exported by the batch runner, so pipeline subprocesses
+  size themselves for the pool they run in.
+- Sizes use DuckDB syntax ("1GB" = 10^9 bytes, "1GiB" = 2^30 bytes).
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.core import paths
+from app.core.config import settings
+
+log = logging.getLogger("maturity.core.resources")
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# cgroup v1 reports "unlimited" as a huge page-aligned number.
+_V1_UNLIMITED = 1 << 60
+# Below this, DuckDB cannot run typical ingest queries.
+MIN_MEMORY = 128 * 1000**2
+
+_UNITS = {
+    "": 1,
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+
+
+def parse_size(text: str) -> int:
+    """Bytes for a DuckDB-style size ("1GB", "512MiB", "2.5 GB").
+
+    Raises `ValueError` for anything else.
+    """
+    m = re.fullmatch(r"\s*([0-9]*\.?[0-9]+)\s*([a-zA-Z]*)\s*", text)
+    if not m or m.group(2).lower() not in _UNITS:
+        raise ValueError(f"invalid size '{text}'")
+    return int(float(m.group(1)) * _UNITS[m.group(2).lower()])
+
+
+def format_size(n: int) -> str:
+    """DuckDB size string for `n` bytes, in whole MB."""
+    return f"{max(1, n // 1000**2)}MB"
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="ascii").strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpus(root: Path = CGROUP_ROOT) -> float | None:
+    """CPUs granted by the cgroup CPU quota (None when unlimited or unknown)."""
+    v2 = _read(root / "cpu.max")
+    if v2:
+        quota, _, period = v2.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota = _read(root / "cpu/cpu.cfs_quota_us")
+    period = _read(root / "cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cgroup_memory(root: Path = CGROUP_ROOT) -> tuple[int | None, int | None]:
+    """(limit, current usage) in bytes from the cgroup; None where unknown."""
+    limit = _read(root / "memory.max")
+    if limit is not None:
+        usage = _read(root / "memory.current")
+        return (
+            None if limit == "max" else int(limit),
+            int(usage) if usage else None,
+        )
+    limit = _read(root / "memory/memory.limit_in_bytes")
+    usage = _read(root / "memory/memory.usage_in_bytes")
+    if limit is None or int(limit) >= _V1_UNLIMITED:
+        return None, int(usage) if usage else None
+    return int(limit), int(usage) if usage else None
+
+
+def host_cpus() -> int:
+    """CPUs this process may run on (affinity mask, else `os.cpu_count`)."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def host_memory() -> int | None:
+    """Physical memory in bytes, if the platform reports it."""
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def available_cpus() -> float:
+    """CPUs usable by this process: the cgroup quota capped by the affinity mask."""
+    quota = cgroup_cpus()
+    cpus = host_cpus()
+    return min(quota, cpus) if quota else float(cpus)
+
+
+def total_memory() -> int | None:
+    """Memory this process's cgroup may use (the host's RAM when unlimited)."""
+    limit, _usage = cgroup_memory()
+    host = host_memory()
+    if limit is None:
+        return host
+    return min(limit, host) if host else limit
+
+
+def available_memory() -> int | None:
+    """Memory free for new work now: `MemAvailable`, capped by cgroup headroom."""
+    free = None
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    free = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    limit, usage = cgroup_memory()
+    if limit is not None and usage is not None:
+        headroom = max(0, limit - usage)
+        free = headroom if free is None else min(free, headroom)
+    return free
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    """DuckDB settings for one connection, and the budget they came from."""
+
+    threads: int
+    memory_limit: str
+    temp_directory: Path | None
+    cpus: float
+    memory: int | None
+    jobs: int
+
+    def pragmas(self) -> list[str]:
+        """`SET` statements applying this profile."""
+        out = [
+            f"SET threads={self.threads}",
+            f"SET memory_limit='{self.memory_limit}'",
+        ]
+        if self.temp_directory is not None:
+            tmp = self.temp_directory.as_posix().replace("'", "''")
+            out.append(f"SET temp_directory='{tmp}'")
+        return out
+
+
+def temp_directory() -> Path:
+    """Per-process spill directory (DuckDB creates it on first spill)."""
+    root = settings.DUCKDB_TEMP_DIR or paths.DATA_DIR / "duckdb_tmp"
+    return Path(root) / f"pid-{os.getpid()}"
+
+
+def resolve_profile(jobs: int | None = None, share: int = 1) -> ResourceProfile:
+    """Profile for one connection among `jobs` jobs x `share` connections each.
+
+    `jobs` defaults to `settings.DUCKDB_JOBS`; `share` is the number of
+    connections one job keeps busy at once (e.g. parallel parse workers).
+    """
+    # The pid is part of the key: forked workers need their own temp directory.
+    return _resolve(max(1, jobs or settings.DUCKDB_JOBS), max(1, share), os.getpid())
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve(jobs: int, share: int, _pid: int) -> ResourceProfile:
+    slots = jobs * share
+    cpus = available_cpus()
+    memory = total_memory()
+
+    threads = settings.DUCKDB_THREADS or max(1, int(cpus // slots))
+    if settings.DUCKDB_MEM:
+        memory_limit = settings.DUCKDB_MEM
+    elif memory is None:
+        memory_limit = "1GB"  # unknown platform: DuckDB's usual small default
+    else:
+        budget = int(memory * settings.DUCKDB_MEM_FRACTION) // slots
+        memory_limit = format_size(max(MIN_MEMORY, budget))
+    profile = ResourceProfile(
+        threads=threads,
+        memory_limit=memory_limit,
+        temp_directory=temp_directory(),
+        cpus=cpus,
+        memory=memory,
+        jobs=jobs,
+    )
+    log.debug("duckdb resource profile %s (share=%d)", profile, share)
+    return profile
+
+
+def apply_profile(con: Any, profile: ResourceProfile | None = None) -> None:
+    """Apply `profile` (default: `resolve_profile()`) to a DuckDB connection."""
+    for stmt in (profile or resolve_profile()).pragmas():
+        con.execute(stmt)
@@ -0,0 +1,153 @@
+# ------------------------------------------------------------
+# Module: app/core/stage_manifest.py
+# Purpose: Per-model record of completed pipeline stages and their fingerprints.
+# ------------------------------------------------------------
+
+"""Stage fingerprints for skip-if-unchanged and resume-after-failure runs.
+
+Each pipeline stage (ingest → ir → predicates → rag) gets a fingerprint over
+what determines its output: its inputs (the XML hash, or the upstream
+stage's fingerprint), the source of the code that runs it, and the settings
+that change what it writes. `<model_dir>/stages.json` records the fingerprint
+of every stage that completed; the orchestrator skips a stage whose recorded
+fingerprint still matches.
+
+Responsibilities
+----------------
+- Compute stage fingerprints (`fingerprint`, `code_version`).
+- Load/save `stages.json` atomically (`StageManifest`).
+- Forget a stage and everything downstream before it runs, so a failure
+  leaves only stages that really completed (a retry resumes after them).
+
+Notes
+-----
+- A fingerprint of None means "inputs unknown" (e.g. tables published by
+  another path): the stage always runs and never matches. Every path that
+  publishes `t_*` (loader, delta ingest, streaming upload) calls
+  `begin("ingest")` first, so stages recorded against older tables rerun.
+- Code versions hash the `.py` sources under the stage's packages, so any
+  edit there invalidates the stage; they are computed once per process.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from app.core import paths
+
+log = logging.getLogger("maturity.core.stage_manifest")
+
+MANIFEST_NAME = "stages.json"
+SCHEMA_VERSION = 1
+# Pipeline order; running a stage invalidates the ones after it.
+STAGES = ("ingest", "ir", "predicates", "rag")
+# Sources (relative to the `app` package) whose code shapes each stage's output.
+STAGE_CODE: dict[str, tuple[str, ...]] = {
+    "ingest": ("ingest", "input_adapters"),
+    # build_ir plus the modules it imports for column typing and the cursor pool.
+    "ir": (
+        "ingest/build_ir.py",
+        "ingest/column_types.py",
+        "ingest/duckdb_utils.py",
+        "ingest/parquet_layout.py",
+    ),
+    "predicates": ("criteria", "evidence"),
+    "rag": ("rag/bootstrap_index.py",),
+}
+
+
+@functools.cache
+def code_version(stage: str) -> str:
+    """Hash of the sources listed for `stage` in `STAGE_CODE`."""
+    h = hashlib.sha256()
+    for part in STAGE_CODE[stage]:
+        root = paths.APP_ROOT / part
+        files = sorted(root.rglob("*.py")) if root.is_dir() else [root]
+        for f in files:
+            h.update(f.relative_to(paths.APP_ROOT).as_posix().encode("utf-8"))
+            h.update(b"\0")
+            h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def file_digest(path: Path) -> str | None:
+    """sha256 of a file's bytes, or None when it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def fingerprint(
+    stage: str, inputs: dict[str, Any], config: dict[str, Any] | None = None
+) -> str | None:
+    """Fingerprint of `stage` over `inputs`, its code and `config` settings.
+
+    Returns None when any input is None (unknown).
+    """
+    if any(v is None for v in inputs.values()):
+        return None
+    doc = {
+        "stage": stage,
+        "inputs": inputs,
+        "code": code_version(stage),
+        "config": config or {},
+    }
+    blob = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class StageManifest:
+    """`<model_dir>/stages.json`: fingerprint and timing of completed stages."""
+
+    def __init__(self, model_dir: Path):
+        self.path = model_dir / MANIFEST_NAME
+        self.stages: dict[str, dict[str, Any]] = {}
+        try:
+            doc = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError):
+            log.warning("unreadable stage manifest %s; starting over", self.path)
+            return
+        if doc.get("schema_version") == SCHEMA_VERSION:
+            self.stages = dict(doc.get("stages") or {})
+
+    def fingerprint(self, stage: str) -> str | None:
+        """Recorded fingerprint of `stage`, if it completed."""
+        return (self.stages.get(stage) or {}).get("fingerprint")
+
+    def is_current(self, stage: str, fp: str | None) -> bool:
+        """True when `stage` completed with fingerprint `fp` (never for None)."""
+        return fp is not None and self.fingerprint(stage) == fp
+
+    def begin(self, stage: str) -> None:
+        """Forget `stage` and every stage after it (they are about to change)."""
+        later = STAGES[STAGES.index(stage) :]
+        if any(s in self.stages for s in later):
+            for s in later:
+                self.stages.pop(s, None)
+            self._save()
+
+    def complete(self, stage: str, fp: str | None, seconds: float) -> None:
+        """Record `stage` as completed with fingerprint `fp`."""
+        self.stages[stage] = {
+            "fingerprint": fp,
+            "seconds": round(seconds, 3),
+            "completed_at": int(time.time() * 1000),
+        }
+        self._save()
+
+    def _save(self) -> None:
+        doc = {"schema_version": SCHEMA_VERSION, "stages": self.stages}
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -4,14 +4,16 @@
 # ------------------------------------------------------------
 
 from __future__ import annotations
+
 import importlib
 import pathlib
 import pkgutil
 import re
 import traceback
-from typing import Iterable, List, Tuple, cast
-from .protocols import Predicate
+from collections.abc import Iterable, Iterator
+from typing import cast
 
+from .protocols import Predicate
 
 # Discovery roots & filters:
 # - Only scan immediate package tree under app.criteria.
@@ -19,17 +21,10 @@ from .protocols import Predicate
 _BASE = pathlib.Path(__file__).parent
 _MML = re.compile(r"^mml_\d+$")  # Match only maturity level folders like mml_1, mml_2
 
-# Discover predicate modules and return [(group, predicate_id, evaluate_fn)].
-# - groups: optional {'mml_1', 'mml_2', ...} subset filter.
-# - strict=True: abort on first import error; False: collect all loadable predicates.
-def discover(groups: Iterable[str] | None = None, strict: bool = True) -> List[Tuple[str, str, Predicate]]:
-    wanted = set(groups) if groups else None
-    results: List[Tuple[str, str, Predicate]] = []
-
-    print(f"[loader] start discovery base={_BASE} wanted={sorted(wanted) if wanted else 'ALL'}", flush=True)
-
+# Yield (group, module name) for every predicate module under app.criteria.
+# - wanted: optional {'mml_1', 'mml_2', ...} subset filter; modules are not imported.
+def _predicate_modules(wanted: set[str] | None = None) -> Iterator[tuple[str, str]]:
     # Walk only this package's filesystem path; prefix ensures fully-qualified imports.
-    import_errors = []
     for _, modname, ispkg in pkgutil.walk_packages([str(_BASE)], prefix=f"{__package__}."):
         if ispkg:
             # packages are just containers; skip
@@ -52,6 +47,23 @@ def discover(groups: Iterable[str] | None = None, strict: bool = True) -> List[T
         if not parts[-1].startswith("predicate_"):
             continue
 
+        yield group, modname
+
+# Discover predicate modules and return [(group, predicate_id, evaluate_fn)].
+# - groups: optional {'mml_1', 'mml_2', ...} subset filter.
+# - strict=True: abort on first import error; False: collect all loadable predicates.
+def discover(
+    groups: Iterable[str] | None = None, strict: bool = True
+) -> list[tuple[str, str, Predicate]]:
+    wanted = set(groups) if groups else None
+    results: list[tuple[str, str, Predicate]] = []
+
+    print(f"[loader] start discovery base={_BASE} wanted={sorted(wanted) if wanted else 'ALL'}", flush=True)
+
+    import_errors = []
+    for group, modname in _predicate_modules(wanted):
+        parts = modname.split(".")
+
         # Import each candidate in isolation; side effects in module top-level are on the module.
         # On failure: print diagnostic and either raise (strict) or continue.
         try:
@@ -85,3 +97,40 @@ def discover(groups: Iterable[str] | None = None, strict: bool = True) -> List[T
     if import_errors and strict:
         raise RuntimeError(f"Predicate import failures: {[(m,type(e).__name__) for m,e in import_errors]}")
     return results
+
+
+# Union of the `COLUMNS` declared by predicate modules: {table: {column, ...}}.
+# - A predicate lists every column it may read (including fallback candidates);
+#   a table mapped to no columns only needs to exist (see ingest column_manifest).
+# - Modules that fail to import are skipped here; `discover` reports them.
+def declared_columns(groups: Iterable[str] | None = None) -> dict[str, set[str]]:
+    wanted = set(groups) if groups else None
+    columns: dict[str, set[str]] = {}
+    for _group, modname in _predicate_modules(wanted):
+        try:
+            mod = importlib.import_module(modname)
+        except Exception:
+            continue
+        for table, cols in getattr(mod, "COLUMNS", {}).items():
+            columns.setdefault(table, set()).update(cols)
+    return columns
+
+
+# `HELPERS` declared by predicate modules: {"mml_N:predicate_id": ("blocks", ...)}.
+# - Names refer to `app.ingest.build_ir.HELPER_REGISTRY`; the pipeline's IR stage
+#   builds them (reused while their sources are unchanged) and the runner checks
+#   a predicate's helpers are current just before it runs.
+# - Predicates that read no `irx.*` table declare nothing and are left out.
+def declared_helpers(groups: Iterable[str] | None = None) -> dict[str, tuple[str, ...]]:
+    wanted = set(groups) if groups else None
+    helpers: dict[str, tuple[str, ...]] = {}
+    for group, modname in _predicate_modules(wanted):
+        try:
+            mod = importlib.import_module(modname)
+        except Exception:
+            continue
+        names = tuple(getattr(mod, "HELPERS", ()))
+        if names:
+            pid = getattr(mod, "PREDICATE_ID", modname.split(".")[-1])
+            helpers[f"{group}:{pid}"] = names
+    return helpers
@@ -10,6 +10,28 @@ from typing import Any
 from app.criteria.protocols import Context, DbLike
 from app.criteria.utils import predicate
 
+# Columns this predicate may read, every `_pick` candidate included
+# (see app.ingest.column_manifest; lean ingest keeps only declared columns).
+COLUMNS = {
+    "t_object": (
+        "Object_ID",
+        "object_id",
+        "id",
+        "Object_Type",
+        "object_type",
+        "type",
+        "Name",
+        "name",
+        "ParentID",
+        "parentid",
+        "parent_id",
+        "Stereotype",
+        "stereotype",
+        "stereotype_lc",
+        "ea_guid",
+    ),
+}
+
 
 # ---------- column helpers (adapter-agnostic) ----------
 def _cols(db: DbLike, table: str) -> dict[str, str]:
@@ -35,6 +57,11 @@ def _core(db: DbLike, ctx: Context) -> dict[str, Any]:
     PARENT_ID = _pick(c_obj, "ParentID", "parentid", "parent_id")
     STEREO = _pick(c_obj, "Stereotype", "stereotype")
     EA_GUID_COL = c_obj.get("ea_guid", "")  # optional (Sparx)
+    # Canonical lower-cased stereotype written by typed ingest: plain equality.
+    if "stereotype_lc" in c_obj:
+        IS_BLOCK = f"b.\"{c_obj['stereotype_lc']}\"='block'"
+    else:
+        IS_BLOCK = f"LOWER(COALESCE(b.\"{STEREO}\",''))='block'"
 
     # Build SQL once; DuckDB-friendly (uses COALESCE) and portable
     if EA_GUID_COL:
@@ -51,7 +78,7 @@ def _core(db: DbLike, ctx: Context) -> dict[str, Any]:
         LEFT JOIN t_object p
           ON p."{PARENT_ID}" = b."{OBJECT_ID}" AND p."{OBJECT_TYPE}"='Port'
         WHERE b."{OBJECT_TYPE}"='Class'
-          AND LOWER(COALESCE(b."{STEREO}",''))='block'
+          AND {IS_BLOCK}
         ORDER BY LOWER(b."{NAME}"), LOWER(COALESCE(p."{NAME}",'')), b."{OBJECT_ID}", p."{OBJECT_ID}";
         """
     else:
@@ -68,7 +95,7 @@ def _core(db: DbLike, ctx: Context) -> dict[str, Any]:
         LEFT JOIN t_object p
           ON p."{PARENT_ID}" = b."{OBJECT_ID}" AND p."{OBJECT_TYPE}"='Port'
         WHERE b."{OBJECT_TYPE}"='Class'
-          AND LOWER(COALESCE(b."{STEREO}",''))='block'
+          AND {IS_BLOCK}
         ORDER BY LOWER(b."{NAME}"), LOWER(COALESCE(p."{NAME}",'')), b."{OBJECT_ID}", p."{OBJECT_ID}";
         """
 
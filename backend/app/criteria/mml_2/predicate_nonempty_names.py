@@ -16,6 +16,19 @@ _SQL_T_OBJECT = """
   WHERE COALESCE(TRIM(Name), '') = ''
 """
 
+# Same, over the canonical trimmed name written by typed ingest.
+_SQL_T_OBJECT_CANONICAL = """
+  SELECT CAST(Object_ID AS BIGINT) AS id, Object_Type AS kind
+  FROM t_object
+  WHERE name_trim IS NULL OR name_trim = ''
+"""
+
+# Columns read by the SQL above (see app.ingest.column_manifest).
+COLUMNS = {
+    "element": ("id", "kind", "name"),
+    "t_object": ("Object_ID", "Object_Type", "Name", "name_trim"),
+}
+
 
 def _has_table(db: DbLike, name: str) -> bool:
     row = db.execute(
@@ -26,10 +39,24 @@ def _has_table(db: DbLike, name: str) -> bool:
     return bool(row)
 
 
+def _has_column(db: DbLike, table: str, column: str) -> bool:
+    row = db.execute(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_schema='main' AND table_name=? AND column_name=?",
+        [table, column],
+    ).fetchone()
+    return bool(row)
+
+
 def _core(db: DbLike, ctx: Context) -> dict:
     use_element = _has_table(db, "element")
     src_table = "element" if use_element else "t_object"
-    sql_off = _SQL_ELEMENT if use_element else _SQL_T_OBJECT
+    if use_element:
+        sql_off = _SQL_ELEMENT
+    elif _has_column(db, "t_object", "name_trim"):
+        sql_off = _SQL_T_OBJECT_CANONICAL
+    else:
+        sql_off = _SQL_T_OBJECT
     sql_total = (
         "SELECT COUNT(*) FROM element"
         if use_element
@@ -21,6 +21,10 @@ Developer Guidance:
     - Use `Context` to access metadata like vendor, version, and model_id.
     - Keep all predicate functions pure: no I/O, no logging side effects.
     - Return small `details` dicts with structured evidence for front-end rendering.
+    - Predicates reading `irx.*` helper tables list them in a module-level
+      `HELPERS` tuple (names from `build_ir.HELPER_REGISTRY`); the pipeline's
+      IR stage builds them, and the runner checks they are current
+      before the predicate runs.
 """
 
 from dataclasses import dataclass
@@ -5,12 +5,16 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import traceback
+from pathlib import Path
 
 from app.api.v1.models import EvidenceItem
+from app.core import paths
 from app.utils.timing import ms_since, now_ns
 
-from .loader import discover
+from .loader import declared_helpers, discover
 from .protocols import Context, DbLike
 
 # Soft SLA for predicate runtime (ms);
@@ -57,6 +61,7 @@ def run_predicates(
     # Import-time errors in predicates will raise immediately (strict=True).
     # If you want to aggregate import errors, lower strictness and handle here.
     loaded = discover(groups, strict=True)
+    helpers_by_id = declared_helpers(groups)
     print(f"[runner] executing {len(loaded)} predicates…", flush=True)
 
     # Track which predicate IDs belong to each MML level and whether each passed.
@@ -76,6 +81,20 @@ def run_predicates(
         # Call the predicate; normalize 'details' to a plain dict.
         # On exception: either raise (fail-fast modes) or capture as failed evidence.
         try:
+            needed = helpers_by_id.get(f"{group}:{pid}")
+            if needed:
+                # Deferred import: duckdb-backed IR checks, only for predicates
+                # that read irx.* helpers. Read paths may hold a shared or
+                # read-only cursor, so helpers are checked here, never built
+                # (the pipeline's IR stage builds them).
+                from app.ingest.build_ir import stale_helpers
+
+                stale = stale_helpers(db, needed)
+                if stale:
+                    raise RuntimeError(
+                        f"irx helpers {stale} are missing or stale; rerun the "
+                        "pipeline's predicates stage to build them"
+                    )
             ok, details = fn(db, ctx)
             details_dict = dict(details)
         except Exception as ex:
@@ -216,59 +235,15 @@ def run_predicates(
     return maturity_level, evidence, levels
 
 
-# CLI: connect DuckDB, run predicates, and write summary.json (print-oriented diagnostics).
-if __name__ == "__main__":
-    import argparse
-    from pathlib import Path
-
-    import duckdb
-
-    from app.core import paths
-
-    from .protocols import Context
-
-    ap = argparse.ArgumentParser(
-        description="Run maturity predicates and emit evidence.jsonl"
-    )
-    ap.add_argument(
-        "--model-dir",
-        type=Path,
-        required=True,
-        help="Path to model dir (…/data/models/<id>)",
-    )
-    ap.add_argument(
-        "--vendor", type=str, default="", help="Vendor (e.g., sparx, cameo)"
-    )
-    ap.add_argument(
-        "--version", type=str, default="", help="Vendor version (e.g., 17.1)"
-    )
-    args = ap.parse_args()
-
-    model_dir = args.model_dir.resolve()
-    model_id = model_dir.name
-
-    db_path = model_dir / "model.duckdb"
-    print(f"[runner] connect duckdb={db_path}", flush=True)
-    con = duckdb.connect(str(db_path))
-    con.execute("PRAGMA enable_object_cache=true;")
-
-    ctx = Context(
-        vendor=args.vendor or "",
-        version=args.version or "",
-        model_dir=model_dir,
-        model_id=model_id,
-        output_root=paths.MODELS_DIR,
-    )
-
-    level, evidence, levels = run_predicates(con, ctx)
-    con.close()
-
-    # --- write final summary.json (vendor/version-aware) ---
-    import hashlib
-    import json
-
-    from app.core import paths
-
+# Summary for the UI: counts, fingerprint and the per-level breakdown.
+def write_summary(
+    ctx: Context,
+    level: int,
+    evidence: list[EvidenceItem],
+    levels: dict[str, dict],
+) -> Path:
+    """Write `summary.json` for `ctx.model_id` from a predicate run; return its path."""
+    model_id = str(ctx.model_id)
     ej = paths.evidence_jsonl(model_id)
     docs = 0
     try:
@@ -297,7 +272,7 @@ if __name__ == "__main__":
     summary = {
         "schema_version": "1.0",
         "model_id": model_id,
-        "model": {"vendor": args.vendor or "", "version": args.version or ""},
+        "model": {"vendor": ctx.vendor or "", "version": ctx.version or ""},
         "maturity_level": level,
         "counts": {
             "predicates_total": len(evidence),
@@ -308,10 +283,70 @@ if __name__ == "__main__":
         "fingerprint": fingerprint,
         "levels": levels,
     }
-    paths.summary_json(model_id).write_text(
+    sj = paths.summary_json(model_id)
+    sj.write_text(
         json.dumps(summary, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
     )
+    return sj
+
+
+# Pipeline stage: run every predicate on `db`, then write summary.json.
+def run_and_summarize(
+    db: DbLike, ctx: Context
+) -> tuple[int, list[EvidenceItem], dict[str, dict]]:
+    """Run predicates and write `summary.json`; returns `run_predicates`' result."""
+    level, evidence, levels = run_predicates(db, ctx)
+    write_summary(ctx, level, evidence, levels)
     print(
         f"[runner] exit maturity_level={level} evidence_items={len(evidence)} summary.json=written",
         flush=True,
     )
+    return level, evidence, levels
+
+
+# CLI: connect DuckDB, run predicates, and write summary.json (print-oriented diagnostics).
+if __name__ == "__main__":
+    import argparse
+
+    import duckdb
+
+    from app.core.resources import apply_profile
+
+    ap = argparse.ArgumentParser(
+        description="Run maturity predicates and emit evidence.jsonl"
+    )
+    ap.add_argument(
+        "--model-dir",
+        type=Path,
+        required=True,
+        help="Path to model dir (…/data/models/<id>)",
+    )
+    ap.add_argument(
+        "--vendor", type=str, default="", help="Vendor (e.g., sparx, cameo)"
+    )
+    ap.add_argument(
+        "--version", type=str, default="", help="Vendor version (e.g., 17.1)"
+    )
+    args = ap.parse_args()
+
+    model_dir = args.model_dir.resolve()
+    model_id = model_dir.name
+
+    db_path = model_dir / "model.duckdb"
+    print(f"[runner] connect duckdb={db_path}", flush=True)
+    con = duckdb.connect(str(db_path))
+    apply_profile(con)
+    con.execute("PRAGMA enable_object_cache=true;")
+
+    ctx = Context(
+        vendor=args.vendor or "",
+        version=args.version or "",
+        model_dir=model_dir,
+        model_id=model_id,
+        output_root=paths.MODELS_DIR,
+    )
+
+    try:
+        run_and_summarize(con, ctx)
+    finally:
+        con.close()
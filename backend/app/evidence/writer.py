@@ -20,6 +20,8 @@ from typing import Any
 
 import duckdb
 
+from app.core.resources import apply_profile
+
 from .builder import EvidenceBuilder
 from .types import PredicateOutput
 
@@ -73,6 +75,7 @@ def mirror_jsonl_to_parquet(model_dir: pathlib.Path) -> pathlib.Path:
     dst = (ev_dir / f"{model_dir.name}_evidence.parquet").as_posix()
 
     con = duckdb.connect()
+    apply_profile(con)
     con.execute(
         f"COPY (SELECT * FROM read_json_auto('{src}')) TO '{dst}' (FORMAT PARQUET);"
     )
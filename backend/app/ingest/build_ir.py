@@ -8,43 +8,58 @@ Responsibilities
 ----------------
 - Open a tuned DuckDB connection for build operations.
 - Create lightweight `ir.*` views that mirror `main.t_*` loader tables.
-- Materialize `irx.*` helper tables used by downstream SQL.
+- Give every view the canonical columns (`ea_uuid`, `stereotype_lc`, ...);
+  models ingested without them get them computed in the view.
+- Materialize the `irx.*` helper tables predicates declare (`HELPER_REGISTRY`),
+  on demand, reusing helpers whose source tables are unchanged; report the
+  ones a read path would find missing or outdated (`stale_helpers`).
 - Offer a CLI to run the whole build for a given model directory.
 
 Notes
 -----
-- PRAGMA memory units are human-readable (e.g., "1GB").
+- Threads, memory limit and spill directory come from the resource profile
+  (`app.core.resources`), not fixed constants.
 - Operations are destructive to the `ir` schema (dropped and recreated).
-- Helper table writes are idempotent (tables are replaced).
+- Helper table writes are idempotent (tables are replaced); `irx._helpers`
+  records the source fingerprint each helper was built from.
+- Stale helper tables are created on the owning connection, then filled
+  concurrently on separate cursors; closures wait for the helpers they read
+  (`Helper.requires`).
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
 from pathlib import Path
 
 import duckdb
 
+from app.core.config import settings
+from app.core.resources import apply_profile, resolve_profile
+from app.ingest.column_types import CANONICAL_COLUMNS, derived_columns
+from app.ingest.duckdb_utils import CursorPool, source_signature
+from app.utils.timing import log_timer
+
 log = logging.getLogger("ingest.build_ir")
 logging.basicConfig(level=logging.INFO)
 
-PRAGMA_THREADS = 4
-PRAGMA_MEM = "1GB"
-
 
 def connect(db_path: Path) -> duckdb.DuckDBPyConnection:
     """Open a DuckDB connection and apply per-connection PRAGMAs.
 
     Notes
     -----
-    - Tunes `threads`, `memory_limit`, and enables the object cache.
+    - Tunes `threads`, `memory_limit`, `temp_directory` (resource profile)
+      and enables the object cache.
     - Side effects: impacts performance and memory footprint for this handle.
     - Callers MUST close the connection to release resources.
     """
     con = duckdb.connect(str(db_path))
-    con.execute(f"PRAGMA threads={PRAGMA_THREADS};")
-    con.execute(f"PRAGMA memory_limit='{PRAGMA_MEM}';")
+    apply_profile(con)
 
     # Cache compiled objects for speed (higher memory use). Disable if debugging
     # schema/memory issues, as stale cache can surprise during frequent DDL.
@@ -63,6 +78,9 @@ def create_ir_views(con):
     - Safe only if `ir.*` is fully derived (schema is dropped with CASCADE).
     - Briefly disrupts concurrent readers of `ir.*`.
     - Quotes identifiers to avoid issues with reserved words/special chars.
+    - Canonical columns missing from a table (untyped or older ingests) are
+      computed by the view (typed NULLs when their source column is absent),
+      so helper SQL can always use them.
     """
     # Remove the entire `ir` schema before rebuilding (derived data only).
     con.execute("DROP SCHEMA IF EXISTS ir CASCADE;")
@@ -82,7 +100,21 @@ def create_ir_views(con):
     for (tbl,) in rows:
         # Quote names to avoid collisions with reserved words/special chars.
         q = '"' + tbl.replace('"', '""') + '"'
-        con.execute(f"CREATE OR REPLACE VIEW ir.{q} AS SELECT * FROM main.{q};")
+        columns = [
+            r[0]
+            for r in con.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = 'main' AND table_name = ?",
+                [tbl],
+            ).fetchall()
+        ]
+        present = {c.lower() for c in columns}
+        select = "*"
+        derived = derived_columns(columns, CANONICAL_COLUMNS, tbl, missing_as_null=True)
+        for name, expr in derived.items():
+            if name.lower() not in present:
+                select += f', {expr} AS "{name}"'
+        con.execute(f"CREATE OR REPLACE VIEW ir.{q} AS SELECT {select} FROM main.{q};")
         created.append(tbl)
 
     logging.info(
@@ -94,162 +126,429 @@ def create_ir_views(con):
 # ----------------------------- #
 # Helper tables (irx.*)
 # ----------------------------- #
-# Each entry materializes a helper table:
+@dataclass(frozen=True)
+class Helper:
+    """One materialized `irx.<name>` helper table.
+
+    Notes
+    -----
+    - `sources` are the `ir.*` tables the SQL reads; a helper is rebuilt only
+      when one of them was republished (see `helper_fingerprint`).
+    - `sql` is the query that fills the table; the table itself is created
+      from `shell`, its column list, so it exists (empty) even when a source
+      is missing and downstream SQL stays runnable.
+    - `requires` are helpers the SQL reads; they are built first, and a
+      rebuilt requirement rebuilds this helper too.
+    """
+
+    name: str
+    sources: tuple[str, ...]
+    sql: str
+    shell: str
+    requires: tuple[str, ...] = ()
+
+
+# Registered helpers (built only when a predicate lists them in its `HELPERS`,
+# see criteria.loader, or when a build names them explicitly):
 # - blocks:    Block objects (filtered from t_object).
 # - ports:     Port-like objects with parent/classifier linkage.
-# - port_edges:Connector/Association edges between ports.
+# - port_edges: Connector/Association edges between ports.
 # - gen_edges: Generalization parent-child edges.
-# - trace_edges:Trace/satisfy/refine/allocate edges (typed).
-HELPERS = {
-    "blocks": """
-        CREATE OR REPLACE TABLE irx.blocks AS
-        SELECT
-          o.Object_ID  AS block_oid,
-          UPPER(REPLACE(REPLACE(TRIM(o.ea_guid), '{',''),'}','')) AS block_guid,
-          TRIM(o.Name) AS block_name,
-          o.Stereotype AS block_stereotype
-        FROM ir.t_object o
-        WHERE LOWER(o.Stereotype) IN ('block');
-    """,
-    "ports": """
-        CREATE OR REPLACE TABLE irx.ports AS
-        SELECT
-          p.Object_ID AS port_oid,
-          UPPER(REPLACE(REPLACE(TRIM(p.ea_guid),'{',''),'}','')) AS port_guid,
-          TRIM(p.Name) AS port_name,
-          p.ParentID   AS parent_block_oid,
-          p.Classifier AS classifier_oid,
-          CASE
-            WHEN p.PDATA1 IS NULL THEN NULL
-            WHEN TRIM(p.PDATA1) IN ('', '<none>', '&lt;none&gt;') THEN NULL
-            ELSE UPPER(REPLACE(REPLACE(TRIM(p.PDATA1),'{',''),'}',''))
-          END AS pdata1_guid,
-          p.Stereotype AS port_stereotype
-        FROM ir.t_object p
-        WHERE LOWER(p.Stereotype) IN ('port','proxyport','fullport');
-    """,
-    "port_edges": """
-        CREATE OR REPLACE TABLE irx.port_edges AS
-        SELECT
-          c.Connector_ID AS conn_oid,
-          c.Start_Object_ID AS src_port_oid,
-          c.End_Object_ID   AS dst_port_oid,
-          TRIM(c.Connector_Type) AS conn_type
-        FROM ir.t_connector c
-        WHERE c.Connector_Type IN ('Connector','Association');
-    """,
-    "gen_edges": """
-        CREATE OR REPLACE TABLE irx.gen_edges AS
-        SELECT
-          c.Start_Object_ID AS child_oid,
-          c.End_Object_ID   AS parent_oid
-        FROM ir.t_connector c
-        WHERE c.Connector_Type = 'Generalization';
-    """,
-    "trace_edges": """
-        CREATE OR REPLACE TABLE irx.trace_edges AS
-        SELECT
-          c.Start_Object_ID AS src_oid,
-          c.End_Object_ID   AS dst_oid,
-          LOWER(TRIM(c.Stereotype)) AS kind
-        FROM ir.t_connector c
-        WHERE LOWER(TRIM(c.Stereotype)) IN ('trace','satisfy','refine','allocate');
-    """,
+# - trace_edges: Trace/satisfy/refine/allocate edges (typed).
+# - gen_closure: Transitive generalization ancestry (nearest depth per pair).
+# - package_closure: (package_id, ancestor_id) pairs, self included at depth 0
+#   (elements under package X: join t_object.Package_ID = package_id where
+#   ancestor_id = X).
+# - containment_closure: Transitive element containment (t_object.ParentID).
+# Closures are keyed recursive CTEs (`USING KEY`): each pair is kept once at
+# the depth it was first reached and never expanded again, so the work is
+# bounded by the number of pairs and cyclic data terminates.
+# GUIDs are the canonical UUID columns (`ea_uuid`, `pdata1_uuid`) and filters
+# compare canonical text (`stereotype_lc`), so no string work runs per row.
+# The ir.* views supply canonical columns (NULL when their source is missing).
+HELPER_REGISTRY: dict[str, Helper] = {
+    h.name: h
+    for h in (
+        Helper(
+            "blocks",
+            ("t_object",),
+            """
+            SELECT
+              o.Object_ID  AS block_oid,
+              o.ea_uuid    AS block_guid,
+              o.name_trim  AS block_name,
+              o.Stereotype AS block_stereotype
+            FROM ir.t_object o
+            WHERE o.stereotype_lc = 'block';
+            """,
+            "block_oid BIGINT, block_guid UUID, block_name TEXT, "
+            "block_stereotype TEXT",
+        ),
+        Helper(
+            "ports",
+            ("t_object",),
+            """
+            SELECT
+              p.Object_ID AS port_oid,
+              p.ea_uuid   AS port_guid,
+              p.name_trim AS port_name,
+              p.ParentID   AS parent_block_oid,
+              p.Classifier AS classifier_oid,
+              p.pdata1_uuid AS pdata1_guid,
+              p.Stereotype AS port_stereotype
+            FROM ir.t_object p
+            WHERE p.stereotype_lc IN ('port','proxyport','fullport');
+            """,
+            "port_oid BIGINT, port_guid UUID, port_name TEXT, "
+            "parent_block_oid BIGINT, classifier_oid BIGINT, pdata1_guid UUID, "
+            "port_stereotype TEXT",
+        ),
+        Helper(
+            "port_edges",
+            ("t_connector",),
+            """
+            SELECT
+              c.Connector_ID AS conn_oid,
+              c.Start_Object_ID AS src_port_oid,
+              c.End_Object_ID   AS dst_port_oid,
+              TRIM(c.Connector_Type) AS conn_type
+            FROM ir.t_connector c
+            WHERE c.Connector_Type IN ('Connector','Association');
+            """,
+            "conn_oid BIGINT, src_port_oid BIGINT, dst_port_oid BIGINT, "
+            "conn_type TEXT",
+        ),
+        Helper(
+            "gen_edges",
+            ("t_connector",),
+            """
+            SELECT
+              c.Start_Object_ID AS child_oid,
+              c.End_Object_ID   AS parent_oid
+            FROM ir.t_connector c
+            WHERE c.Connector_Type = 'Generalization';
+            """,
+            "child_oid BIGINT, parent_oid BIGINT",
+        ),
+        Helper(
+            "trace_edges",
+            ("t_connector",),
+            """
+            SELECT
+              c.Start_Object_ID AS src_oid,
+              c.End_Object_ID   AS dst_oid,
+              c.stereotype_lc AS kind
+            FROM ir.t_connector c
+            WHERE c.stereotype_lc IN ('trace','satisfy','refine','allocate');
+            """,
+            "src_oid BIGINT, dst_oid BIGINT, kind TEXT",
+        ),
+        Helper(
+            "gen_closure",
+            ("t_connector",),
+            """
+            WITH RECURSIVE
+            edges AS (
+              SELECT DISTINCT
+                TRY_CAST(g.child_oid AS BIGINT)  AS child,
+                TRY_CAST(g.parent_oid AS BIGINT) AS parent
+              FROM irx.gen_edges g
+              WHERE g.child_oid IS NOT NULL AND g.parent_oid IS NOT NULL
+            ),
+            walk(descendant, ancestor, depth) USING KEY (descendant, ancestor) AS (
+              SELECT e.child, e.parent, 1
+              FROM edges e
+              WHERE e.child <> e.parent
+              UNION
+              SELECT w.descendant, e.parent, w.depth + 1
+              FROM walk w
+              JOIN edges e ON e.child = w.ancestor
+              WHERE e.parent <> w.descendant
+                AND NOT EXISTS (
+                  SELECT 1 FROM recurring.walk r
+                  WHERE r.descendant = w.descendant AND r.ancestor = e.parent
+                )
+            )
+            SELECT w.descendant, w.ancestor, w.depth
+            FROM walk w
+            ORDER BY w.descendant, w.ancestor;
+            """,
+            "descendant BIGINT, ancestor BIGINT, depth INTEGER",
+            requires=("gen_edges",),
+        ),
+        Helper(
+            "package_closure",
+            ("t_package",),
+            """
+            WITH RECURSIVE
+            pkg AS (
+              SELECT
+                TRY_CAST(p.Package_ID AS BIGINT) AS id,
+                TRY_CAST(p.Parent_ID AS BIGINT)  AS parent
+              FROM ir.t_package p
+              WHERE p.Package_ID IS NOT NULL
+            ),
+            walk(package_id, ancestor_id, depth)
+            USING KEY (package_id, ancestor_id) AS (
+              SELECT k.id, k.id, 0
+              FROM pkg k
+              WHERE k.id IS NOT NULL
+              UNION
+              SELECT w.package_id, a.parent, w.depth + 1
+              FROM walk w
+              JOIN pkg a ON a.id = w.ancestor_id
+              WHERE a.parent IS NOT NULL AND a.parent <> 0
+                AND EXISTS (SELECT 1 FROM pkg q WHERE q.id = a.parent)
+                AND NOT EXISTS (
+                  SELECT 1 FROM recurring.walk r
+                  WHERE r.package_id = w.package_id AND r.ancestor_id = a.parent
+                )
+            )
+            SELECT w.package_id, w.ancestor_id, w.depth
+            FROM walk w
+            ORDER BY w.package_id, w.ancestor_id;
+            """,
+            "package_id BIGINT, ancestor_id BIGINT, depth INTEGER",
+        ),
+        Helper(
+            "containment_closure",
+            ("t_object",),
+            """
+            WITH RECURSIVE
+            edges AS (
+              SELECT
+                TRY_CAST(o.Object_ID AS BIGINT) AS child,
+                TRY_CAST(o.ParentID AS BIGINT)  AS parent
+              FROM ir.t_object o
+              WHERE o.Object_ID IS NOT NULL AND o.ParentID IS NOT NULL
+                AND o.ParentID <> 0
+            ),
+            walk(descendant, ancestor, depth) USING KEY (descendant, ancestor) AS (
+              SELECT e.child, e.parent, 1
+              FROM edges e
+              WHERE e.child <> e.parent
+              UNION
+              SELECT w.descendant, e.parent, w.depth + 1
+              FROM walk w
+              JOIN edges e ON e.child = w.ancestor
+              WHERE e.parent <> w.descendant
+                AND NOT EXISTS (
+                  SELECT 1 FROM recurring.walk r
+                  WHERE r.descendant = w.descendant AND r.ancestor = e.parent
+                )
+            )
+            SELECT w.descendant, w.ancestor, w.depth
+            FROM walk w
+            ORDER BY w.descendant, w.ancestor;
+            """,
+            "descendant BIGINT, ancestor BIGINT, depth INTEGER",
+        ),
+    )
 }
 
+# Helper SQL by name (column_manifest derives the columns helpers read from it).
+HELPERS = {name: h.sql for name, h in HELPER_REGISTRY.items()}
+
+# Fingerprint and row count of every built helper, kept next to the helpers.
+_CATALOG = "irx._helpers"
 
-def build_helpers(con: duckdb.DuckDBPyConnection) -> dict[str, int]:
-    """Create/overwrite materialized helper tables under `irx.*`.
+
+def _ir_exists(con: duckdb.DuckDBPyConnection, name: str) -> bool:
+    return bool(
+        con.execute(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema = 'ir' AND table_name = ?",
+            [name],
+        ).fetchone()
+    )
+
+
+def helper_fingerprint(con: duckdb.DuckDBPyConnection, helper: Helper) -> str | None:
+    """Fingerprint of `helper` over its SQL and its sources' current contents.
+
+    A source's contents are identified by the signature tagged on `main.<t>`
+    when it was published (`duckdb_utils.source_signature`) plus the columns
+    of its `ir` view; required helpers contribute their own fingerprints.
+    Returns None when a source is untagged (always rebuild).
+    """
+    h = hashlib.sha256(f"{helper.sql}\0{helper.shell}".encode())
+    for source in helper.sources:
+        if not _ir_exists(con, source):
+            h.update(f"\0{source}=missing".encode())
+            continue
+        signature = source_signature(con, source)
+        if signature is None:
+            return None
+        columns = con.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_schema = 'ir' AND table_name = ? ORDER BY ordinal_position",
+            [source],
+        ).fetchall()
+        h.update(f"\0{source}={signature}\0{columns}".encode())
+    for name in helper.requires:
+        required = helper_fingerprint(con, HELPER_REGISTRY[name])
+        if required is None:
+            return None
+        h.update(f"\0{name}={required}".encode())
+    return h.hexdigest()
+
+
+def _with_requirements(names: Iterable[str]) -> list[str]:
+    """`names` plus the helpers they require, each after its requirements."""
+    ordered: list[str] = []
+
+    def _add(name: str) -> None:
+        for required in HELPER_REGISTRY[name].requires:
+            _add(required)
+        if name not in ordered:
+            ordered.append(name)
+
+    for name in names:
+        _add(name)
+    return ordered
+
+
+def _create_shell(con: duckdb.DuckDBPyConnection, helper: Helper) -> None:
+    """(Re)create the empty `irx.<name>` table on the owning connection."""
+    con.execute(f"CREATE OR REPLACE TABLE irx.{helper.name} ({helper.shell});")
+
+
+def _materialize(cur: duckdb.DuckDBPyConnection, helper: Helper) -> int:
+    """Fill and analyze `irx.<name>` on a worker cursor; return its row count."""
+    rows = 0
+    # Missing sources leave the shell empty (monitor zero-row helpers).
+    if all(_ir_exists(cur, s) for s in helper.sources):
+        # INSERT reports the rows it wrote.
+        res = cur.execute(f"INSERT INTO irx.{helper.name} {helper.sql}").fetchone()
+        rows = int(res[0]) if res else 0
+    cur.execute(f"ANALYZE irx.{helper.name};")
+    return rows
+
+
+def _built_helpers(
+    con: duckdb.DuckDBPyConnection,
+) -> tuple[set[str], dict[str, tuple[str | None, int]]]:
+    """Existing `irx` tables and the catalog's {name: (fingerprint, rows)}."""
+    built_tables = {
+        r[0]
+        for r in con.execute(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = 'irx'"
+        ).fetchall()
+    }
+    recorded = {}
+    if _CATALOG.split(".")[1] in built_tables:
+        recorded = {
+            name: (fp, rows)
+            for name, fp, rows in con.execute(
+                f"SELECT name, fingerprint, rows FROM {_CATALOG}"
+            ).fetchall()
+        }
+    return built_tables, recorded
+
+
+def stale_helpers(con: duckdb.DuckDBPyConnection, names: Iterable[str]) -> list[str]:
+    """Helpers among `names` (and their requirements) that need `build_helpers`.
 
     Notes
     -----
-    - Idempotent writes (tables are replaced).
-    - Builds only when required IR sources exist; otherwise creates empty shells.
-    - Performs full scans; expect I/O/time on large models.
-    - Returns row counts per helper table.
+    - Never writes, so read paths can check helpers the pipeline built.
+    - A helper over untagged sources (no fingerprint) counts as current once
+      built: the pipeline rebuilds it on every run.
     """
-    con.execute("CREATE SCHEMA IF NOT EXISTS irx;")
+    built_tables, recorded = _built_helpers(con)
+    stale = []
+    for name in _with_requirements(names):
+        fp = helper_fingerprint(con, HELPER_REGISTRY[name])
+        prior = recorded.get(name)
+        current = prior and name in built_tables and fp in (None, prior[0])
+        if not current:
+            stale.append(name)
+    return stale
+
+
+def build_helpers(
+    con: duckdb.DuckDBPyConnection,
+    names: Iterable[str] | None = None,
+    parallel: int | None = None,
+) -> dict[str, int]:
+    """Build the requested `irx.*` helpers, reusing those whose sources are unchanged.
 
-    # Fast precheck for required sources to avoid throwing on missing tables.
-    # DuckDB stores unquoted identifiers in lowercase in information_schema.
-    def _table_exists(schema: str, name: str) -> bool:
-        return bool(
-            con.execute(
-                "SELECT 1 FROM information_schema.tables WHERE table_schema=? AND table_name=?",
-                [schema, name],
-            ).fetchone()
+    Notes
+    -----
+    - `names` defaults to every registered helper; raises `ValueError` for
+      names not in `HELPER_REGISTRY`. Required helpers are included.
+    - A helper is rebuilt only when its fingerprint differs from the one
+      recorded in `irx._helpers` (so at most once per model contents).
+    - Stale helpers' tables are created serially on `con`; their rows are
+      then loaded side by side, each on its own cursor (up to `parallel`,
+      default `INGEST_PARALLEL_TABLES` or the profile's threads), and
+      `ANALYZE`d there; a helper waits only for helpers it `requires`.
+    - A helper whose source is missing stays an empty shell.
+    - Returns row counts per helper table (from the build, or the catalog).
+    """
+    requested = list(HELPER_REGISTRY) if names is None else list(names)
+    unknown = [n for n in requested if n not in HELPER_REGISTRY]
+    if unknown:
+        raise ValueError(
+            f"unknown irx helpers {unknown} (expected {sorted(HELPER_REGISTRY)})"
         )
-
-    def _column_exists(schema: str, table: str, column: str) -> bool:
-        return bool(con.execute(
-            "SELECT 1 FROM information_schema.columns WHERE table_schema=? AND table_name=? AND column_name=?",
-            [schema, table, column]
-        ).fetchone())
-
-    # blocks/ports need ir.t_object
-    if _table_exists("ir", "t_object"):
-        con.execute(HELPERS["blocks"])
-
-        # Check if PDATA1 column exists before using it
-        if _column_exists("ir", "t_object", "pdata1"):
-            con.execute(HELPERS["ports"])
+    wanted = _with_requirements(requested)
+    built_tables, recorded = _built_helpers(con)
+
+    counts: dict[str, int] = {}
+    stale: dict[str, str | None] = {}
+    for name in wanted:
+        fp = helper_fingerprint(con, HELPER_REGISTRY[name])
+        prior = recorded.get(name)
+        if fp is not None and prior and prior[0] == fp and name in built_tables:
+            counts[f"irx.{name}"] = int(prior[1])
         else:
-            # Create ports table without PDATA1 column
-            con.execute("""
-                CREATE OR REPLACE TABLE irx.ports AS
-                SELECT
-                  p.Object_ID AS port_oid,
-                  UPPER(REPLACE(REPLACE(TRIM(p.ea_guid),'{',''),'}','')) AS port_guid,
-                  TRIM(p.Name) AS port_name,
-                  p.ParentID   AS parent_block_oid,
-                  p.Classifier AS classifier_oid,
-                  NULL AS pdata1_guid,
-                  p.Stereotype AS port_stereotype
-                FROM ir.t_object p
-                WHERE LOWER(p.Stereotype) IN ('port','proxyport','fullport');
-            """)
-    else:
-        # Keep downstream SQL runnable: create empty shells if sources are missing.
-        # Useful for robustness, but monitor for zero-row helpers in production.
-        con.execute(
-            "CREATE OR REPLACE TABLE irx.blocks (block_oid BIGINT, block_guid TEXT, block_name TEXT, block_stereotype TEXT);"
-        )
-        con.execute(
-            "CREATE OR REPLACE TABLE irx.ports (port_oid BIGINT, port_guid TEXT, port_name TEXT, parent_block_oid BIGINT, classifier_oid BIGINT, pdata1_guid TEXT, port_stereotype TEXT);"
-        )
+            stale[name] = fp
+    if not stale:
+        log.info(f"helpers: {counts} (all current)")
+        return counts
 
-    # edges need ir.t_connector
-    if _table_exists("ir", "t_connector"):
-        con.execute(HELPERS["port_edges"])
-        con.execute(HELPERS["gen_edges"])
-        con.execute(HELPERS["trace_edges"])
-    else:
-        con.execute(
-            "CREATE OR REPLACE TABLE irx.port_edges (conn_oid BIGINT, src_port_oid BIGINT, dst_port_oid BIGINT, conn_type TEXT);"
-        )
-        con.execute(
-            "CREATE OR REPLACE TABLE irx.gen_edges (child_oid BIGINT, parent_oid BIGINT);"
-        )
+    # Only written to once something is stale (read paths use `stale_helpers`).
+    con.execute("CREATE SCHEMA IF NOT EXISTS irx;")
+    con.execute(
+        f"CREATE TABLE IF NOT EXISTS {_CATALOG} "
+        "(name VARCHAR PRIMARY KEY, fingerprint VARCHAR, rows BIGINT)"
+    )
+    workers = parallel or settings.INGEST_PARALLEL_TABLES or resolve_profile().threads
+    built: dict[str, int] = {}
+    with CursorPool(con, min(workers, len(stale))) as pool:
+        # Waves: a helper starts once the stale helpers it requires are built.
+        while len(built) < len(stale):
+            pending = [name for name in stale if name not in built]
+            ready = [
+                name
+                for name in pending
+                if not any(r in pending for r in HELPER_REGISTRY[name].requires)
+            ]
+            # DDL stays on `con` (serial); workers only load rows into the shells.
+            for name in ready:
+                _create_shell(con, HELPER_REGISTRY[name])
+            futures = {
+                name: pool.submit(_materialize, HELPER_REGISTRY[name]) for name in ready
+            }
+            built.update({name: f.result() for name, f in futures.items()})
+    for name, rows in built.items():
         con.execute(
-            "CREATE OR REPLACE TABLE irx.trace_edges (src_oid BIGINT, dst_oid BIGINT, kind TEXT);"
+            f"INSERT OR REPLACE INTO {_CATALOG} VALUES (?, ?, ?)",
+            [name, stale[name], rows],
         )
-
-    # Quick counts for logging/visibility.
-    counts = {}
-    for t in (
-        "irx.blocks",
-        "irx.ports",
-        "irx.port_edges",
-        "irx.gen_edges",
-        "irx.trace_edges",
-    ):
-        counts[t] = con.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0]
-    log.info(f"helpers: {counts}")
-    return counts
+        counts[f"irx.{name}"] = rows
+    log.info(f"helpers: {counts} rebuilt={list(built)}")
+    return {f"irx.{name}": counts[f"irx.{name}"] for name in wanted}
 
 
-def build_ir(model_dir: Path) -> Path:
-    """End-to-end build: create `ir.*` views, `irx.*` helpers, then ANALYZE.
+def build_ir(
+    model_dir: Path,
+    con: duckdb.DuckDBPyConnection | None = None,
+    helpers: Iterable[str] = (),
+) -> Path:
+    """End-to-end build: create `ir.*` views, the requested `irx.*` helpers, ANALYZE.
 
     Expect
     ------
@@ -258,27 +557,37 @@ def build_ir(model_dir: Path) -> Path:
     Output
     ------
     - `ir.*` views mirroring `main.t_*`
-    - `irx.*` materialized helper tables in the same DB
-    - Returns the DB path after closing the connection
+    - `irx.*` materialized helper tables named in `helpers` (the predicates
+      stage builds the ones predicates declare, see `build_helpers`)
+    - Returns the DB path
 
     Notes
     -----
     - Runs `ANALYZE` to populate optimizer statistics.
-    - Closes the connection before returning.
+    - Builds on `con` when given (an open connection to the same database,
+      e.g. the in-process pipeline's) and leaves it open; otherwise opens and
+      closes its own.
     """
     db_path = model_dir / "model.duckdb"
     if not db_path.exists():
         raise FileNotFoundError(f"DuckDB not found: {db_path}. Run loader first.")
 
-    con = connect(db_path)
-    created = create_ir_views(con)
+    owned = con is None
+    con = con or connect(db_path)
+    with log_timer("ir-views", logger=log):
+        created = create_ir_views(con)
     if not created:
         log.warning(
             "No base tables found to mirror into ir.* (did the loader create any t_* tables?)"
         )
-    counts = build_helpers(con)
-    con.execute("ANALYZE;")
-    con.close()
+    helpers = list(helpers)
+    if helpers:
+        with log_timer("ir-helpers", logger=log):
+            build_helpers(con, helpers)
+    with log_timer("ir-analyze", logger=log):
+        con.execute("ANALYZE;")
+    if owned:
+        con.close()
     return db_path
 
 
@@ -290,8 +599,17 @@ def main():
         required=True,
         help="Directory containing model.duckdb (from loader)",
     )
+    ap.add_argument(
+        "--helpers",
+        default="",
+        help="Comma-separated irx helpers to build now, or 'all' (default: none)",
+    )
     args = ap.parse_args()
-    p = build_ir(Path(args.model_dir).resolve())
+    if args.helpers == "all":
+        helpers = list(HELPER_REGISTRY)
+    else:
+        helpers = [h.strip() for h in args.helpers.split(",") if h.strip()]
+    p = build_ir(Path(args.model_dir).resolve(), helpers=helpers)
     print(str(p))
 
 
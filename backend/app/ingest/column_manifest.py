@@ -0,0 +1,260 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/column_manifest.py
+# Purpose: Which t_* columns downstream stages read; lean ingest keeps only those.
+# ------------------------------------------------------------
+
+"""Projection manifest for lean ingest.
+
+Exports carry dozens of columns per table (plus every `Extension_*`
+attribute) that no predicate or IR helper reads, yet the row engines fill
+each of them for every row. The manifest records the columns that are read,
+so a "lean" ingest can drop the rest while parsing: smaller row dicts, fewer
+Arrow columns, faster Parquet writes and smaller models.
+
+Responsibilities
+----------------
+- Derive `{table: columns}` from SQL (`sql_columns`, used for `build_ir.HELPERS`).
+- Collect the `COLUMNS` declared by predicate modules (`criteria.loader`).
+- Add row identity columns (`ea_guid`, adapter primary keys) so lean models
+  still diff (incremental ingest) and count rows.
+- Keep the sources of listed canonical columns (`Name` for `name_trim`), which
+  are derived from them when Parquet is written.
+- Give the row engines a cheap per-table keep test (`column_filter`).
+- Derive lean Parquet from full "cold" Parquet (`project_parquet`).
+
+Notes
+-----
+- Names compare case-insensitively (DuckDB identifiers do).
+- Tables absent from the manifest are kept whole; a table mapped to no
+  columns keeps only its key columns (its row count stays meaningful). An
+  adapter must list keys for tables without `ea_guid`, or such a table
+  would lose every column.
+- A predicate reading a column it does not declare sees it missing on lean
+  models; declare every candidate a predicate may pick.
+- Cold mode writes the full tables to `parquet/cold/` and publishes lean
+  copies, so dropped columns stay on disk for later analysis.
+- Packed extensions (`SchemaConfig.packs_extensions`): listing
+  `Extension_<attr>` keeps that attribute in the packed column, listing the
+  column itself (`extensions`) keeps all of them. Cold projection works on
+  whole columns, so there only the latter applies.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from app.utils.sql import quote_ident
+
+from .column_types import CANONICAL_COLUMNS, derived_sources
+from .parquet_layout import ParquetLayouts, layout_for_table
+
+log = logging.getLogger(__name__)
+
+# Ingest modes (wire-level settings/CLI values).
+MODES = ("full", "lean")
+# Subdirectory of `<model>/parquet/` holding full tables in cold mode.
+COLD_DIR = "cold"
+# Kept for every manifest table: row identity (see incremental.GUID_KEY).
+ALWAYS_KEEP = ("ea_guid",)
+
+# {table: lower-cased column names}
+ColumnManifest = Mapping[str, frozenset[str]]
+
+# `CREATE ... AS` prefix of a CTAS; json_serialize_sql only accepts queries.
+_CTAS = re.compile(r"^\s*CREATE\b.*?\bAS\s+(?=\(?\s*(?:SELECT|WITH)\b)", re.I | re.S)
+
+
+def sql_columns(sql: str) -> dict[str, set[str]]:
+    """Columns a query reads, per base table (schema dropped, aliases resolved).
+
+    Notes
+    -----
+    - Parses with DuckDB (`json_serialize_sql`); nothing is executed.
+    - Unqualified references count for every table in the query (a safe
+      over-approximation).
+    - Raises `ValueError` when the statement cannot be parsed.
+    """
+    query = _CTAS.sub("", sql.strip().rstrip(";"), count=1)
+    con = duckdb.connect()
+    try:
+        row = con.execute("SELECT json_serialize_sql(?)", [query]).fetchone()
+    finally:
+        con.close()
+    doc = json.loads(row[0]) if row else {}
+    if doc.get("error", True):
+        raise ValueError(f"cannot parse SQL: {doc.get('error_message', sql)}")
+
+    tables: dict[str, str] = {}  # alias or name -> table
+    refs: list[list[str]] = []
+
+    def _walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if node.get("type") == "BASE_TABLE":
+                name = node["table_name"]
+                tables[name] = name
+                if node.get("alias"):
+                    tables[node["alias"]] = name
+            elif node.get("class") == "COLUMN_REF":
+                refs.append(node["column_names"])
+            for value in node.values():
+                _walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                _walk(value)
+
+    _walk(doc.get("statements", []))
+    out: dict[str, set[str]] = {t: set() for t in tables.values()}
+    for names in refs:
+        if len(names) >= 2 and names[-2] in tables:
+            out[tables[names[-2]]].add(names[-1])
+        else:
+            for cols in out.values():
+                cols.add(names[-1])
+    return out
+
+
+def merge_columns(*parts: Mapping[str, Iterable[str]]) -> dict[str, frozenset[str]]:
+    """Union several `{table: columns}` maps (names lower-cased)."""
+    merged: dict[str, set[str]] = {}
+    for part in parts:
+        for table, cols in part.items():
+            merged.setdefault(table, set()).update(c.lower() for c in cols)
+    return {t: frozenset(c) for t, c in sorted(merged.items())}
+
+
+def ir_columns() -> dict[str, set[str]]:
+    """Columns read by the `irx.*` helper SQL in `build_ir.HELPERS`.
+
+    Only loader tables (`t_*`, mirrored by the `ir` views) are kept; helper
+    tables and CTE names the SQL also reads are not ingested.
+    """
+    # Deferred import: build_ir is a pipeline stage, not an ingest dependency.
+    from app.ingest.build_ir import HELPERS
+
+    out: dict[str, set[str]] = {}
+    for sql in HELPERS.values():
+        for table, cols in sql_columns(sql).items():
+            if table.startswith("t_"):
+                out.setdefault(table, set()).update(cols)
+    return out
+
+
+def ingest_manifest(
+    primary_keys: Mapping[str, tuple[str, ...]] | None = None,
+) -> dict[str, frozenset[str]]:
+    """Manifest for a lean ingest: predicate and IR columns plus row keys.
+
+    `primary_keys` comes from the input adapter. Without it, tables that no
+    stage reads columns from are left out (kept whole): their key is unknown,
+    and a table must keep at least one column to keep its rows.
+    """
+    # Deferred import: predicate discovery imports the criteria package.
+    from app.criteria.loader import declared_columns
+
+    base = merge_columns(declared_columns(), ir_columns())
+    if primary_keys is None:
+        base = {t: cols for t, cols in base.items() if cols}
+    keys = {
+        table: (*ALWAYS_KEEP, *(primary_keys or {}).get(table, ()))
+        for table in base
+    }
+    sources = {
+        table: derived_sources(cols, CANONICAL_COLUMNS, table)
+        for table, cols in base.items()
+    }
+    manifest = merge_columns(base, keys, sources)
+    log.info(
+        "column manifest tables=%d columns=%d",
+        len(manifest),
+        sum(len(c) for c in manifest.values()),
+    )
+    return manifest
+
+
+class _Keep(dict):
+    """`{column: keep?}` filled on first lookup (one `lower()` per name)."""
+
+    def __init__(self, names: frozenset[str]):
+        super().__init__()
+        self._names = names
+
+    def __missing__(self, column: str) -> bool:
+        keep = self[column] = column.lower() in self._names
+        return keep
+
+
+def column_filter(
+    manifest: ColumnManifest | None, table: str
+) -> Mapping[str, bool] | None:
+    """Keep test for `table`'s columns; None when the whole table is kept."""
+    if manifest is None or table not in manifest:
+        return None
+    return _Keep(manifest[table])
+
+
+def lean_schema(
+    schema: dict[str, list[str]],
+    manifest: ColumnManifest | None,
+    keep: Iterable[str] = (),
+) -> dict[str, list[str]]:
+    """Drop unlisted columns from a discovered `{table: columns}` schema.
+
+    Columns named in `keep` survive regardless (e.g. the packed extension
+    column, whose attributes are filtered one by one instead).
+    """
+    if manifest is None:
+        return schema
+    always = set(keep)
+    out = {}
+    for table, cols in schema.items():
+        test = column_filter(manifest, table)
+        out[table] = (
+            cols if test is None else [c for c in cols if c in always or test[c]]
+        )
+    return out
+
+
+def project_parquet(
+    con: duckdb.DuckDBPyConnection,
+    written: dict[str, tuple[Path, int]],
+    out_dir: Path,
+    manifest: ColumnManifest,
+    layouts: ParquetLayouts | None = None,
+) -> dict[str, tuple[Path, int]]:
+    """Write lean copies of full Parquet files (`written`) into `out_dir`.
+
+    Returns `{table: (lean_path, rows)}`. Column types and order are kept;
+    rows keep the source's sort order, cut into the `layouts` row groups.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    lean: dict[str, tuple[Path, int]] = {}
+    for table, (src, rows) in written.items():
+        dst = out_dir / src.name
+        src_sql = src.as_posix().replace("'", "''")
+        dst_sql = dst.as_posix().replace("'", "''")
+        if rows == 0:
+            lean[table] = (dst, 0)
+            continue
+        cols = [
+            d[0]
+            for d in con.execute(
+                f"SELECT * FROM read_parquet('{src_sql}') LIMIT 0"
+            ).description
+        ]
+        test = column_filter(manifest, table)
+        kept = [quote_ident(c) for c in cols if test is None or test[c]]
+        select = ", ".join(kept) or "*"
+        options = layout_for_table(layouts, table).copy_options()
+        res = con.execute(
+            f"COPY (SELECT {select} FROM read_parquet('{src_sql}')) "
+            f"TO '{dst_sql}' ({options});"
+        ).fetchone()
+        lean[table] = (dst, int(res[0]) if res else 0)
+    return lean
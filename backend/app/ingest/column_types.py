@@ -0,0 +1,227 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/column_types.py
+# Purpose: Logical column types published by adapters and their DuckDB casts.
+# ------------------------------------------------------------
+
+"""Typed column schema applied when rows are written to Parquet.
+
+Adapters publish a mapping of `{table: {column: logical_type}}`; the loader
+turns it into a `SELECT * REPLACE (...)` projection so each Parquet file gets
+stable, model-independent types for the columns it knows about. It may also
+declare canonical columns derived from a source column ("uuid(ea_guid)"),
+written next to the raw ones so later stages compare plain values instead of
+re-normalizing strings in every query.
+
+Responsibilities
+----------------
+- Define the logical type vocabulary ("int", "guid", "bool", "timestamp", ...).
+- Map each logical type to a DuckDB expression over the raw string value.
+- Resolve the per-table column types (table entries override "*" entries).
+- Define the canonical derived columns (`CANONICAL_COLUMNS`) and their
+  expressions (`derived_columns`).
+- Build the projection used by the JSONL and columnar Parquet writers.
+
+Notes
+-----
+- Casts use `TRY_CAST`: a malformed value becomes NULL instead of failing ingest.
+- GUIDs are normalized to upper case without braces; Sparx's "<none>" and
+  empty strings become NULL. They stay VARCHAR.
+- "map"/"json" parse JSON object text (packed `<Extension>` attributes) into
+  MAP(VARCHAR, VARCHAR) or JSON; malformed text fails the write.
+- Columns without a declared type are left as-is (JSONL: `read_json_auto`
+  inference; columnar: VARCHAR).
+- Derived columns are added only when their source column is present, and
+  are recomputed from it when the input already carries them.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+
+from app.utils.sql import quote_ident
+
+# {table: {column: logical_type}}; the "*" table applies to every table.
+ColumnTypes = Mapping[str, Mapping[str, str]]
+
+ANY_TABLE = "*"
+
+# Logical type -> DuckDB SQL type of the resulting column.
+LOGICAL_TYPES: dict[str, str] = {
+    "int": "BIGINT",
+    "double": "DOUBLE",
+    "bool": "BOOLEAN",
+    "timestamp": "TIMESTAMP",
+    "guid": "VARCHAR",
+    "text": "VARCHAR",
+    "json": "JSON",
+    "map": "MAP(VARCHAR, VARCHAR)",
+}
+
+# Derived column kinds: "<kind>(<source column>)" in a column types mapping.
+#   uuid  → normalized GUID as UUID (16 bytes); a value that is not hex GUID
+#           text maps to the md5 of its normalized form, so joins still match
+#   lower → trimmed, lower-cased text (stereotypes, kinds)
+#   trim  → trimmed text (names)
+DERIVED_KINDS = ("uuid", "lower", "trim")
+# DuckDB type of each derived kind.
+DERIVED_TYPES = {"uuid": "UUID", "lower": "VARCHAR", "trim": "VARCHAR"}
+_DERIVED = re.compile(r"^(\w+)\((.+)\)$")
+
+# Canonical columns every typed ingest writes (adapters merge these into their
+# column types; `build_ir` derives them on the fly for models without them).
+CANONICAL_COLUMNS: dict[str, dict[str, str]] = {
+    "*": {
+        "ea_uuid": "uuid(ea_guid)",
+        "stereotype_lc": "lower(Stereotype)",
+        "name_trim": "trim(Name)",
+    },
+    "t_object": {
+        "pdata1_uuid": "uuid(PDATA1)",
+    },
+}
+
+
+def cast_expr(column: str, logical: str) -> str:
+    """Return the DuckDB expression converting `column` to `logical`.
+
+    Raises `ValueError` for types outside `LOGICAL_TYPES`.
+    """
+    col = quote_ident(column)
+    if logical == "guid":
+        return _guid_expr(col)
+    if logical == "text":
+        return f"CAST({col} AS VARCHAR)"
+    if logical == "json":
+        return f"CAST({col} AS JSON)"
+    if logical == "map":
+        # Packed JSON object text → MAP (see schema_config.pack_extensions).
+        return f"CAST(CAST({col} AS JSON) AS {LOGICAL_TYPES['map']})"
+    try:
+        sql_type = LOGICAL_TYPES[logical]
+    except KeyError:
+        raise ValueError(
+            f"unknown logical column type '{logical}' "
+            f"(expected one of {sorted(LOGICAL_TYPES)})"
+        ) from None
+    return f"TRY_CAST({col} AS {sql_type})"
+
+
+def _guid_expr(col: str) -> str:
+    raw = f"TRIM(CAST({col} AS VARCHAR))"
+    return (
+        f"CASE WHEN {raw} IN ('', '<none>', '&lt;none&gt;') THEN NULL "
+        f"ELSE UPPER(REPLACE(REPLACE({raw}, '{{', ''), '}}', '')) END"
+    )
+
+
+def derived_source(spec: str) -> tuple[str, str] | None:
+    """`(kind, source)` for a derived column spec, None for a logical type.
+
+    Raises `ValueError` for an unknown kind.
+    """
+    m = _DERIVED.match(spec)
+    if m is None:
+        return None
+    kind, source = m.group(1), m.group(2).strip()
+    if kind not in DERIVED_KINDS:
+        raise ValueError(
+            f"unknown derived column kind '{kind}' (expected one of {DERIVED_KINDS})"
+        )
+    return kind, source
+
+
+def derived_expr(kind: str, source: str) -> str:
+    """The DuckDB expression computing a `kind` column from `source`."""
+    col = quote_ident(source)
+    if kind == "uuid":
+        guid = _guid_expr(col)
+        return f"COALESCE(TRY_CAST({guid} AS UUID), CAST(md5({guid}) AS UUID))"
+    if kind == "lower":
+        return f"LOWER(TRIM(CAST({col} AS VARCHAR)))"
+    return f"TRIM(CAST({col} AS VARCHAR))"
+
+
+def derived_columns(
+    columns: Iterable[str],
+    types: ColumnTypes | None,
+    table: str,
+    missing_as_null: bool = False,
+) -> dict[str, str]:
+    """`{name: expression}` for `table`'s derived columns whose source is present.
+
+    Sources match case-insensitively (as DuckDB identifiers do). With
+    `missing_as_null`, columns whose source is absent become typed NULLs.
+    """
+    present = {c.lower(): c for c in columns}
+    out: dict[str, str] = {}
+    for name, spec in types_for_table(types, table).items():
+        parsed = derived_source(spec)
+        if parsed is None:
+            continue
+        kind, source = parsed
+        if source.lower() in present:
+            out[name] = derived_expr(kind, present[source.lower()])
+        elif missing_as_null:
+            out[name] = f"CAST(NULL AS {DERIVED_TYPES[kind]})"
+    return out
+
+
+def derived_sources(
+    names: Iterable[str], types: ColumnTypes | None, table: str
+) -> set[str]:
+    """Source columns of the derived columns among `names` (for lean ingest)."""
+    wanted = {n.lower() for n in names}
+    out = set()
+    for name, spec in types_for_table(types, table).items():
+        parsed = derived_source(spec)
+        if parsed is not None and name.lower() in wanted:
+            out.add(parsed[1])
+    return out
+
+
+def with_column_type(
+    types: ColumnTypes | None, column: str, logical: str
+) -> ColumnTypes:
+    """Return a copy of `types` that also types `column` in every table."""
+    merged = {table: dict(cols) for table, cols in (types or {}).items()}
+    merged.setdefault(ANY_TABLE, {})[column] = logical
+    return merged
+
+
+def types_for_table(types: ColumnTypes | None, table: str) -> dict[str, str]:
+    """Merge the "*" entries with the table's own entries (table wins)."""
+    if not types:
+        return {}
+    merged = dict(types.get(ANY_TABLE, {}))
+    merged.update(types.get(table, {}))
+    return merged
+
+
+def typed_projection(
+    columns: Iterable[str], types: ColumnTypes | None, table: str
+) -> str:
+    """Return the select list that applies declared types to `columns`.
+
+    Notes
+    -----
+    - Only columns that are present and declared are replaced; the rest pass
+      through untouched, so the result is `*` when nothing applies.
+    - Column order is preserved (`* REPLACE` keeps positions); derived
+      columns are appended after them.
+    """
+    declared = types_for_table(types, table)
+    if not declared:
+        return "*"
+    columns = list(columns)
+    derived = derived_columns(columns, types, table)
+    replace = []
+    for col in columns:
+        if col in derived:  # already carried (e.g. a merged file): recompute
+            replace.append(f"{derived.pop(col)} AS {quote_ident(col)}")
+        elif col in declared and derived_source(declared[col]) is None:
+            replace.append(f"{cast_expr(col, declared[col])} AS {quote_ident(col)}")
+    select = "* REPLACE (" + ", ".join(replace) + ")" if replace else "*"
+    for name, expr in derived.items():
+        select += f", {expr} AS {quote_ident(name)}"
+    return select
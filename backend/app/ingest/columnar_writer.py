@@ -0,0 +1,232 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/columnar_writer.py
+# Purpose: Collect rows into per-table Arrow record batches and write Parquet directly.
+# ------------------------------------------------------------
+
+"""Columnar output for the ingest path (no JSONL round trip).
+
+Rows from a row engine are appended to per-table column buffers, sealed into
+Arrow record batches every `batch_rows` rows, and handed to DuckDB through
+Arrow registration to be written as one Parquet file per table.
+
+Responsibilities
+----------------
+- Buffer rows column-wise with a bounded number of Python objects per table.
+- Seal buffers into `pyarrow.RecordBatch` objects (string columns).
+- Flush a table when the row stream moves on to another table, or at the end.
+- Write Parquet via DuckDB `COPY` and return per-table paths and row counts.
+- Lay each file out per the adapter's `ParquetLayout` (sort key, row groups).
+- Optionally hand each table's write to a `CursorPool` so parsing continues.
+- Optionally hash each table's rows and reuse/fill the shared Parquet store.
+
+Notes
+-----
+- Requires `pyarrow`; the loader imports this module only in columnar mode.
+- Column sets may widen within a table; earlier batches are null-filled on flush.
+- A table that reappears after being flushed is merged with its existing file.
+- With `store=True`, a table already in the store skips the Arrow build and the
+  `COPY`; the model's file becomes a hard link to the stored one.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import parquet_store
+from .column_types import ColumnTypes, derived_columns, typed_projection
+from .duckdb_utils import CursorPool, copy_arrow_to_parquet
+from .errors import FileWriteError
+from .parquet_layout import ParquetLayouts, layout_for_table
+from .schema_config import pack_extensions
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BATCH_ROWS = 10_000
+
+
+class _TableBuffer:
+    """Column-oriented row buffer for one table; seals into Arrow batches."""
+
+    def __init__(
+        self, batch_rows: int, digest: parquet_store.RowDigest | None = None
+    ):
+        self.batch_rows = batch_rows
+        self.columns: dict[str, list[Any]] = {}
+        self.pending = 0
+        self.batches: list[pa.RecordBatch] = []
+        self.digest = digest
+
+    def append(self, row: dict[str, Any]) -> None:
+        if self.digest is not None:
+            self.digest.update(row)
+        # Widen: backfill a newly seen column for rows already pending.
+        for col in row:
+            if col not in self.columns:
+                self.columns[col] = [None] * self.pending
+        for col, values in self.columns.items():
+            values.append(row.get(col))
+        self.pending += 1
+        if self.pending >= self.batch_rows:
+            self.seal()
+
+    def seal(self) -> None:
+        if not self.pending:
+            return
+        names = list(self.columns)
+        arrays = [pa.array(self.columns[c], type=pa.string()) for c in names]
+        self.batches.append(pa.RecordBatch.from_arrays(arrays, names=names))
+        self.columns = {c: [] for c in names}
+        self.pending = 0
+
+    def to_table(self) -> pa.Table:
+        self.seal()
+        parts = [pa.Table.from_batches([b]) for b in self.batches]
+        # Batches sealed before a column appeared lack it; promote fills nulls.
+        return pa.concat_tables(parts, promote_options="default")
+
+
+def _as_text(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """A typed column back to strings (MAP columns to packed JSON text)."""
+    if pa.types.is_map(column.type):
+        packed = [
+            None if v is None else pack_extensions(dict(v))
+            for v in column.to_pylist()
+        ]
+        return pa.chunked_array([pa.array(packed, type=pa.string())])
+    return column.cast(pa.string())
+
+
+def write_parquet_tables(
+    row_iter: Iterable[tuple[str, dict[str, Any]]],
+    out_dir: Path,
+    con: duckdb.DuckDBPyConnection,
+    batch_rows: int | None = None,
+    pool: CursorPool | None = None,
+    column_types: ColumnTypes | None = None,
+    store: bool = False,
+    layouts: ParquetLayouts | None = None,
+) -> dict[str, tuple[Path, int]]:
+    """
+    Write one Parquet file per table from a (table, row) stream.
+
+    Returns `{table: (parquet_path, row_count)}`; row counts come from the
+    `COPY` itself, so callers do not need to rescan the files. With `pool`,
+    each finished table is written on a worker cursor while the stream moves on.
+    Declared `column_types` are cast on the way out; other columns stay VARCHAR.
+    With `store`, tables are written through the shared `parquet_store`.
+    `layouts` ({table: ParquetLayout}, usually from the input adapter) sets
+    each file's sort order and row-group options.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    batch_rows = DEFAULT_BATCH_ROWS if batch_rows is None else max(1, batch_rows)
+    pending: dict[str, Future[int]] = {}
+    written: dict[str, tuple[Path, int]] = {}
+    current: str | None = None
+    buf: _TableBuffer | None = None
+    # Digests span every <Table> block of a table, so a merged file is keyed
+    # by all of its rows.
+    digests: dict[str, parquet_store.RowDigest] = {}
+
+    def _write(
+        cur: duckdb.DuckDBPyConnection,
+        table: str,
+        data: pa.Table,
+        row_digest: str | None,
+    ) -> int:
+        path = out_dir / f"{table}.parquet"
+        projection = typed_projection(data.column_names, column_types, table)
+        layout = layout_for_table(layouts, table)
+
+        def _copy(target: Path) -> int:
+            try:
+                return copy_arrow_to_parquet(
+                    cur,
+                    data,
+                    target.as_posix().replace("'", "''"),
+                    projection,
+                    layout,
+                )
+            except Exception as e:
+                raise FileWriteError(
+                    f"parquet write failed table='{table}' path='{target}'"
+                ) from e
+
+        if row_digest is None:
+            return _copy(path)
+        key = parquet_store.store_key(
+            row_digest, projection, layout.signature(data.column_names)
+        )
+        rows, _hit = parquet_store.materialize(key, path, _copy)
+        return rows
+
+    def _store_hit(table: str, buffer: _TableBuffer, row_digest: str) -> bool:
+        """Link an already-stored table without building Arrow data."""
+        projection = typed_projection(buffer.columns, column_types, table)
+        layout = layout_for_table(layouts, table).signature(buffer.columns)
+        key = parquet_store.store_key(row_digest, projection, layout)
+        rows = parquet_store.link_cached(key, out_dir / f"{table}.parquet")
+        if rows is None:
+            return False
+        log.info("parquet store hit table=%s rows=%d key=%s", table, rows, key[:12])
+        fut: Future[int] = Future()
+        fut.set_result(rows)
+        pending[table] = fut
+        return True
+
+    def _flush(table: str, buffer: _TableBuffer) -> None:
+        # Snapshot now: the digest keeps growing if the table reappears later.
+        row_digest = buffer.digest.hexdigest() if buffer.digest else None
+        if (
+            row_digest is not None
+            and table not in pending
+            and _store_hit(table, buffer, row_digest)
+        ):
+            return
+        data = buffer.to_table()
+        if table in pending:
+            # Rare: table split across <Table> blocks; merge with the prior file.
+            # The prior file may be typed; back to strings so casts re-apply cleanly.
+            pending.pop(table).result()
+            prior = pq.read_table(out_dir / f"{table}.parquet")
+            # Derived columns are recomputed from their sources by the projection.
+            derived = derived_columns(prior.column_names, column_types, table)
+            prior = pa.table(
+                {
+                    n: _as_text(prior[n])
+                    for n in prior.column_names
+                    if n not in derived
+                }
+            )
+            data = pa.concat_tables([prior, data], promote_options="default")
+        if pool is not None:
+            pending[table] = pool.submit(_write, table, data, row_digest)
+        else:
+            fut: Future[int] = Future()
+            fut.set_result(_write(con, table, data, row_digest))
+            pending[table] = fut
+
+    for table, row in row_iter:
+        if table != current:
+            if current is not None and buf is not None:
+                _flush(current, buf)
+            digest = None
+            if store:
+                digest = digests.setdefault(table, parquet_store.RowDigest())
+            current, buf = table, _TableBuffer(batch_rows, digest)
+        assert buf is not None
+        buf.append(row)
+
+    if current is not None and buf is not None:
+        _flush(current, buf)
+
+    for table, fut in pending.items():
+        written[table] = (out_dir / f"{table}.parquet", fut.result())
+    return written
@@ -25,6 +25,7 @@ from pathlib import Path
 from lxml.etree import iterparse
 
 from app.ingest.schema_config import SchemaConfig
+from app.ingest.xml_source import xml_source
 from app.utils.timing import log_timer
 
 log = logging.getLogger("ingest.schema")
@@ -40,7 +41,8 @@ def discover_columns(
     Rules
     -----
     - `<Column name="...">` adds its name.
-    - `<Extension .../>` adds prefixed attributes (if enabled).
+    - `<Extension .../>` adds prefixed attributes (if enabled), or the one
+      packed extension column (`SchemaConfig.packs_extensions`).
     - Columns are sorted alphabetically for determinism.
 
     Notes
@@ -67,9 +69,9 @@ def discover_columns(
         row_tag=cfg.row_tag,
         column_tag=cfg.column_tag,
         extension_tag=cfg.extension_tag,
-    ):
+    ), xml_source(xml_path) as src:
         for event, elem in iterparse(
-            xml_path,
+            src,
             events=("start", "end"),
             tag=None,  # match all; we will filter by local-name to be namespace-safe
         ):
@@ -94,7 +96,8 @@ def discover_columns(
                     )
 
             # Each attribute becomes a namespaced column "Extension_<attr>" to avoid collisions.
-            # Very heterogeneous extensions can explode column count—consider disabling if not needed.
+            # Very heterogeneous extensions can explode column count—use a packed
+            # extension mode ("map"/"json": one column per table) if that bites.
             elif (
                 include_extensions
                 and cfg.extension_tag
@@ -102,9 +105,12 @@ def discover_columns(
                 and cfg.match(elem, cfg.extension_tag)
                 and current_table
             ):
-                for k in elem.keys():
-                    cols[current_table].add(f"{cfg.extension_prefix}{k}")
-                    ext_cols += 1
+                if cfg.packs_extensions and elem.keys():
+                    cols[current_table].add(cfg.extension_column)
+                elif not cfg.packs_extensions:
+                    for k in elem.keys():
+                        cols[current_table].add(f"{cfg.extension_prefix}{k}")
+                        ext_cols += 1
 
             elif event == "end" and cfg.match(elem, cfg.table_tag):
                 current_table = None
@@ -11,37 +11,55 @@ for performance and stability, while gracefully handling connection errors.
 Responsibilities
 ----------------
 - Open a DuckDB connection from a given file path.
-- Apply thread and memory PRAGMAs for controlled resource usage.
+- Apply the resource profile (threads, memory limit, spill directory) from
+  `app.core.resources`, so every connection is sized for the host/cgroup.
 - Enable the DuckDB object cache for improved performance.
 - Handle connection or PRAGMA errors with safe fallbacks.
 """
 
+from dataclasses import replace
 from pathlib import Path
 
 import duckdb
 
+from app.core.resources import ResourceProfile, resolve_profile
+
 from .errors import DuckDBError
 
 
-def open_duckdb(db_path: Path, threads: int, mem: str) -> duckdb.DuckDBPyConnection:
+def open_duckdb(
+    db_path: Path,
+    threads: int | None = None,
+    mem: str | None = None,
+    *,
+    profile: ResourceProfile | None = None,
+    read_only: bool = False,
+) -> duckdb.DuckDBPyConnection:
     """Open a DuckDB connection with tuned PRAGMAs for performance.
 
     Notes
     -----
-    - Applies `threads`, `memory_limit`, and `enable_object_cache` settings.
+    - Applies the resource `profile` (default: `resolve_profile()`) for
+      `threads`, `memory_limit` and `temp_directory`; explicit `threads` /
+      `mem` override it. Also enables `enable_object_cache`.
     - Fails gracefully if PRAGMA statements are not supported or error.
     - Callers must close the returned connection when done.
     """
+    profile = profile or resolve_profile()
+    if threads is not None:
+        profile = replace(profile, threads=int(threads))
+    if mem is not None:
+        profile = replace(profile, memory_limit=mem)
     try:
         # Try to open a connection to the specified DuckDB database file.
-        con = duckdb.connect(str(db_path))
+        con = duckdb.connect(str(db_path), read_only=read_only)
     except Exception as e:  # pragma: no cover
         # Wrap low-level DuckDB errors with a custom error for clearer logs.
         raise DuckDBError(f"duckdb connect failed db='{db_path}'") from e
     try:
         # Apply connection-level PRAGMAs for predictable performance.
-        con.execute(f"PRAGMA threads={int(threads)}")
-        con.execute(f"PRAGMA memory_limit='{mem}'")
+        for stmt in profile.pragmas():
+            con.execute(stmt)
         con.execute("PRAGMA enable_object_cache=true")
     except Exception:
         # If any PRAGMA fails, keep the connection open with defaults.
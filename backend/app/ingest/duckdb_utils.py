@@ -3,17 +3,23 @@
 # Purpose: Utility helpers for DuckDB data import and view management.
 # ------------------------------------------------------------
 
-"""DuckDB utilities for JSONL-to-Parquet conversion, view creation, and row counting.
+"""DuckDB utilities for JSONL/Arrow-to-Parquet copies, views, and row counting.
 
 This module provides lightweight helpers to perform file-based data operations
 using DuckDB, ensuring correct SQL literal escaping and quoting.
 
 Responsibilities
 ----------------
-- Safely quote SQL identifiers for DuckDB commands.
+- Quote SQL identifiers for DuckDB commands (`app.utils.sql.quote_ident`).
 - Copy JSONL data to Parquet format with compression via DuckDB.
+- Apply a table's physical layout (sort key, row groups) to those copies.
+- Copy an in-memory Arrow table to Parquet through DuckDB registration.
 - Create or replace a DuckDB view referencing a Parquet file.
+- Create or replace a native DuckDB table loaded from a Parquet file.
+- Tag published tables with their source file's signature (`source_signature`),
+  so derived tables (IR helpers) can tell whether a source changed.
 - Count the number of rows in a DuckDB table or view.
+- Run independent statements concurrently with one cursor per worker thread.
 
 Notes
 -----
@@ -23,19 +29,34 @@ Notes
 
 from __future__ import annotations
 
+import contextlib
+import itertools
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
 import duckdb
 
+from app.utils.sql import quote_ident
+
+from .parquet_layout import DEFAULT_LAYOUT, ParquetLayout
+
+T = TypeVar("T")
 
-def _qi(name: str) -> str:
-    """Quote an identifier for DuckDB (escaping internal double quotes)."""
-    return '"' + name.replace('"', '""') + '"'
+# Unique names for transiently registered Arrow tables (safe across cursors).
+_arrow_seq = itertools.count()
 
 
 def copy_jsonl_to_parquet(
     con: duckdb.DuckDBPyConnection,
     json_path_sql_literal: str,
     pq_path_sql_literal: str,
-) -> None:
+    projection: str = "*",
+    layout: ParquetLayout = DEFAULT_LAYOUT,
+    columns: list[str] | None = None,
+) -> int:
     """Convert a JSONL file to Parquet using DuckDB.
 
     Notes
@@ -43,14 +64,87 @@ def copy_jsonl_to_parquet(
     - Inputs must already be SQL-literal-safe (escape single quotes manually).
     - Uses Zstandard compression for smaller, efficient Parquet output.
     - Reads JSONL with `union_by_name=true` to handle mixed schemas safely.
+    - `projection` is the select list (e.g. typed casts from `column_types`).
+    - `layout` orders the rows by its sort columns found in `columns` and sets
+      row-group/dictionary options (see `parquet_layout`).
+    - Returns the number of rows written (taken from the `COPY` result).
     """
-    con.execute(
+    order = layout.order_clause(columns or ())
+    res = con.execute(
         f"""
         COPY (
-            SELECT * FROM read_json_auto('{json_path_sql_literal}', union_by_name = true)
-        ) TO '{pq_path_sql_literal}' (FORMAT PARQUET, COMPRESSION 'zstd');
+            SELECT {projection}
+            FROM read_json_auto('{json_path_sql_literal}', union_by_name = true)
+            {order}
+        ) TO '{pq_path_sql_literal}' ({layout.copy_options()});
         """
-    )
+    ).fetchone()
+    return int(res[0]) if res else 0
+
+
+def copy_arrow_to_parquet(
+    con: duckdb.DuckDBPyConnection,
+    arrow_table: Any,
+    pq_path_sql_literal: str,
+    projection: str = "*",
+    layout: ParquetLayout = DEFAULT_LAYOUT,
+) -> int:
+    """Write an Arrow table to Parquet via DuckDB and return the row count.
+
+    Notes
+    -----
+    - The Arrow table is registered under a temporary name and unregistered after.
+    - Uses the same Zstandard Parquet settings as `copy_jsonl_to_parquet`.
+    - `projection` is the select list (e.g. typed casts from `column_types`).
+    - `layout` sorts by its columns present in the Arrow schema.
+    - The row count is taken from the `COPY` result (no extra scan).
+    """
+    name = f"__arrow_src_{next(_arrow_seq)}"
+    order = layout.order_clause(arrow_table.column_names)
+    con.register(name, arrow_table)
+    try:
+        res = con.execute(
+            f"""
+            COPY (SELECT {projection} FROM {quote_ident(name)}{order})
+            TO '{pq_path_sql_literal}' ({layout.copy_options()});
+            """
+        ).fetchone()
+    finally:
+        con.unregister(name)
+    return int(res[0]) if res else 0
+
+
+def parquet_signature(pq_path_sql_literal: str) -> str:
+    """Identity of a Parquet file's current contents: inode, size, mtime.
+
+    Store-linked files share an inode, so identical tables in different models
+    (or re-ingests) keep the same signature.
+    """
+    st = os.stat(pq_path_sql_literal.replace("''", "'"))
+    return f"{st.st_ino}-{st.st_size}-{st.st_mtime_ns}"
+
+
+def tag_source(
+    con: duckdb.DuckDBPyConnection, table: str, kind: str, signature: str
+) -> None:
+    """Record `signature` as the comment of `main.<table>` ("VIEW" or "TABLE")."""
+    sig = signature.replace("'", "''")
+    con.execute(f"COMMENT ON {kind} main.{quote_ident(table)} IS '{sig}'")
+
+
+def source_signature(con: duckdb.DuckDBPyConnection, table: str) -> str | None:
+    """Signature tagged on `main.<table>` at publish time; None when untagged."""
+    row = con.execute(
+        """
+        SELECT comment FROM duckdb_tables()
+        WHERE schema_name = 'main' AND table_name = ?
+        UNION ALL
+        SELECT comment FROM duckdb_views()
+        WHERE schema_name = 'main' AND view_name = ?
+        """,
+        [table, table],
+    ).fetchone()
+    return row[0] if row and row[0] else None
 
 
 def create_or_replace_view(
@@ -62,10 +156,55 @@ def create_or_replace_view(
     -----
     - The view name is safely quoted to support special characters.
     - The Parquet path must already be SQL-literal-safe.
+    - Replaces a same-named table left by an earlier table-mode ingest.
+    - Tags the view with the file's `parquet_signature`.
     """
+    _drop_if_kind(con, table, "TABLE")
     con.execute(
-        f"CREATE OR REPLACE VIEW {_qi(table)} AS SELECT * FROM read_parquet('{pq_path_sql_literal}')"
+        f"CREATE OR REPLACE VIEW {quote_ident(table)} AS "
+        f"SELECT * FROM read_parquet('{pq_path_sql_literal}')"
     )
+    tag_source(con, table, "VIEW", parquet_signature(pq_path_sql_literal))
+
+
+def _drop_if_kind(con: duckdb.DuckDBPyConnection, name: str, kind: str) -> None:
+    """Drop `main.<name>` if it exists as `kind` ("VIEW" or "TABLE").
+
+    DuckDB refuses `CREATE OR REPLACE` across object kinds, so switching a
+    model between view and table storage must drop the old object first.
+    """
+    row = con.execute(
+        """
+        SELECT table_type FROM information_schema.tables
+        WHERE table_schema = 'main' AND table_name = ?
+        """,
+        [name],
+    ).fetchone()
+    existing = "VIEW" if row and row[0] == "VIEW" else "TABLE" if row else None
+    if existing == kind:
+        con.execute(f"DROP {kind} {quote_ident(name)}")
+
+
+def create_or_replace_table(
+    con: duckdb.DuckDBPyConnection, table: str, pq_path_sql_literal: str
+) -> int:
+    """Create or replace a native DuckDB table loaded from a Parquet file.
+
+    Notes
+    -----
+    - Data is copied into the database file, so reads use DuckDB's own
+      compression, zonemaps and statistics instead of decoding Parquet.
+    - Replaces a same-named view left by an earlier view-mode ingest.
+    - Returns the number of rows loaded (taken from the CTAS result).
+    - Tags the table with the file's `parquet_signature`.
+    """
+    _drop_if_kind(con, table, "VIEW")
+    res = con.execute(
+        f"CREATE OR REPLACE TABLE {quote_ident(table)} AS "
+        f"SELECT * FROM read_parquet('{pq_path_sql_literal}')"
+    ).fetchone()
+    tag_source(con, table, "TABLE", parquet_signature(pq_path_sql_literal))
+    return int(res[0]) if res else 0
 
 
 def count_rows(con: duckdb.DuckDBPyConnection, table: str) -> int:
@@ -76,4 +215,52 @@ def count_rows(con: duckdb.DuckDBPyConnection, table: str) -> int:
     - The table identifier is safely quoted to avoid SQL injection.
     - Returns an integer count of rows; raises if the table is missing.
     """
-    return int(con.execute(f"SELECT COUNT(*) FROM {_qi(table)};").fetchone()[0])
+    return int(con.execute(f"SELECT COUNT(*) FROM {quote_ident(table)};").fetchone()[0])
+
+
+class CursorPool:
+    """Thread pool whose workers each own one DuckDB cursor on a shared database.
+
+    Notes
+    -----
+    - `submit(fn, *args)` calls `fn(cursor, *args)` on a worker's own cursor.
+    - Cursors are created lazily per worker and closed by `close()`.
+    - Use for independent statements (e.g., per-table COPY); keep catalog DDL
+      on the owning connection to avoid write-write conflicts.
+    """
+
+    def __init__(self, con: duckdb.DuckDBPyConnection, max_workers: int):
+        self._con = con
+        self._local = threading.local()
+        self._cursors: list[duckdb.DuckDBPyConnection] = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="duckdb-worker"
+        )
+
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        cur = getattr(self._local, "cur", None)
+        if cur is None:
+            with self._lock:
+                cur = self._con.cursor()
+                self._cursors.append(cur)
+            self._local.cur = cur
+        return cur
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> Future[T]:
+        """Schedule `fn(cursor, *args)` on a worker thread."""
+        return self._pool.submit(lambda: fn(self._cursor(), *args))
+
+    def close(self) -> None:
+        """Wait for pending work, then close every worker cursor."""
+        self._pool.shutdown(wait=True)
+        for cur in self._cursors:
+            with contextlib.suppress(Exception):
+                cur.close()
+        self._cursors.clear()
+
+    def __enter__(self) -> CursorPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,411 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/incremental.py
+# Purpose: Re-ingest a model revision as a row delta against a base model.
+# ------------------------------------------------------------
+
+"""Incremental ingest: diff a new export against a base model and apply the delta.
+
+A revision of a model usually changes a handful of rows. Instead of building
+the new model from scratch, the base model's DuckDB is copied, each `t_*`
+table is diffed against the revision's Parquet (rows joined on `ea_guid` or
+the adapter's primary key), and only inserted/updated/deleted rows are
+applied. Later stages need no change list: helpers are rebuilt by the source
+signature each patched table is re-tagged with.
+
+Responsibilities
+----------------
+- Parse the revision to per-table Parquet (shared store makes unchanged
+  tables a link, not a conversion).
+- Copy `<base>/model.duckdb` to the new model directory, checkpointed and
+  held open so no writer changes it mid-copy.
+- Honour the lean-column and extension modes of a full ingest, so a delta
+  model has the same columns as a full ingest of the same export.
+- Classify each table: unchanged, changed, added, removed or replaced (the
+  column set or types differ) and count inserted/updated/deleted rows.
+- Native tables: apply `DELETE`/`INSERT` for changed keys in place.
+- Views: re-point every view at the revision's own Parquet file.
+- Return the usual ingest result plus the changed table names.
+
+Notes
+-----
+- Rows are compared whole (`EXCEPT ALL`); keys only pair an old row with its
+  new version so the change counts as an update rather than delete + insert.
+- A key that is missing or not unique on either side falls back to rewriting
+  the table from the revision's Parquet.
+- View storage re-points every view anyway, so tables are not diffed there:
+  one is unchanged when its Parquet signature matches the base's (a shared
+  store link), otherwise changed (no row counts). Only bases written by the
+  columnar sink share store entries with the revision's parse.
+- The copied database keeps the base's `ir`/`irx` objects; `build_ir`
+  recreates the views, and `irx` helpers are rebuilt only for tables whose
+  contents changed (each patched table is re-tagged with its new signature).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import shutil
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import duckdb
+
+from app.core.config import settings
+from app.core.paths import MODELS_DIR
+from app.core.stage_manifest import StageManifest
+from app.ingest.column_manifest import COLD_DIR, project_parquet
+from app.ingest.duckdb_connection import open_duckdb
+from app.ingest.duckdb_utils import (
+    count_rows,
+    create_or_replace_table,
+    create_or_replace_view,
+    parquet_signature,
+    source_signature,
+    tag_source,
+)
+from app.ingest.loader_duckdb import (
+    MODES,
+    STORAGES,
+    _adapter_column_types,
+    _adapter_layouts,
+    _lean_manifest,
+    compute_model_id,
+    parse_to_parquet,
+)
+from app.ingest.types import DeltaResult
+from app.input_adapters.router import get_adapter
+from app.utils.sql import quote_ident
+from app.utils.timing import log_timer
+
+log = logging.getLogger(__name__)
+
+# Preferred row key whenever a table carries it.
+GUID_KEY = "ea_guid"
+
+_ADD = "__delta_add"
+_DEL = "__delta_del"
+
+
+@dataclass
+class TableDelta:
+    """How one `t_*` table differs between the base model and the revision."""
+
+    status: str  # "unchanged" | "changed" | "added" | "removed" | "replaced"
+    rows: int
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    key: list[str] | None = None
+
+
+def _pq(path: Path) -> str:
+    return "read_parquet('" + path.as_posix().replace("'", "''") + "')"
+
+
+def _describe(con: duckdb.DuckDBPyConnection, relation: str) -> list[tuple[str, str]]:
+    rows = con.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()
+    return [(name, dtype) for name, dtype, *_ in rows]
+
+
+def _base_tables(con: duckdb.DuckDBPyConnection) -> dict[str, str]:
+    """`{t_*: "VIEW" | "BASE TABLE"}` in the copied database."""
+    return dict(
+        con.execute(
+            """
+            SELECT table_name, table_type FROM information_schema.tables
+            WHERE table_schema = 'main' AND table_name LIKE 't\\_%' ESCAPE '\\'
+            """
+        ).fetchall()
+    )
+
+
+def row_key(
+    table: str, columns: list[str], primary_keys: Mapping[str, tuple[str, ...]]
+) -> list[str] | None:
+    """Key columns for `table`: `ea_guid` if present, else the adapter's key."""
+    if GUID_KEY in columns:
+        return [GUID_KEY]
+    key = list(primary_keys.get(table, ()))
+    return key if key and all(c in columns for c in key) else None
+
+
+def _unique(con: duckdb.DuckDBPyConnection, relation: str, key: list[str]) -> bool:
+    cols = ", ".join(quote_ident(c) for c in key)
+    dupes = con.execute(
+        f"SELECT COUNT(*) - COUNT(DISTINCT ({cols})) FROM {relation}"
+    ).fetchone()[0]
+    return dupes == 0
+
+
+def _key_match(key: list[str], left: str, right: str) -> str:
+    return " AND ".join(
+        f"{left}.{quote_ident(c)} IS NOT DISTINCT FROM {right}.{quote_ident(c)}"
+        for c in key
+    )
+
+
+def diff_table(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    new_relation: str,
+    key: list[str] | None,
+) -> TableDelta:
+    """Diff `main.<table>` against `new_relation`; leaves the diff in temp tables.
+
+    `__delta_add` holds rows only in the revision, `__delta_del` rows only in
+    the base. A `key` that is not unique on both sides is dropped (reported
+    as None) and the change counts become plain inserts/deletes.
+    """
+    old = f"main.{quote_ident(table)}"
+    con.execute(
+        f"CREATE OR REPLACE TEMP TABLE {_ADD} AS "
+        f"SELECT * FROM {new_relation} EXCEPT ALL SELECT * FROM {old}"
+    )
+    con.execute(
+        f"CREATE OR REPLACE TEMP TABLE {_DEL} AS "
+        f"SELECT * FROM {old} EXCEPT ALL SELECT * FROM {new_relation}"
+    )
+    rows = int(con.execute(f"SELECT COUNT(*) FROM {new_relation}").fetchone()[0])
+    added = count_rows(con, _ADD)
+    dropped = count_rows(con, _DEL)
+    if not added and not dropped:
+        return TableDelta("unchanged", rows, key=key)
+
+    if key and not (_unique(con, old, key) and _unique(con, new_relation, key)):
+        log.info("delta key not unique table=%s key=%s; comparing rows", table, key)
+        key = None
+    updated = 0
+    if key:
+        updated = int(
+            con.execute(
+                f"SELECT COUNT(*) FROM {_ADD} a WHERE EXISTS "
+                f"(SELECT 1 FROM {_DEL} d WHERE {_key_match(key, 'a', 'd')})"
+            ).fetchone()[0]
+        )
+    return TableDelta(
+        "changed",
+        rows,
+        inserted=added - updated,
+        updated=updated,
+        deleted=dropped - updated,
+        key=key,
+    )
+
+
+def _apply_in_place(con: duckdb.DuckDBPyConnection, table: str, key: list[str]) -> None:
+    """Replace changed/deleted keys of a native table with the revision's rows."""
+    t = quote_ident(table)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(
+            f"DELETE FROM main.{t} WHERE EXISTS "
+            f"(SELECT 1 FROM {_DEL} d WHERE {_key_match(key, f'main.{t}', 'd')})"
+        )
+        con.execute(f"INSERT INTO main.{t} SELECT * FROM {_ADD}")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+
+def apply_delta(
+    con: duckdb.DuckDBPyConnection,
+    written: Mapping[str, tuple[Path, int]],
+    storage: str,
+    primary_keys: Mapping[str, tuple[str, ...]],
+) -> dict[str, TableDelta]:
+    """Bring the copied base database in line with the revision's Parquet files.
+
+    `written` is `{table: (parquet_path, rows)}` for the revision. Returns the
+    per-table delta (tables in either model, in revision order first).
+    """
+    base = _base_tables(con)
+    new = {t: p for t, (p, rows) in written.items() if rows}
+    deltas: dict[str, TableDelta] = {}
+
+    for table, pq_path in new.items():
+        relation = _pq(pq_path)
+        pq_sql = pq_path.as_posix().replace("'", "''")
+        if table not in base:
+            delta = TableDelta("added", written[table][1], inserted=written[table][1])
+        elif _describe(con, relation) != _describe(con, f"main.{quote_ident(table)}"):
+            old_rows = count_rows(con, table)
+            rows = written[table][1]
+            delta = TableDelta("replaced", rows, inserted=rows, deleted=old_rows)
+        elif storage == "view":
+            same = source_signature(con, table) == parquet_signature(pq_sql)
+            delta = TableDelta("unchanged" if same else "changed", written[table][1])
+        else:
+            columns = [c for c, _ in _describe(con, relation)]
+            key = row_key(table, columns, primary_keys)
+            with log_timer("delta-diff", logger=log, table=table):
+                delta = diff_table(con, table, relation, key)
+
+        if storage == "view":
+            # Views always follow the revision's own file (self-contained model).
+            create_or_replace_view(con, table, pq_sql)
+        elif (
+            base.get(table) != "BASE TABLE"
+            or delta.status in ("added", "replaced")
+            or (delta.status == "changed" and not delta.key)
+        ):
+            # Added, replaced, not native, or no usable key: rewrite from the file.
+            create_or_replace_table(con, table, pq_sql)
+        elif delta.status == "changed":
+            with log_timer("delta-apply", logger=log, table=table):
+                _apply_in_place(con, table, delta.key)
+            # Same rows as the revision's file now; helpers key on its signature.
+            tag_source(con, table, "TABLE", parquet_signature(pq_sql))
+        if delta.status != "unchanged":
+            log.info(
+                "delta table=%s status=%s inserted=%d updated=%d deleted=%d",
+                table,
+                delta.status,
+                delta.inserted,
+                delta.updated,
+                delta.deleted,
+            )
+        deltas[table] = delta
+
+    for table, kind in base.items():
+        if table in new:
+            continue
+        deltas[table] = TableDelta("removed", 0, deleted=count_rows(con, table))
+        kind = "VIEW" if kind == "VIEW" else "TABLE"
+        con.execute(f"DROP {kind} main.{quote_ident(table)}")
+
+    for name in (_ADD, _DEL):
+        con.execute(f"DROP TABLE IF EXISTS {name}")
+    return deltas
+
+
+def changed_tables(deltas: Mapping[str, TableDelta]) -> list[str]:
+    """Sorted names of tables whose rows differ from the base model."""
+    return sorted(t for t, d in deltas.items() if d.status != "unchanged")
+
+
+def copy_base(base_db: Path, db_path: Path) -> None:
+    """Copy the base database to `db_path` with everything committed to it.
+
+    The base is checkpointed (commits still in its WAL reach the copy) and
+    stays open until the copy is done, so no other process can write it
+    mid-copy. Raises `DuckDBError` when another process holds the base open.
+    """
+    con = open_duckdb(base_db)
+    try:
+        con.execute("CHECKPOINT")
+        shutil.copyfile(base_db, db_path)
+    finally:
+        con.close()
+    # A WAL left by an earlier model under this id would replay onto the copy.
+    db_path.with_name(db_path.name + ".wal").unlink(missing_ok=True)
+
+
+def ingest_xml_delta(
+    xml_path: Path,
+    base_model_id: str,
+    model_id: str | None = None,
+    engine: str | None = None,
+    storage: str | None = None,
+    workers: int | None = None,
+    vendor: str | None = None,
+    version: str | None = None,
+    store: bool | None = None,
+    columns: str | None = None,
+    cold: bool | None = None,
+    extensions: str | None = None,
+) -> DeltaResult:
+    """Ingest `xml_path` as a revision of `base_model_id`.
+
+    Same inputs as `loader_duckdb.ingest_xml` plus the base model; `columns`,
+    `cold` and `extensions` shape the revision's tables exactly as a full
+    ingest would. Raises `FileNotFoundError` when the XML or the base model
+    database is missing and `ValueError` when the revision would overwrite its
+    own base.
+    """
+    xml_path = xml_path.resolve()
+    if not xml_path.exists():
+        raise FileNotFoundError(f"XML not found: {xml_path}")
+    base_db = MODELS_DIR / base_model_id / "model.duckdb"
+    if not base_db.exists():
+        raise FileNotFoundError(f"base model DuckDB not found: {base_db}")
+    model_id = model_id or compute_model_id(xml_path)
+    if model_id == base_model_id:
+        raise ValueError(f"revision and base are the same model: {model_id}")
+    storage = storage or settings.INGEST_STORAGE
+    if storage not in STORAGES:
+        raise ValueError(f"unknown ingest storage '{storage}' (expected {STORAGES})")
+    columns = columns or settings.INGEST_COLUMNS
+    if columns not in MODES:
+        raise ValueError(f"unknown ingest columns '{columns}' (expected {MODES})")
+    keep_columns = (
+        _lean_manifest(vendor, version or "") if columns == "lean" else None
+    )
+    cold = settings.INGEST_COLD_PARQUET if cold is None else cold
+
+    model_dir = MODELS_DIR / model_id
+    parquet_dir = model_dir / "parquet"
+    parquet_dir.mkdir(parents=True, exist_ok=True)
+    # t_* are about to change: stages recorded against the old tables rerun.
+    StageManifest(model_dir).begin("ingest")
+    column_types = _adapter_column_types(vendor, version or "") if vendor else None
+    primary_keys: Mapping[str, tuple[str, ...]] = {}
+    if vendor:
+        # Unknown adapters were already warned about by _adapter_column_types.
+        with contextlib.suppress(ValueError):
+            primary_keys = get_adapter(vendor, version or "").primary_keys()
+
+    with log_timer(
+        "ingest-delta", logger=log, model_id=model_id, base_model_id=base_model_id
+    ):
+        layouts = _adapter_layouts(vendor, version or "") if vendor else None
+        lean_cold = keep_columns is not None and cold
+        written = parse_to_parquet(
+            xml_path,
+            parquet_dir / COLD_DIR if lean_cold else parquet_dir,
+            engine=engine,
+            column_types=column_types,
+            workers=workers,
+            store=store,
+            keep_columns=None if lean_cold else keep_columns,
+            extensions=extensions,
+            layouts=layouts,
+        )
+        if lean_cold:
+            # Same as a full lean ingest: full tables stay cold, lean copies publish.
+            scratch = open_duckdb(Path(":memory:"))
+            try:
+                written = project_parquet(
+                    scratch, written, parquet_dir, keep_columns, layouts
+                )
+            finally:
+                scratch.close()
+        db_path = model_dir / "model.duckdb"
+        copy_base(base_db, db_path)
+        con = open_duckdb(db_path)
+        try:
+            deltas = apply_delta(con, written, storage, primary_keys)
+            con.execute("ANALYZE;")
+        finally:
+            con.close()
+
+    changed = changed_tables(deltas)
+    log.info(
+        "delta applied model_id=%s base=%s changed=%d/%d tables=%s",
+        model_id,
+        base_model_id,
+        len(changed),
+        len(deltas),
+        ",".join(changed) or "(none)",
+    )
+    return {
+        "model_id": model_id,
+        "duckdb_path": str(db_path),
+        "jsonl_dir": str(model_dir / "jsonl"),
+        "parquet_dir": str(parquet_dir),
+        "tables": {t: rows for t, (_p, rows) in written.items() if rows},
+        "base_model_id": base_model_id,
+        "changed_tables": changed,
+    }
@@ -1,89 +1,432 @@
 # ------------------------------------------------------------
 # Module: backend/app/ingest/loader_duckdb.py
-# Purpose: Ingest an XML export into DuckDB via JSONL→Parquet, create views, and return row counts.
+# Purpose: Ingest an XML export into DuckDB via JSONL or Arrow→Parquet, create
+#          views, and return row counts.
 # ------------------------------------------------------------
 
-"""Stream–normalize XML to per-table JSONL, convert to Parquet, and register DuckDB views.
+"""Stream–normalize XML to JSONL or Arrow batches, write Parquet, register views.
 
 Responsibilities
 ----------------
-- Compute a stable model id from XML content.
-- Stream normalized rows and write per-table JSONL.
-- Copy JSONL to Parquet and (re)create DuckDB views.
+- Compute a stable model id from XML content (decompressed for .gz/.zst/.zip).
+- Stream normalized rows (two-pass, one-pass or fast engine) into a row sink.
+- Or fan `<Table>` byte ranges out to worker processes ("parallel" engine).
+- Apply the adapter's typed column schema when writing Parquet.
+- Lay Parquet out per the adapter's table layouts (sort key, row groups).
+- Sink "jsonl": write per-table JSONL, then copy JSONL to Parquet.
+- Sink "columnar": write Arrow record batches straight to Parquet.
+- Convert tables concurrently (one DuckDB cursor per worker thread).
+- Publish each table as a view over its Parquet file or as a native table.
+- Reuse identical tables from the shared content-addressed Parquet store.
+- Store `<Extension>` attributes as columns or one MAP/JSON column.
+- Lean mode: keep only the columns downstream stages read (`column_manifest`),
+  optionally with the full tables kept as cold Parquet.
 - Return per-table row counts and key output paths; provide a small CLI.
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import logging
 import sys
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import Any
+
+import duckdb
 
 from app.core.config import settings
 from app.core.paths import MODELS_DIR
+from app.core.resources import resolve_profile
+from app.core.stage_manifest import StageManifest
+from app.ingest import parquet_store
+from app.ingest.column_manifest import (
+    COLD_DIR,
+    MODES,
+    ColumnManifest,
+    ingest_manifest,
+    project_parquet,
+)
+from app.ingest.column_types import ColumnTypes, typed_projection, with_column_type
 from app.ingest.duckdb_connection import open_duckdb
 from app.ingest.duckdb_utils import (
+    CursorPool,
     copy_jsonl_to_parquet,
-    count_rows,
+    create_or_replace_table,
     create_or_replace_view,
 )
 from app.ingest.jsonl_writer import write_jsonl_tables
-from app.ingest.normalize_rows import normalized_rows
+from app.ingest.normalize_rows import ENGINES, get_engine
+from app.ingest.parallel_parse import parse_parallel
+from app.ingest.parquet_layout import (
+    ParquetLayouts,
+    layout_for_table,
+    layouts_from_spec,
+)
+from app.ingest.schema_config import EXTENSION_MODES, SchemaConfig
 from app.ingest.types import IngestResult
+from app.ingest.xml_source import XML, codec_of, sha256_xml
+from app.input_adapters.router import get_adapter
 from app.utils.hashing import compute_sha256_stream
 from app.utils.timing import log_timer as _timer
 
 log = logging.getLogger(__name__)
 
+# Row sinks accepted by `load_xml_to_duckdb` (wire-level settings/CLI values).
+OUTPUTS = ("jsonl", "columnar")
+# How t_* objects are published in model.duckdb.
+STORAGES = ("view", "table")
+# Multi-process engine: not a row engine, workers write Parquet themselves.
+PARALLEL_ENGINE = "parallel"
+ENGINE_CHOICES = (*sorted(ENGINES), PARALLEL_ENGINE)
+# An open connection, or a callable that opens one once parsing is done (so
+# the "parallel" engine never forks with DuckDB live in this process).
+LazyConnection = duckdb.DuckDBPyConnection | Callable[[], duckdb.DuckDBPyConnection]
+
 
 def compute_model_id(xml_path: Path) -> str:
-    """sha256(xml)[:8] computed in a streaming fashion."""
-    with open(xml_path, "rb") as f:
-        return compute_sha256_stream(f)[:8]
+    """sha256(xml)[:8] over the decompressed XML, computed in a streaming fashion."""
+    return sha256_xml(xml_path)[:8]
+
+
+def _resolve_engine(xml_path: Path, engine: str) -> str:
+    """Byte-range parsing needs raw XML; compressed exports use the fast engine."""
+    if engine == PARALLEL_ENGINE and codec_of(xml_path) != XML:
+        log.info("compressed export; parallel engine falls back to 'fast'")
+        return "fast"
+    return engine
+
+
+def _connect(
+    con: LazyConnection | None,
+) -> duckdb.DuckDBPyConnection | None:
+    """Open a lazily supplied connection (see `LazyConnection`)."""
+    return con() if callable(con) else con
+
+
+def extension_config(
+    extensions: str | None, column_types: ColumnTypes | None
+) -> tuple[SchemaConfig, ColumnTypes | None]:
+    """Schema config for an extension mode, and column types that cast it.
+
+    `extensions` ("columns" | "map" | "json") defaults to
+    `settings.INGEST_EXTENSIONS`; packed modes type the extension column.
+    """
+    config = SchemaConfig(extension_mode=extensions or settings.INGEST_EXTENSIONS)
+    if config.packs_extensions:
+        column_types = with_column_type(
+            column_types, config.extension_column, config.extension_mode
+        )
+    return config, column_types
 
 
-# NOTE: identifier quoting is handled inside app.ingest.parquet_views
+def _publish(
+    con: duckdb.DuckDBPyConnection, table: str, pq_path: Path, storage: str
+) -> None:
+    """Expose one Parquet file as `main.<table>` (view or native table)."""
+    pq_sql = pq_path.as_posix().replace("'", "''")
+    if storage == "table":
+        with _timer("load-native-table", table=table):
+            create_or_replace_table(con, table, pq_sql)
+    else:
+        create_or_replace_view(con, table, pq_sql)
 
 
-def load_xml_to_duckdb(xml_path: Path, model_dir: Path) -> dict[str, int]:
+def load_xml_to_duckdb(
+    xml_path: Path,
+    model_dir: Path,
+    engine: str | None = None,
+    output: str | None = None,
+    parallel: int | None = None,
+    storage: str | None = None,
+    column_types: ColumnTypes | None = None,
+    workers: int | None = None,
+    store: bool | None = None,
+    keep_columns: ColumnManifest | None = None,
+    cold: bool = False,
+    extensions: str | None = None,
+    con: LazyConnection | None = None,
+    layouts: ParquetLayouts | None = None,
+) -> dict[str, int]:
     """
-    Two-pass path:
-        - normalized_rows() -> write per-table JSONL
-        - COPY (SELECT * FROM read_json_auto(...)) TO ... PARQUET
-        - create t_* views over Parquet
-        - return counts
+    Ingest path:
+        - row engine (two-pass, one-pass or fast) -> row stream
+        - or engine "parallel": prescan <Table> byte ranges, parse them in a
+          process pool, each worker writing its tables' Parquet (no row sink)
+        - output "jsonl": write per-table JSONL, then
+          COPY (SELECT * FROM read_json_auto(...)) TO ... PARQUET
+        - output "columnar": Arrow record batches -> PARQUET (no JSONL hop)
+        - publish t_* as views over Parquet, or as native DuckDB tables
+        - return counts (taken from the Parquet writes, not a rescan)
+
+    `engine` selects the row engine ("two_pass" | "one_pass" | "fast") or
+    "parallel"; defaults to
+    `settings.INGEST_ENGINE`. `output` selects the sink ("jsonl" | "columnar");
+    defaults to `settings.INGEST_OUTPUT`. `parallel` caps concurrent per-table
+    Parquet writes; defaults to `settings.INGEST_PARALLEL_TABLES`, falling back
+    to the resource profile's threads (`app.core.resources`). `storage`
+    selects "view" (read Parquet on every query) or "table" (copy into
+    model.duckdb once); defaults to `settings.INGEST_STORAGE`.
+    `column_types` ({table: {column: logical_type}}, usually from the input
+    adapter) types the Parquet columns it names; other columns keep inferred
+    types; `layouts` ({table: ParquetLayout}, also from the adapter) set each
+    file's sort order and row groups. `workers` sizes the "parallel" engine's
+    process pool; defaults to `settings.INGEST_WORKERS`, falling back to the
+    CPU count.
+    `store` routes Parquet through the shared content-addressed store (tables
+    whose rows were seen before are linked, not converted); defaults to
+    `settings.INGEST_PARQUET_STORE`. `keep_columns` (a `column_manifest`)
+    drops unlisted columns while parsing; with `cold`, the full tables are
+    written to `parquet/cold/` instead and lean copies are published (this
+    always goes through the columnar writer). `extensions` stores
+    `<Extension>` attributes as columns or packs them into one MAP/JSON
+    column (see `extension_config`). `con`, an open connection to
+    `<model_dir>/model.duckdb` (or a callable opening one, called after any
+    worker processes are done), is used instead of opening one and is left
+    open (the in-process pipeline shares it with IR and predicates).
     """
-    log.info("ingest start xml='%s' model_dir='%s'", str(xml_path), str(model_dir))
+    engine = _resolve_engine(xml_path, engine or settings.INGEST_ENGINE)
+    output = output or settings.INGEST_OUTPUT
+    if output not in OUTPUTS:
+        raise ValueError(f"unknown ingest output '{output}' (expected {OUTPUTS})")
+    storage = storage or settings.INGEST_STORAGE
+    if storage not in STORAGES:
+        raise ValueError(f"unknown ingest storage '{storage}' (expected {STORAGES})")
+    row_engine = None if engine == PARALLEL_ENGINE else get_engine(engine)
+    parallel = (
+        parallel or settings.INGEST_PARALLEL_TABLES or resolve_profile().threads
+    )
+    store = settings.INGEST_PARQUET_STORE if store is None else store
+    config, column_types = extension_config(extensions, column_types)
+    log.info(
+        "ingest start xml='%s' model_dir='%s' engine=%s output=%s storage=%s store=%s",
+        str(xml_path),
+        str(model_dir),
+        engine,
+        output,
+        storage,
+        store,
+    )
     jsonl_dir = model_dir / "jsonl"
     parquet_dir = model_dir / "parquet"
-    jsonl_dir.mkdir(parents=True, exist_ok=True)
     parquet_dir.mkdir(parents=True, exist_ok=True)
+    db_path = model_dir / "model.duckdb"
+    # t_* are about to change: stages recorded against the old tables rerun.
+    StageManifest(model_dir).begin("ingest")
+
+    if keep_columns is not None and cold:
+        written = parse_to_parquet(
+            xml_path,
+            parquet_dir / COLD_DIR,
+            engine=engine,
+            column_types=column_types,
+            workers=workers,
+            store=store,
+            extensions=config.extension_mode,
+            layouts=layouts,
+        )
+        scratch = open_duckdb(Path(":memory:"))
+        try:
+            with _timer("project-lean-parquet", tables=len(written)):
+                written = project_parquet(
+                    scratch, written, parquet_dir, keep_columns, layouts
+                )
+        finally:
+            scratch.close()
+        return publish_parquet(
+            model_dir, written, storage=storage, con=_connect(con)
+        )
 
-    # Pass 1/2: discover schema + stream rows to JSONL (consume iterator once).
-    with _timer("discover+stream-schema", xml=str(xml_path)):
+    if row_engine is None:
+        # Worker processes start before DuckDB is opened in this process.
+        workers = workers or settings.INGEST_WORKERS
+        with _timer("parse-parallel", xml=str(xml_path), workers=workers):
+            written, schema = parse_parallel(
+                xml_path,
+                parquet_dir,
+                workers=workers,
+                batch_rows=settings.INGEST_BATCH_ROWS,
+                column_types=column_types,
+                store=store,
+                keep_columns=keep_columns,
+                config=config,
+                layouts=layouts,
+            )
+        return publish_parquet(
+            model_dir, written, storage=storage, con=_connect(con)
+        )
+
+    # Two-pass discovers the schema here; one-pass fills it while rows stream.
+    with _timer("discover+stream-schema", xml=str(xml_path), engine=engine):
         try:
-            schema, row_iter = normalized_rows(xml_path)
+            schema, row_iter = row_engine(
+                xml_path, config=config, keep_columns=keep_columns
+            )
         except Exception:
             log.error("schema discovery failed xml='%s'", str(xml_path), exc_info=True)
             raise
+
+    # Open DuckDB (the columnar sink writes Parquet through it while parsing).
+    owned = con is None
+    con = _connect(con) or open_duckdb(db_path)
+
+    if output == "columnar":
+        counts = _load_columnar(
+            con, row_iter, parquet_dir, parallel, storage, column_types, store, layouts
+        )
+    else:
+        jsonl_dir.mkdir(parents=True, exist_ok=True)
+        # Write per-table JSONL (LRU-managed handles); consumes the iterator once.
+        with _timer("write-jsonl"):
+            paths = write_jsonl_tables(row_iter, jsonl_dir)
+        counts = _load_jsonl(
+            con,
+            paths,
+            schema,
+            parquet_dir,
+            parallel,
+            storage,
+            column_types,
+            store,
+            layouts,
+        )
+    return _finish(con, counts, schema, close=owned)
+
+
+def parse_to_parquet(
+    xml_path: Path,
+    parquet_dir: Path,
+    engine: str | None = None,
+    column_types: ColumnTypes | None = None,
+    workers: int | None = None,
+    store: bool | None = None,
+    keep_columns: ColumnManifest | None = None,
+    extensions: str | None = None,
+    layouts: ParquetLayouts | None = None,
+) -> dict[str, tuple[Path, int]]:
+    """Parse `xml_path` into per-table Parquet files without a model database.
+
+    Row engines feed the columnar writer on a private in-memory connection;
+    "parallel" fans out to worker processes. Returns `{table: (path, rows)}`
+    for callers that publish the files themselves (e.g. incremental ingest).
+    `keep_columns` drops columns missing from a `column_manifest`;
+    `extensions` is the extension mode (see `extension_config`); `layouts`
+    are the adapter's table layouts.
+    """
+    engine = _resolve_engine(xml_path, engine or settings.INGEST_ENGINE)
+    store = settings.INGEST_PARQUET_STORE if store is None else store
+    config, column_types = extension_config(extensions, column_types)
+    if engine == PARALLEL_ENGINE:
+        written, _schema = parse_parallel(
+            xml_path,
+            parquet_dir,
+            workers=workers or settings.INGEST_WORKERS,
+            batch_rows=settings.INGEST_BATCH_ROWS,
+            column_types=column_types,
+            store=store,
+            keep_columns=keep_columns,
+            config=config,
+            layouts=layouts,
+        )
+        return written
+
+    # Deferred import: pyarrow is only required on the columnar path.
+    from app.ingest.columnar_writer import write_parquet_tables
+
+    row_engine = get_engine(engine)
+    con = open_duckdb(Path(":memory:"))
+    try:
+        with _timer("parse-to-parquet", xml=str(xml_path), engine=engine):
+            _schema, row_iter = row_engine(
+                xml_path, config=config, keep_columns=keep_columns
+            )
+            return write_parquet_tables(
+                row_iter,
+                parquet_dir,
+                con,
+                batch_rows=settings.INGEST_BATCH_ROWS,
+                column_types=column_types,
+                store=store,
+                layouts=layouts,
+            )
+    finally:
+        con.close()
+
+
+def publish_parquet(
+    model_dir: Path,
+    written: dict[str, tuple[Path, int]],
+    storage: str | None = None,
+    con: duckdb.DuckDBPyConnection | None = None,
+) -> dict[str, int]:
+    """Publish Parquet files written elsewhere into `<model_dir>/model.duckdb`.
+
+    Used when parsing happened outside this process/connection (parallel
+    workers, streaming upload). `written` is `{table: (parquet_path, rows)}`.
+    `con` (an open connection to that database) is used and left open. The
+    model's recorded stages are forgotten (`StageManifest.begin("ingest")`).
+    """
+    storage = storage or settings.INGEST_STORAGE
+    if storage not in STORAGES:
+        raise ValueError(f"unknown ingest storage '{storage}' (expected {STORAGES})")
+    # t_* are about to change: stages recorded against the old tables rerun.
+    StageManifest(model_dir).begin("ingest")
+    owned = con is None
+    con = con or open_duckdb(model_dir / "model.duckdb")
+    counts = _publish_written(con, written, storage)
+    return _finish(con, counts, written, close=owned)
+
+
+def _finish(
+    con: duckdb.DuckDBPyConnection,
+    counts: dict[str, int],
+    schema: dict[str, Any],
+    close: bool = True,
+) -> dict[str, int]:
+    """Log the table count, ANALYZE, and close the connection (unless `close=False`)."""
     log.info("discovered tables=%d", len(schema))
 
-    # Write per-table JSONL (LRU-managed handles).
-    with _timer("write-jsonl"):
-        paths = write_jsonl_tables(row_iter, jsonl_dir)
+    # Collect stats (may be a no-op if no tables).
+    try:
+        with _timer("analyze", tables=len(counts)):
+            con.execute("ANALYZE;")
+    except Exception:
+        # ANALYZE can fail if no tables created; log and continue
+        log.debug(
+            "ANALYZE skipped or failed; possibly no tables created", exc_info=True
+        )
 
-    # Open DuckDB and prepare Parquet export.
-    db_path = model_dir / "model.duckdb"
-    con = open_duckdb(
-        db_path,
-        threads=getattr(settings, "DUCKDB_THREADS", 4),
-        mem=getattr(settings, "DUCKDB_MEM", "1GB"),
-    )
+    if close:
+        con.close()
+    return counts
 
-    counts: dict[str, int] = {}
 
+def _load_jsonl(
+    con: duckdb.DuckDBPyConnection,
+    paths: dict[str, Path],
+    schema: dict[str, list[str]],
+    parquet_dir: Path,
+    parallel: int,
+    storage: str,
+    column_types: ColumnTypes | None,
+    store: bool = False,
+    layouts: ParquetLayouts | None = None,
+) -> dict[str, int]:
+    """COPY per-table JSONL files to Parquet concurrently, then publish tables.
+
+    Notes
+    -----
+    - Up to `parallel` tables convert at once, each on its own worker cursor.
+    - Largest files are scheduled first so small tables do not queue behind them.
+    - Row counts come from each `COPY` result (no extra scan through the view).
+    - Declared column types are cast in the `COPY` select list; the table's
+      layout adds its `ORDER BY` and row-group options.
+    - With `store`, the JSONL bytes (the serialized row stream) key the shared
+      Parquet store; a stored table is linked and its `COPY` skipped.
+    """
+    jobs: list[tuple[str, int, str]] = []
     for table, p in paths.items():
         # Skip empty or missing JSONL files.
         try:
@@ -94,49 +437,182 @@ def load_xml_to_duckdb(xml_path: Path, model_dir: Path) -> dict[str, int]:
         if size == 0:
             log.info("no rows for table=%s; skipping", table)
             continue
+        jobs.append((table, size, p.as_posix()))
 
-        json_path = p.as_posix()
-
-        pq_path = (parquet_dir / f"{table}.parquet").as_posix()
-
+    def _convert(
+        cur: duckdb.DuckDBPyConnection, table: str, size: int, json_path: str
+    ) -> int:
+        pq_path = parquet_dir / f"{table}.parquet"
         # Escape single quotes for SQL literals.
         json_sql = json_path.replace("'", "''")
-        pq_sql = pq_path.replace("'", "''")
+        columns = list(schema.get(table, ()))
+        projection = typed_projection(columns, column_types, table)
+        layout = layout_for_table(layouts, table)
+
+        def _copy(target: Path) -> int:
+            pq_sql = target.as_posix().replace("'", "''")
+            with _timer("copy-jsonl-to-parquet", table=table, bytes=size):
+                return copy_jsonl_to_parquet(
+                    cur, json_sql, pq_sql, projection, layout, columns
+                )
+
+        if not store:
+            return _copy(pq_path)
+        with open(json_path, "rb") as f:
+            # JSONL and Arrow sinks infer different types; keep their keys apart.
+            row_digest = "jsonl:" + compute_sha256_stream(f)
+        key = parquet_store.store_key(
+            row_digest, projection, layout.signature(columns)
+        )
+        rows, hit = parquet_store.materialize(key, pq_path, _copy)
+        if hit:
+            log.info("parquet store hit table=%s rows=%d key=%s", table, rows, key[:12])
+        return rows
+
+    with (
+        _timer("convert-parquet", tables=len(jobs), parallel=parallel),
+        CursorPool(con, parallel) as pool,
+    ):
+        futures = {
+            table: pool.submit(_convert, table, size, json_path)
+            for table, size, json_path in sorted(jobs, key=lambda j: -j[1])
+        }
+        rows_by_table = {table: f.result() for table, f in futures.items()}
+
+    # Catalog DDL stays on the owning connection, in input order.
+    counts: dict[str, int] = {}
+    with _timer("publish-tables", tables=len(jobs), storage=storage):
+        for table, _size, _json_path in jobs:
+            pq_path = parquet_dir / f"{table}.parquet"
+            _publish(con, table, pq_path, storage)
+            counts[table] = rows = rows_by_table[table]
+            log.info("loaded table=%s rows=%s → %s", table, rows, pq_path.name)
+    return counts
 
-        # 1) Write Parquet from JSONL.
-        with _timer("copy-jsonl-to-parquet", table=table, bytes=size):
-            copy_jsonl_to_parquet(con, json_sql, pq_sql)
 
-        # 2) Create/replace view over Parquet.
-        create_or_replace_view(con, table, pq_sql)
+def _load_columnar(
+    con: duckdb.DuckDBPyConnection,
+    row_iter: Iterable[tuple[str, dict[str, Any]]],
+    parquet_dir: Path,
+    parallel: int,
+    storage: str,
+    column_types: ColumnTypes | None,
+    store: bool = False,
+    layouts: ParquetLayouts | None = None,
+) -> dict[str, int]:
+    """Write Arrow batches straight to Parquet, then publish tables; no JSONL.
+
+    Each finished table is written on a worker cursor while parsing continues
+    with the next table (up to `parallel` writes in flight).
+    """
+    # Deferred import: pyarrow is only required when columnar output is selected.
+    from app.ingest.columnar_writer import write_parquet_tables
+
+    with _timer("write-parquet-columnar"), CursorPool(con, parallel) as pool:
+        written = write_parquet_tables(
+            row_iter,
+            parquet_dir,
+            con,
+            batch_rows=settings.INGEST_BATCH_ROWS,
+            pool=pool,
+            column_types=column_types,
+            store=store,
+            layouts=layouts,
+        )
+    return _publish_written(con, written, storage)
 
-        # 3) Count via the view.
-        rows = int(count_rows(con, table))
-        counts[table] = rows
-        log.info("loaded table=%s rows=%s → %s", table, rows, pq_path.split("/")[-1])
 
-    # Collect stats (may be a no-op if no tables).
+def _publish_written(
+    con: duckdb.DuckDBPyConnection,
+    written: dict[str, tuple[Path, int]],
+    storage: str,
+) -> dict[str, int]:
+    """Publish Parquet files written by the columnar/parallel paths; skip empties."""
+    counts: dict[str, int] = {}
+    with _timer("publish-tables", tables=len(written), storage=storage):
+        for table, (pq_path, rows) in written.items():
+            if rows == 0:
+                log.info("no rows for table=%s; skipping", table)
+                continue
+            _publish(con, table, pq_path, storage)
+            counts[table] = rows
+            log.info("loaded table=%s rows=%s → %s", table, rows, pq_path.name)
+    return counts
+
+
+def _adapter_column_types(vendor: str, version: str) -> ColumnTypes | None:
+    """Typed column schema from the matching adapter; None (inference) if unknown."""
     try:
-        con.execute("ANALYZE;")
-    except Exception:
-        # ANALYZE can fail if no tables created; log and continue
-        log.debug(
-            "ANALYZE skipped or failed; possibly no tables created", exc_info=True
+        return get_adapter(vendor, version).column_types()
+    except ValueError:
+        log.warning(
+            "no adapter for vendor=%s version=%s; inferring column types",
+            vendor,
+            version,
         )
+        return None
 
-    con.close()
-    return counts
+
+def _adapter_layouts(vendor: str, version: str) -> ParquetLayouts | None:
+    """Parquet table layouts from the matching adapter; None (defaults) if unknown."""
+    try:
+        return layouts_from_spec(get_adapter(vendor, version).layouts())
+    except ValueError:
+        return None  # already warned by _adapter_column_types
+
+
+def _lean_manifest(vendor: str | None, version: str) -> ColumnManifest:
+    """Column manifest for a lean ingest, keyed with the adapter's row keys."""
+    primary_keys = None
+    if vendor:
+        # Unknown adapters were already warned about by _adapter_column_types.
+        with contextlib.suppress(ValueError):
+            primary_keys = get_adapter(vendor, version).primary_keys()
+    return ingest_manifest(primary_keys)
 
 
 def ingest_xml(
-    xml_path: Path, model_id: str | None = None, overwrite: bool = False
+    xml_path: Path,
+    model_id: str | None = None,
+    overwrite: bool = False,
+    engine: str | None = None,
+    output: str | None = None,
+    parallel: int | None = None,
+    storage: str | None = None,
+    workers: int | None = None,
+    vendor: str | None = None,
+    version: str | None = None,
+    store: bool | None = None,
+    columns: str | None = None,
+    cold: bool | None = None,
+    extensions: str | None = None,
+    con: LazyConnection | None = None,
 ) -> IngestResult:
-    """Pure entry point for tools/API to call; no argparse/print."""
+    """Pure entry point for tools/API to call; no argparse/print.
+
+    When `vendor`/`version` are given, the matching input adapter supplies the
+    typed column schema and Parquet table layouts; otherwise column types are
+    inferred and files keep DuckDB's default layout. `columns`
+    ("full" | "lean") defaults to `settings.INGEST_COLUMNS`; `cold` (lean
+    only) defaults to `settings.INGEST_COLD_PARQUET`. `extensions` selects
+    how `<Extension>` attributes are stored (see `extension_config`). `con`
+    is an open connection to the model database to load through, or a callable
+    opening one after parsing (left open).
+    """
     xml_path = xml_path.resolve()
     if not xml_path.exists():
         raise FileNotFoundError(f"XML not found: {xml_path}")
     model_id = model_id or compute_model_id(xml_path)
     model_dir = MODELS_DIR / model_id
+    column_types = _adapter_column_types(vendor, version or "") if vendor else None
+    layouts = _adapter_layouts(vendor, version or "") if vendor else None
+    columns = columns or settings.INGEST_COLUMNS
+    if columns not in MODES:
+        raise ValueError(f"unknown ingest columns '{columns}' (expected {MODES})")
+    keep_columns = (
+        _lean_manifest(vendor, version or "") if columns == "lean" else None
+    )
+    cold = settings.INGEST_COLD_PARQUET if cold is None else cold
     # NOTE: deletion/purge is the caller's responsibility.
 
     with _timer(
@@ -145,7 +621,22 @@ def ingest_xml(
         model_dir=str(model_dir),
         model_id=model_id,
     ):
-        counts = load_xml_to_duckdb(xml_path, model_dir)
+        counts = load_xml_to_duckdb(
+            xml_path,
+            model_dir,
+            engine=engine,
+            output=output,
+            parallel=parallel,
+            storage=storage,
+            column_types=column_types,
+            workers=workers,
+            store=store,
+            keep_columns=keep_columns,
+            cold=cold,
+            extensions=extensions,
+            con=con,
+            layouts=layouts,
+        )
     return {
         "model_id": model_id,
         "duckdb_path": str(model_dir / "model.duckdb"),
@@ -167,11 +658,100 @@ def _main():
         action="store_true",
         help="Purge output dir first (caller responsibility if desired)",
     )
+    ap.add_argument(
+        "--engine",
+        choices=ENGINE_CHOICES,
+        help="Row engine (default: settings.INGEST_ENGINE)",
+    )
+    ap.add_argument(
+        "--output",
+        choices=OUTPUTS,
+        help="Row sink: jsonl or columnar (default: settings.INGEST_OUTPUT)",
+    )
+    ap.add_argument(
+        "--parallel",
+        type=int,
+        help="Max concurrent table conversions (default: DuckDB threads)",
+    )
+    ap.add_argument(
+        "--storage",
+        choices=STORAGES,
+        help="Publish t_* as Parquet views or native tables "
+        "(default: settings.INGEST_STORAGE)",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        help="Processes for --engine parallel (default: settings.INGEST_WORKERS)",
+    )
+    ap.add_argument(
+        "--no-parquet-store",
+        action="store_true",
+        help="Write private Parquet copies instead of using the shared store",
+    )
+    ap.add_argument(
+        "--base-model-id",
+        help="Ingest as a revision of this model: apply only the row delta "
+        "(see app.ingest.incremental)",
+    )
+    ap.add_argument(
+        "--columns",
+        choices=MODES,
+        help="Keep every column, or only those predicates/IR read "
+        "(default: settings.INGEST_COLUMNS)",
+    )
+    ap.add_argument(
+        "--cold-parquet",
+        action="store_true",
+        default=None,
+        help="With --columns lean, keep the full tables in parquet/cold/",
+    )
+    ap.add_argument(
+        "--extensions",
+        choices=EXTENSION_MODES,
+        help="<Extension> attributes as columns, one MAP or one JSON column "
+        "(default: settings.INGEST_EXTENSIONS)",
+    )
+    ap.add_argument("--vendor", help="Input vendor (enables typed columns)")
+    ap.add_argument("--version", help="Input vendor version (with --vendor)")
     args = ap.parse_args()
 
     try:
+        if args.base_model_id:
+            # Deferred import: the incremental module builds on this one.
+            from app.ingest.incremental import ingest_xml_delta
+
+            res = ingest_xml_delta(
+                Path(args.xml),
+                args.base_model_id,
+                model_id=args.model_id,
+                engine=args.engine,
+                storage=args.storage,
+                workers=args.workers,
+                vendor=args.vendor,
+                version=args.version or "",
+                store=False if args.no_parquet_store else None,
+                columns=args.columns,
+                cold=args.cold_parquet,
+                extensions=args.extensions,
+            )
+            print(json.dumps(res, indent=2))
+            return
         res = ingest_xml(
-            Path(args.xml), model_id=args.model_id, overwrite=args.overwrite
+            Path(args.xml),
+            model_id=args.model_id,
+            overwrite=args.overwrite,
+            engine=args.engine,
+            output=args.output,
+            parallel=args.parallel,
+            storage=args.storage,
+            workers=args.workers,
+            vendor=args.vendor,
+            version=args.version or "",
+            store=False if args.no_parquet_store else None,
+            columns=args.columns,
+            cold=args.cold_parquet,
+            extensions=args.extensions,
         )
     except Exception:
         logging.getLogger(__name__).exception("ingest failed")
@@ -3,32 +3,41 @@
 # Purpose: Stream-normalize XML into tabular rows based on a discovered schema.
 # ------------------------------------------------------------
 
-"""Normalize XML into table-shaped rows via a two-pass process.
+"""Normalize XML into table-shaped rows via a two-pass or one-pass process.
 
-The module discovers a schema from the XML, then streams the document to yield
-(table, row) pairs with defaults and extensions applied.
+The two-pass engine discovers a schema from the XML, then streams the document
+to yield (table, row) pairs with defaults and extensions applied. The one-pass
+engine parses once, buffering rows per `<Table>` while widening its column set,
+and fills missing columns when the table is flushed. The fast engine has the
+one-pass semantics but only asks lxml for `<Table>`/`<Row>` events and reads
+a row's columns from its children at `</Row>`.
 
 Responsibilities
 ----------------
 - Discover table/column schema from XML using `SchemaConfig`.
-- Stream-parse XML elements and match table/row/column tags.
-- Apply per-table defaults and extension attributes; fill missing columns.
+- Stream-parse XML elements and match table/row/column tags (plain or
+  compressed exports, see `xml_source`).
+- Apply per-table defaults and extension attributes (one column each, or
+  packed into `SchemaConfig.extension_column`); fill missing columns.
 - Yield normalized (table, row) tuples and return the discovered schema.
 - Log timing and a summary of rows and missing fills.
+- Expose a small engine registry so the loader can pick two-pass, one-pass or fast.
 """
 
 from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Mapping
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from lxml.etree import iterparse
 
+from app.ingest.column_manifest import ColumnManifest, column_filter, lean_schema
 from app.ingest.discover_schema import discover_columns
-from app.ingest.schema_config import SchemaConfig, local_name
+from app.ingest.schema_config import SchemaConfig, local_name, pack_extensions
+from app.ingest.xml_source import xml_source
 from app.utils.timing import log_timer
 
 log = logging.getLogger("ingest.normalize")
@@ -39,15 +48,20 @@ def normalized_rows(
     defaults: dict[str, dict[str, Any]] | None = None,
     include_extensions: bool = True,
     config: SchemaConfig | None = None,
+    keep_columns: ColumnManifest | None = None,
 ) -> tuple[dict[str, list[str]], Iterable[tuple[str, dict[str, Any]]]]:
     """
     Two-pass stream normalizer.
     Returns (schema, row_iter) where row_iter yields (table, normalized_row_dict).
+    With `keep_columns` (see `column_manifest`), unlisted columns are dropped
+    from the schema, and so from every row.
     """
     cfg = config or SchemaConfig()
+    packed, ext_col = cfg.packs_extensions, cfg.extension_column
     schema = discover_columns(
         xml_path, include_extensions=include_extensions, config=cfg
     )
+    schema = lean_schema(schema, keep_columns, keep=(ext_col,) if packed else ())
     if not schema:
         raise ValueError(
             "No tables/columns discovered. Check SchemaConfig or XML structure."
@@ -57,18 +71,19 @@ def normalized_rows(
     def _row_stream() -> Iterable[tuple[str, dict[str, Any]]]:
         current_table: str | None = None
         current_row: dict[str, Any] | None = None
+        current_ext: dict[str, str] = {}
+        keep: Mapping[str, bool] | None = None
         rows_per_table: dict[str, int] = defaultdict(int)
         missing_fills_per_table: dict[str, int] = defaultdict(int)
 
-        with log_timer("stream-rows", xml=str(xml_path)):
-            for event, elem in iterparse(
-                str(xml_path), events=("start", "end"), tag=None
-            ):
+        with log_timer("stream-rows", xml=str(xml_path)), xml_source(xml_path) as src:
+            for event, elem in iterparse(src, events=("start", "end"), tag=None):
                 tag = local_name(elem)
 
                 if event == "start" and cfg.match(elem, cfg.table_tag):
                     tname = elem.get(cfg.table_name_attr)
                     current_table = tname if (tname in schema) else None
+                    keep = column_filter(keep_columns, tname or "")
                     if tname and current_table is None:
                         log.debug(
                             "skip unknown table name='%s' (not in discovered schema)",
@@ -79,6 +94,7 @@ def normalized_rows(
                     event == "start" and cfg.match(elem, cfg.row_tag) and current_table
                 ):
                     current_row = {}
+                    current_ext = {}
 
                 elif (
                     event == "end"
@@ -109,7 +125,14 @@ def normalized_rows(
                     and current_row is not None
                 ):
                     for k, v in elem.items():
-                        current_row[f"{cfg.extension_prefix}{k}"] = v
+                        if not packed:
+                            current_row[f"{cfg.extension_prefix}{k}"] = v
+                        elif (
+                            keep is None
+                            or keep[ext_col]
+                            or keep[f"{cfg.extension_prefix}{k}"]
+                        ):
+                            current_ext[k] = v
 
                 elif (
                     event == "end"
@@ -117,6 +140,8 @@ def normalized_rows(
                     and current_table
                     and current_row is not None
                 ):
+                    if current_ext:
+                        current_row[ext_col] = pack_extensions(current_ext)
                     table_defaults = (defaults or {}).get(current_table, {})
                     filled = {}
                     missing = 0
@@ -150,3 +175,330 @@ def normalized_rows(
         )
 
     return schema, _row_stream()
+
+
+def normalized_rows_one_pass(
+    xml_path: str | Path | IO[bytes],
+    defaults: dict[str, dict[str, Any]] | None = None,
+    include_extensions: bool = True,
+    config: SchemaConfig | None = None,
+    keep_columns: ColumnManifest | None = None,
+) -> tuple[dict[str, list[str]], Iterable[tuple[str, dict[str, Any]]]]:
+    """
+    One-pass stream normalizer (single parse of the XML).
+    Returns (schema, row_iter) with the same shapes as `normalized_rows`.
+
+    Notes
+    -----
+    - Rows are buffered per `<Table>` element while its column set widens;
+      missing columns are filled (defaults, else None) when the table ends.
+    - `schema` starts empty and is populated as `row_iter` is consumed; it is
+      complete (columns sorted A→Z) once the iterator is exhausted.
+    - If a table name repeats in a later `<Table>` block, rows flushed earlier
+      only carry the columns seen up to that point (consumers union by name).
+    - Peak memory is bounded by the largest single `<Table>` block.
+    - `xml_path` may also be a binary stream (used by the parallel engine).
+    - With `keep_columns` (see `column_manifest`), unlisted columns are
+      dropped as they are read.
+    """
+    cfg = config or SchemaConfig()
+    packed, ext_col = cfg.packs_extensions, cfg.extension_column
+    schema: dict[str, list[str]] = {}
+
+    def _row_stream() -> Iterable[tuple[str, dict[str, Any]]]:
+        cols: dict[str, set[str]] = defaultdict(set)
+        buffered: list[dict[str, Any]] = []
+        current_table: str | None = None
+        current_row: dict[str, Any] | None = None
+        current_ext: dict[str, str] = {}
+        keep: Mapping[str, bool] | None = None
+        rows_per_table: dict[str, int] = defaultdict(int)
+        missing_fills_per_table: dict[str, int] = defaultdict(int)
+
+        def _flush(table: str) -> Iterable[tuple[str, dict[str, Any]]]:
+            # Fill against the table's widened column set (sorted for determinism).
+            names = sorted(cols[table])
+            schema[table] = names
+            table_defaults = (defaults or {}).get(table, {})
+            missing = 0
+            for row in buffered:
+                filled = {}
+                for col in names:
+                    if col in row:
+                        filled[col] = row[col]
+                    else:
+                        filled[col] = table_defaults.get(col, None)
+                        missing += 1
+                yield (table, filled)
+            if missing:
+                missing_fills_per_table[table] += missing
+            rows_per_table[table] += len(buffered)
+            buffered.clear()
+
+        with (
+            log_timer("stream-rows-one-pass", logger=log, xml=str(xml_path)),
+            xml_source(xml_path) as src,
+        ):
+            for event, elem in iterparse(src, events=("start", "end"), tag=None):
+                if event == "start" and cfg.match(elem, cfg.table_tag):
+                    tname = elem.get(cfg.table_name_attr)
+                    current_table = tname or None
+                    keep = column_filter(keep_columns, tname or "")
+                    if not tname:
+                        log.warning(
+                            "table without '%s' attribute encountered",
+                            cfg.table_name_attr,
+                        )
+
+                elif (
+                    event == "start" and cfg.match(elem, cfg.row_tag) and current_table
+                ):
+                    current_row = {}
+                    current_ext = {}
+
+                elif (
+                    event == "end"
+                    and cfg.match(elem, cfg.column_tag)
+                    and current_table
+                    and current_row is not None
+                ):
+                    col = elem.get(cfg.column_name_attr)
+                    if col and keep is not None and not keep[col]:
+                        pass  # not in the lean manifest
+                    elif col:
+                        val = elem.get(cfg.column_value_attr)
+                        if val is None:
+                            txt = (elem.text or "").strip()
+                            val = txt if txt != "" else None
+                        current_row[col] = val
+                    else:
+                        log.warning(
+                            "row column missing '%s' attribute table='%s'",
+                            cfg.column_name_attr,
+                            current_table,
+                        )
+
+                elif (
+                    include_extensions
+                    and cfg.extension_tag
+                    and event == "start"
+                    and cfg.match(elem, cfg.extension_tag)
+                    and current_table
+                    and current_row is not None
+                ):
+                    for k, v in elem.items():
+                        name = f"{cfg.extension_prefix}{k}"
+                        if packed:
+                            if keep is None or keep[ext_col] or keep[name]:
+                                current_ext[k] = v
+                        elif keep is None or keep[name]:
+                            current_row[name] = v
+
+                elif (
+                    event == "end"
+                    and cfg.match(elem, cfg.row_tag)
+                    and current_table
+                    and current_row is not None
+                ):
+                    if current_ext:
+                        current_row[ext_col] = pack_extensions(current_ext)
+                    # Widen the table's column set as rows arrive.
+                    cols[current_table].update(current_row)
+                    buffered.append(current_row)
+                    current_row = None
+
+                elif event == "end" and cfg.match(elem, cfg.table_tag):
+                    if current_table:
+                        yield from _flush(current_table)
+                    current_table = None
+
+                # Memory cleanup on 'end' to keep streaming footprint low.
+                if event == "end":
+                    parent = elem.getparent() if hasattr(elem, "getparent") else None
+                    elem.clear()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
+
+        if not schema:
+            raise ValueError(
+                "No tables/columns discovered. Check SchemaConfig or XML structure."
+            )
+        log.info(
+            "stream summary rows_per_table=%s missing_fills=%s",
+            {t: rows_per_table[t] for t in sorted(rows_per_table)},
+            {t: missing_fills_per_table[t] for t in sorted(missing_fills_per_table)},
+        )
+
+    return schema, _row_stream()
+
+
+def normalized_rows_fast(
+    xml_path: str | Path | IO[bytes],
+    defaults: dict[str, dict[str, Any]] | None = None,
+    include_extensions: bool = True,
+    config: SchemaConfig | None = None,
+    keep_columns: ColumnManifest | None = None,
+) -> tuple[dict[str, list[str]], Iterable[tuple[str, dict[str, Any]]]]:
+    """
+    Fast one-pass stream normalizer; same output as `normalized_rows_one_pass`.
+
+    Notes
+    -----
+    - lxml filters events to `<Table>`/`<Row>` (`tag=` with `{*}` wildcards),
+      so `<Column>`/`<Extension>` never surface as events; a row's children are
+      read in one loop when `</Row>` arrives.
+    - Each element's role is one dict lookup on its qualified tag; the map is
+      filled lazily (`local_name` runs once per distinct qname, not per event).
+    - Cleanup is per row: clear it and detach it from the table element, instead
+      of a sibling-deletion loop on every end event.
+    - With `keep_columns` (see `column_manifest`), unlisted columns are
+      skipped while a row's children are read.
+    """
+    cfg = config or SchemaConfig()
+    packed, ext_col = cfg.packs_extensions, cfg.extension_column
+    schema: dict[str, list[str]] = {}
+    by_local = {cfg.table_tag: "table", cfg.row_tag: "row", cfg.column_tag: "column"}
+    if include_extensions and cfg.extension_tag:
+        by_local[cfg.extension_tag] = "extension"
+    roles: dict[str, str | None] = {}
+
+    def _role(qname: Any) -> str | None:
+        # Comments/PIs have non-string tags; they have no role.
+        if not isinstance(qname, str):
+            return None
+        role = by_local.get(qname.rsplit("}", 1)[-1])
+        roles[qname] = role
+        return role
+
+    def _row_stream() -> Iterable[tuple[str, dict[str, Any]]]:
+        cols: dict[str, set[str]] = defaultdict(set)
+        buffered: list[dict[str, Any]] = []
+        current_table: str | None = None
+        keep: Mapping[str, bool] | None = None
+        rows_per_table: dict[str, int] = defaultdict(int)
+        missing_fills_per_table: dict[str, int] = defaultdict(int)
+        name_attr, value_attr = cfg.column_name_attr, cfg.column_value_attr
+        ext_prefix = cfg.extension_prefix
+        wanted = tuple(f"{{*}}{t}" for t in (cfg.table_tag, cfg.row_tag))
+
+        def _flush(table: str) -> Iterable[tuple[str, dict[str, Any]]]:
+            names = sorted(cols[table])
+            schema[table] = names
+            table_defaults = (defaults or {}).get(table, {})
+            missing = 0
+            for row in buffered:
+                if len(row) == len(names):
+                    yield (table, {col: row[col] for col in names})
+                    continue
+                filled = {}
+                for col in names:
+                    if col in row:
+                        filled[col] = row[col]
+                    else:
+                        filled[col] = table_defaults.get(col, None)
+                        missing += 1
+                yield (table, filled)
+            if missing:
+                missing_fills_per_table[table] += missing
+            rows_per_table[table] += len(buffered)
+            buffered.clear()
+
+        with (
+            log_timer("stream-rows-fast", logger=log, xml=str(xml_path)),
+            xml_source(xml_path) as src,
+        ):
+            for event, elem in iterparse(src, events=("start", "end"), tag=wanted):
+                tag = elem.tag
+                role = roles[tag] if tag in roles else _role(tag)
+
+                if role == "row":
+                    if event == "start" or not current_table:
+                        continue
+                    row: dict[str, Any] = {}
+                    ext: dict[str, str] | None = {} if packed else None
+                    for child in elem:
+                        ctag = child.tag
+                        crole = roles[ctag] if ctag in roles else _role(ctag)
+                        if crole == "column":
+                            col = child.get(name_attr)
+                            if not col:
+                                log.warning(
+                                    "row column missing '%s' attribute table='%s'",
+                                    name_attr,
+                                    current_table,
+                                )
+                                continue
+                            if keep is not None and not keep[col]:
+                                continue
+                            val = child.get(value_attr)
+                            if val is None:
+                                txt = (child.text or "").strip()
+                                val = txt if txt != "" else None
+                            row[col] = val
+                        elif crole == "extension":
+                            for k, v in child.items():
+                                name = f"{ext_prefix}{k}"
+                                if ext is None:
+                                    if keep is None or keep[name]:
+                                        row[name] = v
+                                elif keep is None or keep[ext_col] or keep[name]:
+                                    ext[k] = v
+                    if ext:
+                        row[ext_col] = pack_extensions(ext)
+                    cols[current_table].update(row)
+                    buffered.append(row)
+                    # Drop the finished row; its columns go with it.
+                    elem.clear()
+                    parent = elem.getparent()
+                    if parent is not None:
+                        parent.remove(elem)
+
+                elif role == "table":
+                    if event == "start":
+                        tname = elem.get(cfg.table_name_attr)
+                        current_table = tname or None
+                        keep = column_filter(keep_columns, tname or "")
+                        if not tname:
+                            log.warning(
+                                "table without '%s' attribute encountered",
+                                cfg.table_name_attr,
+                            )
+                    else:
+                        if current_table:
+                            yield from _flush(current_table)
+                        current_table = None
+                        elem.clear()
+
+        if not schema:
+            raise ValueError(
+                "No tables/columns discovered. Check SchemaConfig or XML structure."
+            )
+        log.info(
+            "stream summary rows_per_table=%s missing_fills=%s",
+            {t: rows_per_table[t] for t in sorted(rows_per_table)},
+            {t: missing_fills_per_table[t] for t in sorted(missing_fills_per_table)},
+        )
+
+    return schema, _row_stream()
+
+
+# Engine registry used by the loader; keys are wire-level (settings/CLI values).
+RowEngine = Callable[
+    ..., tuple[dict[str, list[str]], Iterable[tuple[str, dict[str, Any]]]]
+]
+ENGINES: dict[str, RowEngine] = {
+    "two_pass": normalized_rows,
+    "one_pass": normalized_rows_one_pass,
+    "fast": normalized_rows_fast,
+}
+
+
+def get_engine(name: str) -> RowEngine:
+    """Return the row engine registered under `name`; raise `ValueError` if unknown."""
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown ingest engine '{name}' (expected one of {sorted(ENGINES)})"
+        ) from None
@@ -0,0 +1,213 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/parallel_parse.py
+# Purpose: Parse <Table> byte ranges in a process pool; each worker writes Parquet.
+# ------------------------------------------------------------
+
+"""Multi-process XML ingest over a `<Table>` byte-range index.
+
+The prescan in `table_index` splits the export into per-table byte ranges.
+Ranges are balanced across worker processes; each worker streams its ranges
+(re-wrapped in the original prolog/root tag) through the fast row engine
+and the columnar Parquet writer, so parsing uses every core instead of one.
+
+Responsibilities
+----------------
+- Build the table index and partition it across `workers` processes.
+- Stream only a worker's byte ranges to lxml (no full-file read per worker).
+- Write one Parquet file per table from the worker (typed via `column_types`).
+- Return per-table `(parquet_path, rows)` and the discovered schema.
+
+Notes
+-----
+- Requires `pyarrow` (workers use the columnar writer).
+- A single partition is parsed in-process (no pool start-up cost).
+- Each worker uses an in-memory DuckDB with one thread to avoid oversubscription.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.resources import resolve_profile
+from app.ingest.column_manifest import ColumnManifest
+from app.ingest.column_types import ColumnTypes
+from app.ingest.duckdb_connection import open_duckdb
+from app.ingest.normalize_rows import normalized_rows_fast
+from app.ingest.parquet_layout import ParquetLayouts
+from app.ingest.schema_config import SchemaConfig
+from app.ingest.table_index import TableIndex, TableRange, scan_table_ranges
+from app.utils.timing import log_timer
+
+log = logging.getLogger("ingest.parallel")
+
+
+class _RangeReader(io.RawIOBase):
+    """Read-only stream: prolog + selected byte ranges of a file + epilog.
+
+    Reads through `f`, an open binary file the caller closes.
+    """
+
+    def __init__(
+        self, f: BinaryIO, prolog: bytes, ranges: list[TableRange], epilog: bytes
+    ):
+        self._f = f
+        # Segments are either literal bytes or (start, end) offsets into the file.
+        self._segments: list[bytes | tuple[int, int]] = [
+            prolog,
+            *((r.start, r.end) for r in ranges),
+            epilog,
+        ]
+        self._buf = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buf and self._segments:
+            seg = self._segments[0]
+            if isinstance(seg, bytes):
+                self._buf = seg
+                self._segments.pop(0)
+                continue
+            start, end = seg
+            self._f.seek(start)
+            chunk = self._f.read(min(len(b), end - start, 1 << 20))
+            if not chunk:
+                raise ValueError(f"unexpected EOF in {self._f.name} at byte {start}")
+            self._buf = chunk
+            if start + len(chunk) >= end:
+                self._segments.pop(0)
+            else:
+                self._segments[0] = (start + len(chunk), end)
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+
+def _parse_partition(
+    path: Path,
+    prolog: bytes,
+    epilog: bytes,
+    ranges: list[TableRange],
+    out_dir: Path,
+    batch_rows: int | None,
+    column_types: ColumnTypes | None,
+    mem: str | None,
+    store: bool = False,
+    keep_columns: ColumnManifest | None = None,
+    config: SchemaConfig | None = None,
+    layouts: ParquetLayouts | None = None,
+) -> tuple[dict[str, tuple[Path, int]], dict[str, list[str]]]:
+    """Worker body: parse `ranges` and write their tables to `out_dir`."""
+    # Deferred import: pyarrow is only required when this engine is selected.
+    from app.ingest.columnar_writer import write_parquet_tables
+
+    n_tables = len({r.name for r in ranges})
+    with (
+        log_timer("parse-partition", logger=log, pid=os.getpid(), tables=n_tables),
+        open(path, "rb") as f,
+    ):
+        con = open_duckdb(Path(":memory:"), threads=1, mem=mem)
+        stream = io.BufferedReader(_RangeReader(f, prolog, ranges, epilog))
+        try:
+            schema, row_iter = normalized_rows_fast(
+                stream, config=config, keep_columns=keep_columns
+            )
+            written = write_parquet_tables(
+                row_iter,
+                out_dir,
+                con,
+                batch_rows=batch_rows,
+                column_types=column_types,
+                store=store,
+                layouts=layouts,
+            )
+        finally:
+            stream.close()
+            con.close()
+    return written, schema
+
+
+def parse_parallel(
+    xml_path: Path,
+    out_dir: Path,
+    workers: int | None = None,
+    batch_rows: int | None = None,
+    column_types: ColumnTypes | None = None,
+    mem: str | None = None,
+    index: TableIndex | None = None,
+    store: bool = False,
+    keep_columns: ColumnManifest | None = None,
+    config: SchemaConfig | None = None,
+    layouts: ParquetLayouts | None = None,
+) -> tuple[dict[str, tuple[Path, int]], dict[str, list[str]]]:
+    """Parse `xml_path` across a process pool and write Parquet per table.
+
+    Returns `(written, schema)` where `written` is `{table: (path, rows)}`
+    (same shape as `write_parquet_tables`) and `schema` is `{table: columns}`.
+    With `store`, workers write through the shared `parquet_store`.
+    `keep_columns` (see `column_manifest`) drops unlisted columns while parsing;
+    `config` is the workers' `SchemaConfig` (e.g. the extension mode);
+    `layouts` are the adapter's Parquet table layouts.
+    `mem` is each worker's DuckDB memory limit; defaults to the resource
+    profile split across the partitions.
+    Raises `ValueError` when the prescan finds no `<Table>` elements.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with log_timer("prescan-table-ranges", logger=log, xml=str(xml_path)):
+        index = index or scan_table_ranges(xml_path, config)
+    if not index.ranges:
+        raise ValueError(f"no <Table> elements found in {xml_path}")
+
+    workers = workers or os.cpu_count() or 1
+    parts = index.partition(workers)
+    mem = mem or resolve_profile(share=len(parts)).memory_limit
+    log.info(
+        "parallel parse tables=%d ranges=%d partitions=%d",
+        len(index.groups()),
+        len(index.ranges),
+        len(parts),
+    )
+    # Plain dicts pickle cheaply into worker processes.
+    types = {t: dict(c) for t, c in column_types.items()} if column_types else None
+    args = [
+        (
+            index.path,
+            index.prolog,
+            index.epilog,
+            p,
+            out_dir,
+            batch_rows,
+            types,
+            mem,
+            store,
+            keep_columns,
+            config,
+            dict(layouts) if layouts else None,
+        )
+        for p in parts
+    ]
+
+    if len(parts) == 1:
+        results = [_parse_partition(*args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(parts)) as pool:
+            results = list(pool.map(_parse_partition, *zip(*args, strict=True)))
+
+    written: dict[str, tuple[Path, int]] = {}
+    schema: dict[str, list[str]] = {}
+    for part_written, part_schema in results:
+        written.update(part_written)
+        schema.update(part_schema)
+    # Keep file order so views/tables are published deterministically.
+    order = {name: i for i, name in enumerate(index.groups())}
+    written = dict(
+        sorted(written.items(), key=lambda kv: order.get(kv[0], len(order)))
+    )
+    return written, schema
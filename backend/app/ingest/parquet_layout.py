@@ -0,0 +1,115 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/parquet_layout.py
+# Purpose: Per-table Parquet physical layout (sort key, row groups, dictionaries).
+# ------------------------------------------------------------
+
+"""Physical layout of the Parquet files written at ingest.
+
+Written in file order with DuckDB's default row groups (~122k rows), a model
+table is usually a single row group whose min/max statistics span every ID,
+so a lookup by `Object_ID` or `ea_guid` reads the whole file. Adapters
+publish a layout per table: rows sorted by the lookup key and cut into
+smaller row groups give each group a narrow zonemap that DuckDB can skip.
+
+Responsibilities
+----------------
+- Define `ParquetLayout` (sort key, row-group size, dictionary and bloom
+  filter settings) and the `{table: layout}` mapping adapters publish.
+- Build layouts from the plain specs adapters publish (`layouts_from_spec`).
+- Resolve a table's layout (table entry, else the "*" entry, else defaults).
+- Render the `ORDER BY` clause and the `COPY ... (FORMAT PARQUET, ...)`
+  options used by every ingest Parquet writer.
+
+Notes
+-----
+- Sort columns missing from a table are ignored; with none left, rows keep
+  file order.
+- DuckDB always writes min/max statistics per row group; bloom filters are
+  written for dictionary-encoded columns only (low-cardinality strings).
+- The default layout renders DuckDB's own defaults, so files written without
+  an adapter (and their parquet store keys) are unchanged.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from app.utils.sql import quote_ident
+
+ANY_TABLE = "*"
+
+
+@dataclass(frozen=True)
+class ParquetLayout:
+    """How one table's rows are laid out in its Parquet file.
+
+    Notes
+    -----
+    - `sort_by`: columns rows are ordered by (ascending, NULLs last).
+    - `row_group_size`: rows per row group (DuckDB default when None).
+    - `dictionary_size_limit`: largest dictionary (bytes) before a column
+      falls back to plain encoding (DuckDB default when None).
+    - `bloom_filter`: write bloom filters for dictionary-encoded columns;
+      `bloom_filter_fpp` is their false-positive ratio.
+    """
+
+    sort_by: tuple[str, ...] = ()
+    row_group_size: int | None = None
+    dictionary_size_limit: int | None = None
+    bloom_filter: bool = True
+    bloom_filter_fpp: float | None = None
+
+    def order_clause(self, columns: Iterable[str]) -> str:
+        """`ORDER BY` over the sort columns present in `columns` ("" if none)."""
+        present = set(columns)
+        keys = [quote_ident(c) for c in self.sort_by if c in present]
+        return f" ORDER BY {', '.join(keys)}" if keys else ""
+
+    def copy_options(self) -> str:
+        """Option list for `COPY ... TO '<file>.parquet' (<options>)`."""
+        opts = ["FORMAT PARQUET", "COMPRESSION 'zstd'"]
+        if self.row_group_size is not None:
+            opts.append(f"ROW_GROUP_SIZE {int(self.row_group_size)}")
+        if self.dictionary_size_limit is not None:
+            opts.append(f"DICTIONARY_SIZE_LIMIT {int(self.dictionary_size_limit)}")
+        if not self.bloom_filter:
+            opts.append("WRITE_BLOOM_FILTER false")
+        elif self.bloom_filter_fpp is not None:
+            opts.append(
+                f"BLOOM_FILTER_FALSE_POSITIVE_RATIO {float(self.bloom_filter_fpp)}"
+            )
+        return ", ".join(opts)
+
+    def signature(self, columns: Iterable[str]) -> str:
+        """What this layout changes in a file with `columns` ("" = defaults).
+
+        Part of the parquet store key, next to the projection.
+        """
+        order = self.order_clause(columns)
+        opts = self.copy_options()
+        if not order and opts == DEFAULT_LAYOUT.copy_options():
+            return ""
+        return f"{order.strip()};{opts}"
+
+
+DEFAULT_LAYOUT = ParquetLayout()
+
+# {table: layout}; the "*" entry applies to tables without their own.
+ParquetLayouts = Mapping[str, ParquetLayout]
+
+
+def layouts_from_spec(spec: Mapping[str, Mapping[str, Any]] | None) -> ParquetLayouts:
+    """`{table: ParquetLayout}` from an adapter's `{table: {field: value}}` spec."""
+    return {
+        table: ParquetLayout(**{**fields, "sort_by": tuple(fields.get("sort_by", ()))})
+        for table, fields in (spec or {}).items()
+    }
+
+
+def layout_for_table(layouts: ParquetLayouts | None, table: str) -> ParquetLayout:
+    """The table's own layout, else the "*" layout, else `DEFAULT_LAYOUT`."""
+    if not layouts:
+        return DEFAULT_LAYOUT
+    return layouts.get(table) or layouts.get(ANY_TABLE) or DEFAULT_LAYOUT
@@ -0,0 +1,196 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/parquet_store.py
+# Purpose: Content-addressed Parquet store shared by every model under DATA_DIR.
+# ------------------------------------------------------------
+
+"""Shared, content-addressed store for per-table Parquet files.
+
+Revisions of the same model usually repeat most tables byte for byte. Each
+table's normalized row stream is hashed while it is written; the digest plus
+the select list (typed casts) and a format version form the store key. A table
+whose key is already stored is not converted again, and every model links to
+the one stored file instead of keeping its own copy.
+
+Responsibilities
+----------------
+- Hash a table's normalized rows incrementally (`RowDigest`).
+- Derive the store key from the row digest, projection and `STORE_FORMAT`.
+- Write new entries atomically (temp file + rename) so concurrent ingests of
+  the same table are safe.
+- Hard-link stored files into `<model>/parquet/`, so views and native-table
+  loads keep their usual paths while sharing disk with other models.
+- Prune entries no model links to any more
+  (`python -m app.ingest.parquet_store prune`).
+
+Notes
+-----
+- Layout: `PARQUET_STORE_DIR/<key[:2]>/<key>.parquet`.
+- Hard links mean deleting a model directory never breaks other models; an
+  entry is garbage once its link count drops back to 1 (see `prune`).
+- When hard links are unavailable (e.g. cross-device), the file is copied.
+- Bump `STORE_FORMAT` whenever the Parquet write settings change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from app.core import paths
+
+log = logging.getLogger(__name__)
+
+# Part of every key; changing the writer's COPY options must bump this.
+STORE_FORMAT = "1"
+
+
+class RowDigest:
+    """Incremental SHA-256 over a table's normalized `(column, value)` rows."""
+
+    def __init__(self) -> None:
+        self._h = hashlib.sha256()
+
+    def update(self, row: Mapping[str, Any]) -> None:
+        # Control characters cannot appear in XML 1.0 text, so the encoding
+        # is unambiguous; NUL marks None (distinct from the empty string).
+        self._h.update(
+            "\x1f".join(
+                f"{k}\x1e{chr(0) if v is None else v}" for k, v in row.items()
+            ).encode("utf-8", "surrogatepass")
+            + b"\x1d"
+        )
+
+    def hexdigest(self) -> str:
+        return self._h.hexdigest()
+
+
+def store_key(row_digest: str, projection: str, layout: str = "") -> str:
+    """Key for a table: rows, the select list applied to them, and the format.
+
+    `layout` is the `ParquetLayout.signature` of the file; the default layout
+    ("") keeps the keys files written before layouts existed.
+    """
+    h = hashlib.sha256()
+    parts = (STORE_FORMAT, projection, row_digest)
+    for part in (*parts, layout) if layout else parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def store_path(key: str) -> Path:
+    """Location of a stored Parquet file (resolved at call time for tests)."""
+    return paths.PARQUET_STORE_DIR / key[:2] / f"{key}.parquet"
+
+
+def _parquet_rows(path: Path) -> int:
+    """Row count from the Parquet footer (no data pages are read)."""
+    con = duckdb.connect()
+    try:
+        sql = path.as_posix().replace("'", "''")
+        res = con.execute(
+            f"SELECT COALESCE(SUM(num_rows), 0) FROM parquet_file_metadata('{sql}')"
+        ).fetchone()
+    finally:
+        con.close()
+    return int(res[0]) if res else 0
+
+
+def _link(src: Path, dst: Path) -> None:
+    """Point `dst` at `src` (hard link, falling back to a copy)."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}")
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+    # rename() is a no-op when dst already links the same file; drop the spare.
+    tmp.unlink(missing_ok=True)
+
+
+def link_cached(key: str, dst: Path) -> int | None:
+    """Link the stored table for `key` to `dst` and return its rows; None if absent."""
+    entry = store_path(key)
+    try:
+        _link(entry, dst)
+    except FileNotFoundError:
+        # Absent, or pruned since it was last linked: the caller writes it anew.
+        return None
+    return _parquet_rows(dst)
+
+
+def materialize(
+    key: str, dst: Path, write: Callable[[Path], int]
+) -> tuple[int, bool]:
+    """Make `dst` hold the table stored under `key`, writing it only if new.
+
+    `write(path)` must write the Parquet file to `path` and return its row
+    count. Returns `(rows, hit)`, where `hit` is True when the store already
+    had the entry and `write` was skipped.
+    """
+    rows = link_cached(key, dst)
+    if rows is not None:
+        return rows, True
+
+    entry = store_path(key)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = entry.with_name(f".{entry.stem}.{uuid.uuid4().hex}.tmp")
+    try:
+        rows = write(tmp)
+        # Link the model's file first: the entry is never published with a
+        # link count of 1, where a concurrent `prune` would take it.
+        _link(tmp, dst)
+        # Another ingest may have stored the same key meanwhile; either copy is fine.
+        os.replace(tmp, entry)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return rows, False
+
+
+def prune() -> int:
+    """Delete stored files that no model links to; return how many were removed.
+
+    Notes
+    -----
+    - Only meaningful with hard links: a copied entry (cross-device fallback)
+      always looks unreferenced and is removed; models keep their own copies.
+    - Safe next to running ingests: new entries are published already linked,
+      and `link_cached` treats an entry pruned under it as a miss.
+    """
+    root = paths.PARQUET_STORE_DIR
+    if not root.exists():
+        return 0
+    removed = 0
+    for entry in root.glob("*/*.parquet"):
+        try:
+            if entry.stat().st_nlink <= 1:
+                entry.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    log.info("parquet store pruned removed=%d root='%s'", removed, str(root))
+    return removed
+
+
+def main() -> None:
+    """CLI entrypoint: store maintenance (`prune`)."""
+    ap = argparse.ArgumentParser("parquet-store")
+    ap.add_argument(
+        "command", choices=("prune",), help="prune: delete entries no model links to"
+    )
+    ap.parse_args()
+    print(f"removed {prune()} unreferenced entries from {paths.PARQUET_STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
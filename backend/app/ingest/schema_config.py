@@ -11,15 +11,32 @@ tables, rows, and columns for ingestion workflows.
 Responsibilities
 ----------------
 - Define tag and attribute names for tables, rows, and columns.
-- Support optional extension elements that add dynamic columns.
+- Support optional extension elements that add dynamic columns, or are
+  packed into one `extensions` column (MAP or JSON, see `EXTENSION_MODES`).
 - Offer namespace-agnostic tag matching using local-name extraction.
 - Serve as a configuration object for XML schema discovery logic.
 """
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 
+# How `<Extension>` attributes are stored (wire-level settings/CLI values):
+# - "columns": one `Extension_<attr>` column per attribute (wide, sparse).
+# - "map":     all of a row's attributes in one MAP(VARCHAR, VARCHAR) column.
+# - "json":    the same, as a JSON object column.
+EXTENSION_MODES = ("columns", "map", "json")
+
+
+def pack_extensions(attrs: dict[str, str]) -> str:
+    """Serialize a row's extension attributes (document order) as a JSON object.
+
+    Rows carry the packed text; the Parquet writers cast it to MAP or JSON
+    (see `column_types`).
+    """
+    return json.dumps(attrs, ensure_ascii=False, separators=(",", ":"))
+
 
 def local_name(elem) -> str:
     """Return the namespace-agnostic local name of an XML tag."""
@@ -39,6 +56,22 @@ class SchemaConfig:
     # Optional "extensions" element whose attributes become columns on the table/row
     extension_tag: str | None = "Extension"
     extension_prefix: str = "Extension_"
+    # "columns" | "map" | "json" (see EXTENSION_MODES); packed modes write
+    # attributes (unprefixed) into `extension_column`.
+    extension_mode: str = "columns"
+    extension_column: str = "extensions"
+
+    def __post_init__(self) -> None:
+        if self.extension_mode not in EXTENSION_MODES:
+            raise ValueError(
+                f"unknown extension mode '{self.extension_mode}' "
+                f"(expected one of {EXTENSION_MODES})"
+            )
+
+    @property
+    def packs_extensions(self) -> bool:
+        """True when extension attributes go into one MAP/JSON column."""
+        return self.extension_mode != "columns"
 
     def match(self, elem, tag: str | None) -> bool:
         """Return True if the element matches the given local-name tag."""
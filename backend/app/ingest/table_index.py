@@ -0,0 +1,146 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/table_index.py
+# Purpose: Prescan an XML export for the byte ranges of its <Table> elements.
+# ------------------------------------------------------------
+
+"""Byte-range index of `<Table>` blocks in a flat Sparx-style XML export.
+
+Sparx exports are one root element holding a flat sequence of
+`<Table name="t_*">` blocks. A regex pass over a memory-mapped file finds each
+block's byte range without building any XML objects, so callers can hand
+independent ranges to separate parser processes.
+
+Responsibilities
+----------------
+- Record `(name, start, end)` byte offsets for every `<Table>` element.
+- Capture the document prolog (XML declaration + root start tag) and the root
+  end tag so a subset of ranges can be re-wrapped into a well-formed document.
+- Group ranges by table name and balance groups across N workers by size.
+
+Notes
+-----
+- Matches the unprefixed tag names from `SchemaConfig`; namespaced or nested
+  `<Table>` layouts are not indexed (callers should fall back to a full parse).
+  The root element itself may be prefixed (`<xmi:XMI>`).
+- Assumes `<` never appears raw inside attributes/text (XML escaping); CDATA or
+  comments containing `<Table` would confuse the scan.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.ingest.schema_config import SchemaConfig
+
+_XML_DECL = re.compile(rb"\A\s*<\?xml[^>]*\?>")
+# Root names may carry a namespace prefix (e.g. `xmi:XMI`).
+_ROOT_START = re.compile(rb"<([A-Za-z_][\w.\-:]*)[^>]*>")
+_NAME_ATTR = rb"""\s%s\s*=\s*(?:"([^"]*)"|'([^']*)')"""
+
+
+@dataclass(frozen=True)
+class TableRange:
+    """One `<Table>` element: its name and `[start, end)` byte offsets."""
+
+    name: str
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class TableIndex:
+    """All `<Table>` ranges plus the bytes needed to re-wrap a subset of them."""
+
+    path: Path
+    prolog: bytes
+    epilog: bytes
+    ranges: list[TableRange] = field(default_factory=list)
+
+    def groups(self) -> dict[str, list[TableRange]]:
+        """Ranges grouped by table name (file order preserved within a group)."""
+        out: dict[str, list[TableRange]] = {}
+        for r in self.ranges:
+            out.setdefault(r.name, []).append(r)
+        return out
+
+    def partition(self, n: int) -> list[list[TableRange]]:
+        """Split table groups into at most `n` bins of similar byte size.
+
+        Notes
+        -----
+        - A table's ranges always land in the same bin (one Parquet per table).
+        - Greedy largest-first assignment; ranges within a bin are in file order.
+        """
+        groups = sorted(self.groups().values(), key=lambda g: -sum(r.size for r in g))
+        n_bins = max(1, min(n, len(groups)))
+        bins: list[list[TableRange]] = [[] for _ in range(n_bins)]
+        loads = [0] * len(bins)
+        for g in groups:
+            i = loads.index(min(loads))
+            bins[i].extend(g)
+            loads[i] += sum(r.size for r in g)
+        return [sorted(b, key=lambda r: r.start) for b in bins if b]
+
+
+def scan_table_ranges(
+    xml_path: str | Path, config: SchemaConfig | None = None
+) -> TableIndex:
+    """Index the byte ranges of every `<Table>` element in `xml_path`.
+
+    Raises `ValueError` if the file has no root element or an unterminated table.
+    """
+    cfg = config or SchemaConfig()
+    path = Path(xml_path)
+    tag = re.escape(cfg.table_tag.encode())
+    open_or_close = re.compile(rb"<(/?)" + tag + rb"(?=[\s/>])")
+    name_attr = re.compile(_NAME_ATTR % re.escape(cfg.table_name_attr.encode()))
+
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        decl = _XML_DECL.match(mm)
+        root = _ROOT_START.search(mm, decl.end() if decl else 0)
+        if root is None:
+            raise ValueError(f"no root element found in {path}")
+        prolog = (decl.group(0) + b"\n" if decl else b"") + root.group(0)
+        epilog = b"</" + root.group(1) + b">"
+
+        ranges: list[TableRange] = []
+        pos = root.end()
+        while True:
+            m = open_or_close.search(mm, pos)
+            if m is None:
+                break
+            if m.group(1):  # stray close tag; skip it
+                pos = m.end()
+                continue
+            tag_end = mm.find(b">", m.end())
+            if tag_end < 0:
+                raise ValueError(
+                    f"unterminated <{cfg.table_tag}> tag at byte {m.start()}"
+                )
+            start_tag = mm[m.start() : tag_end + 1]
+            nm = name_attr.search(start_tag)
+            raw = (nm.group(1) or nm.group(2) or b"") if nm else b""
+            name = raw.decode("latin-1")  # table names are ASCII in practice
+            if start_tag.endswith(b"/>"):
+                end = tag_end + 1
+            else:
+                close = open_or_close.search(mm, tag_end + 1)
+                if close is None or not close.group(1):
+                    raise ValueError(
+                        f"unterminated or nested <{cfg.table_tag}> at byte {m.start()}"
+                    )
+                end = mm.find(b">", close.end()) + 1
+            ranges.append(TableRange(name=name, start=m.start(), end=end))
+            pos = end
+
+    return TableIndex(path=path, prolog=prolog, epilog=epilog, ranges=ranges)
@@ -12,6 +12,7 @@ Responsibilities
 ----------------
 - Define a clear data contract for ingestion results.
 - Represent file paths and metadata for DuckDB, JSONL, and Parquet outputs.
+- Describe the extra fields returned by an incremental (delta) ingest.
 - Support static typing and IDE autocompletion for ingestion workflows.
 """
 
@@ -26,3 +27,10 @@ class IngestResult(TypedDict):
     jsonl_dir: str
     parquet_dir: str
     tables: dict[str, int]
+
+
+class DeltaResult(IngestResult):
+    """Ingestion output of a revision applied as a delta to a base model."""
+
+    base_model_id: str
+    changed_tables: list[str]
@@ -0,0 +1,170 @@
+# ------------------------------------------------------------
+# Module: backend/app/ingest/xml_source.py
+# Purpose: Open plain, gzip, zstd or single-entry zip XML exports as streams.
+# ------------------------------------------------------------
+
+"""Transparent decompression for model XML exports.
+
+Exports compress 10-20x, so uploads and `data/models/<id>/` may hold them as
+`.xml.gz`, `.xml.zst` or a single-entry `.zip`. Everything that parses or
+hashes a model goes through this module; the inflated XML is never written.
+
+Responsibilities
+----------------
+- Detect the container from magic bytes (names and suffixes are not trusted).
+- Yield what `lxml.iterparse` accepts: the filename for plain XML (fastest),
+  otherwise a decompressing binary stream (`xml_source`).
+- Hash the decompressed content, so a model id is the same whether the
+  export arrived raw or compressed (`sha256_xml`).
+- Decompress a streamed body incrementally (`Inflater`, gzip/zstd).
+
+Notes
+-----
+- zstd needs the optional `zstandard` package; it is imported on first use.
+- Zip archives must hold exactly one file; directories are ignored.
+- Zip cannot be inflated from a non-seekable stream; stage it first.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import zipfile
+import zlib
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+# Codec names, as stored per model (see `paths.MODEL_XML_NAMES`).
+XML, GZIP, ZSTD, ZIP = "xml", "gzip", "zstd", "zip"
+CODECS = (XML, GZIP, ZSTD, ZIP)
+
+_MAGIC = (
+    (b"\x1f\x8b", GZIP),
+    (b"\x28\xb5\x2f\xfd", ZSTD),
+    (b"PK\x03\x04", ZIP),
+)
+# Bytes needed to tell every codec apart.
+SNIFF_BYTES = 4
+
+
+def sniff(head: bytes) -> str:
+    """Return the codec for a file starting with `head` (plain XML otherwise)."""
+    for magic, codec in _MAGIC:
+        if head.startswith(magic):
+            return codec
+    return XML
+
+
+def codec_of(path: str | Path) -> str:
+    """Codec of the file at `path`, from its first bytes."""
+    with open(path, "rb") as f:
+        return sniff(f.read(SNIFF_BYTES))
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise RuntimeError(
+            "zstd-compressed exports need the 'zstandard' package"
+        ) from e
+    return zstandard
+
+
+def _zip_member(zf: zipfile.ZipFile) -> zipfile.ZipInfo:
+    files = [i for i in zf.infolist() if not i.is_dir()]
+    if len(files) != 1:
+        raise ValueError(
+            f"zip export must contain exactly one file (found {len(files)})"
+        )
+    return files[0]
+
+
+@contextmanager
+def open_xml(src: str | Path | IO[bytes]) -> Iterator[IO[bytes]]:
+    """Open a file (or seekable binary stream) as decompressed XML bytes."""
+    with ExitStack() as stack:
+        raw = src if hasattr(src, "read") else stack.enter_context(open(src, "rb"))
+        codec = sniff(raw.read(SNIFF_BYTES))
+        raw.seek(0)
+        if codec == GZIP:
+            yield stack.enter_context(gzip.GzipFile(fileobj=raw, mode="rb"))
+        elif codec == ZSTD:
+            reader = _zstandard().ZstdDecompressor().stream_reader(raw)
+            yield stack.enter_context(reader)
+        elif codec == ZIP:
+            zf = stack.enter_context(zipfile.ZipFile(raw))
+            yield stack.enter_context(zf.open(_zip_member(zf)))
+        else:
+            yield raw
+
+
+@contextmanager
+def xml_source(xml: str | Path | IO[bytes]) -> Iterator[str | IO[bytes]]:
+    """Yield an `iterparse` source: streams pass through, plain files by name."""
+    if hasattr(xml, "read"):
+        yield xml  # type: ignore[misc]
+    elif codec_of(xml) == XML:
+        yield str(xml)
+    else:
+        with open_xml(xml) as f:
+            yield f
+
+
+def sha256_xml(src: str | Path | IO[bytes], chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of the decompressed XML content of a file or stream."""
+    h = hashlib.sha256()
+    with open_xml(src) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Inflater:
+    """Incremental decompressor for a body that arrives chunk by chunk.
+
+    Notes
+    -----
+    - Supports plain XML (pass-through), gzip (multi-member) and zstd.
+    - Zip is rejected: its directory sits at the end of the archive.
+    """
+
+    def __init__(self, codec: str):
+        if codec == ZIP:
+            raise ValueError("zip archives cannot be inflated incrementally")
+        self.codec = codec
+        self._d: Any = None
+        if codec == GZIP:
+            self._d = zlib.decompressobj(wbits=31)
+        elif codec == ZSTD:
+            self._d = _zstandard().ZstdDecompressor().decompressobj()
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Return the XML bytes decoded from `chunk` (may be empty).
+
+        Raises `ValueError` when the data is not valid for the codec.
+        """
+        if self._d is None:
+            return chunk
+        try:
+            out = self._d.decompress(chunk)
+            if self.codec == GZIP:
+                # Concatenated gzip members: restart on whatever follows a member.
+                while self._d.eof and self._d.unused_data:
+                    rest = self._d.unused_data
+                    self._d = zlib.decompressobj(wbits=31)
+                    out += self._d.decompress(rest)
+        except Exception as e:
+            raise ValueError(f"corrupt {self.codec} stream") from e
+        return out
+
+    def flush(self) -> bytes:
+        """Return any buffered output once the body has ended."""
+        if self.codec == GZIP:
+            out = self._d.flush()
+            if not self._d.eof:
+                raise ValueError("truncated gzip stream")
+            return out
+        return b""
@@ -14,12 +14,16 @@ Responsibilities
 - Define a stable, frozen data container (`AdapterOptions`) for adapter metadata.
 - Provide a class-based adapter interface that can self-identify via constants.
 - Ensure safe, read-only behavior for adapter option propagation.
+- Let adapters publish a typed column schema for ingest (`column_types`).
+- Let adapters publish row keys for incremental re-ingest (`primary_keys`).
+- Let adapters publish the Parquet physical layout per table (`layouts`).
 """
 
 from __future__ import annotations
 
 from collections.abc import Mapping
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass(frozen=True)
@@ -52,6 +56,13 @@ class InputAdapter:
 
     VENDOR: str
     VERSION: str
+    # {table: {column: logical_type}} (see app.ingest.column_types); "*" = all tables.
+    COLUMN_TYPES: Mapping[str, Mapping[str, str]] = {}
+    # {table: key columns} for tables without `ea_guid` (see app.ingest.incremental).
+    PRIMARY_KEYS: Mapping[str, tuple[str, ...]] = {}
+    # {table: {ParquetLayout field: value}} (see app.ingest.parquet_layout);
+    # "*" = other tables.
+    LAYOUTS: Mapping[str, Mapping[str, Any]] = {}
 
     @classmethod
     def matches(cls, vendor: str, version: str) -> bool:
@@ -75,3 +86,41 @@ class InputAdapter:
         - Starts with an empty `extra` mapping (vendor-specific extensions may populate later).
         """
         return AdapterOptions(vendor=cls.VENDOR, version=cls.VERSION, extra={})
+
+    @classmethod
+    def column_types(cls) -> Mapping[str, Mapping[str, str]]:
+        """Return the typed column schema applied when rows are written to Parquet.
+
+        Notes
+        -----
+        - Values are logical types from `app.ingest.column_types.LOGICAL_TYPES`,
+          or derived columns ("uuid(ea_guid)", see `CANONICAL_COLUMNS`).
+        - Columns not listed keep inferred (or string) types.
+        - Empty by default: adapters opt in by setting `COLUMN_TYPES`.
+        """
+        return cls.COLUMN_TYPES
+
+    @classmethod
+    def primary_keys(cls) -> Mapping[str, tuple[str, ...]]:
+        """Return the row key columns used to diff model revisions table by table.
+
+        Notes
+        -----
+        - `ea_guid` is preferred when a table has it; list tables that do not.
+        - Tables without a key are compared as whole rows.
+        """
+        return cls.PRIMARY_KEYS
+
+    @classmethod
+    def layouts(cls) -> Mapping[str, Mapping[str, Any]]:
+        """Return the Parquet layout (sort key, row groups) for each table.
+
+        Notes
+        -----
+        - Plain `ParquetLayout` field values (e.g. `{"sort_by": ("ea_guid",)}`);
+          ingest builds the layouts (`parquet_layout.layouts_from_spec`).
+        - Sort tables by the columns they are looked up by, so row-group
+          statistics let DuckDB skip most of a file.
+        - Empty by default: files keep file order and DuckDB's row groups.
+        """
+        return cls.LAYOUTS
@@ -12,13 +12,192 @@ Responsibilities
 ----------------
 - Define a unique (vendor, version) pair for Sparx EA v17.1.
 - Provide a class-based interface to construct `AdapterOptions`.
+- Publish the typed column schema for Sparx `t_*` tables (IDs, GUIDs, flags, dates).
+- Publish row keys for the tables that carry no `ea_guid`.
+- Publish Parquet layouts sorting each table by the IDs it is joined on.
 - Avoid any direct I/O or database operations (pure configuration layer).
 """
 
 from __future__ import annotations
 
+from typing import Any
+
+from app.ingest.column_types import ANY_TABLE, CANONICAL_COLUMNS
 from app.input_adapters.protocols import AdapterOptions, InputAdapter
 
+# Typed columns for the Sparx 17.1 repository tables (logical types, see
+# app.ingest.column_types). Numeric IDs become BIGINT so joins compare integers;
+# GUIDs are normalized (upper case, no braces); 0/1 flags become BOOLEAN.
+# Columns not listed (PDATA*, Extension_*, styles, free text) keep inferred types.
+# The canonical columns (GUID as UUID, lower-cased stereotype, trimmed name) are
+# added next to their sources for IR helpers and predicates.
+_SPARX_171_COLUMN_TYPES: dict[str, dict[str, str]] = {
+    "*": {
+        "ea_guid": "guid",
+        "CreatedDate": "timestamp",
+        "ModifiedDate": "timestamp",
+        **CANONICAL_COLUMNS[ANY_TABLE],
+    },
+    "t_package": {
+        "Package_ID": "int",
+        "Parent_ID": "int",
+        "IsControlled": "bool",
+        "Protected": "bool",
+        "UseDTD": "bool",
+        "LogXML": "bool",
+    },
+    "t_object": {
+        "Object_ID": "int",
+        "Package_ID": "int",
+        "ParentID": "int",
+        "Classifier": "int",
+        "Diagram_ID": "int",
+        "NType": "int",
+        "Classifier_guid": "guid",
+        "Abstract": "bool",
+        "IsActive": "bool",
+        "IsLeaf": "bool",
+        "IsRoot": "bool",
+        "IsSpec": "bool",
+        **CANONICAL_COLUMNS["t_object"],
+    },
+    "t_objectconstraint": {
+        "Object_ID": "int",
+        "Weight": "double",
+    },
+    "t_objectproperties": {
+        "PropertyID": "int",
+        "Object_ID": "int",
+    },
+    "t_attribute": {
+        "ID": "int",
+        "Object_ID": "int",
+        "Classifier": "int",
+        "Pos": "int",
+        "AllowDuplicates": "bool",
+        "Const": "bool",
+        "Derived": "bool",
+        "IsCollection": "bool",
+        "IsOrdered": "bool",
+        "IsStatic": "bool",
+    },
+    "t_attributetag": {
+        "PropertyID": "int",
+        "ElementID": "int",
+    },
+    "t_operation": {
+        "OperationID": "int",
+        "Object_ID": "int",
+        "Classifier": "int",
+        "IsLeaf": "bool",
+        "IsQuery": "bool",
+        "IsRoot": "bool",
+        "Pure": "bool",
+    },
+    "t_operationparams": {
+        "OperationID": "int",
+        "Classifier": "int",
+        "Pos": "int",
+        "Const": "bool",
+    },
+    "t_connector": {
+        "Connector_ID": "int",
+        "Start_Object_ID": "int",
+        "End_Object_ID": "int",
+        "DiagramID": "int",
+        "SeqNo": "int",
+        "SourceIsAggregate": "int",
+        "DestIsAggregate": "int",
+        "SourceIsNavigable": "bool",
+        "DestIsNavigable": "bool",
+        "SourceIsOrdered": "bool",
+        "DestIsOrdered": "bool",
+        "IsBold": "bool",
+        "IsLeaf": "bool",
+        "IsRoot": "bool",
+        "IsSignal": "bool",
+        "IsSpec": "bool",
+        "IsStimulus": "bool",
+        "VirtualInheritance": "bool",
+    },
+    "t_connectortag": {
+        "PropertyID": "int",
+        "ElementID": "int",
+    },
+    "t_diagram": {
+        "Diagram_ID": "int",
+        "Package_ID": "int",
+        "ParentID": "int",
+        "cx": "int",
+        "cy": "int",
+        "Scale": "int",
+        "Locked": "bool",
+        "ShowBorder": "bool",
+        "ShowDetails": "bool",
+        "ShowForeign": "bool",
+        "ShowPackageContents": "bool",
+    },
+    "t_diagramobjects": {
+        "Instance_ID": "int",
+        "Diagram_ID": "int",
+        "Object_ID": "int",
+        "Sequence": "int",
+        "RectTop": "int",
+        "RectLeft": "int",
+        "RectRight": "int",
+        "RectBottom": "int",
+    },
+    "t_diagramlinks": {
+        "Instance_ID": "int",
+        "DiagramID": "int",
+        "ConnectorID": "int",
+        "Hidden": "bool",
+    },
+    "t_xref": {
+        "XrefID": "guid",
+        "Client": "guid",
+        "Supplier": "guid",
+    },
+}
+
+# Row keys for tables without an `ea_guid` column (Sparx repository primary keys).
+_SPARX_171_PRIMARY_KEYS: dict[str, tuple[str, ...]] = {
+    "t_objectconstraint": ("Object_ID", "Constraint", "ConstraintType"),
+    "t_diagramobjects": ("Instance_ID",),
+    "t_diagramlinks": ("Instance_ID",),
+    "t_xref": ("XrefID",),
+}
+
+# Rows per Parquet row group: small enough that a point lookup reads a few
+# thousand rows, large enough to keep footers and per-group overhead small.
+_SPARX_171_ROW_GROUP = 16_384
+
+
+def _sorted_by(*columns: str) -> dict[str, Any]:
+    return {"sort_by": columns, "row_group_size": _SPARX_171_ROW_GROUP}
+
+
+# Parquet layouts: each table sorted by the ID its joins and lookups filter on
+# (owner element, connector source, parent), so row-group min/max statistics
+# prune point and range lookups. Other tables are sorted by `ea_guid`.
+_SPARX_171_LAYOUTS: dict[str, dict[str, Any]] = {
+    "*": _sorted_by("ea_guid"),
+    "t_package": _sorted_by("Package_ID"),
+    "t_object": _sorted_by("Object_ID"),
+    "t_objectconstraint": _sorted_by("Object_ID"),
+    "t_objectproperties": _sorted_by("Object_ID"),
+    "t_attribute": _sorted_by("Object_ID", "Pos"),
+    "t_attributetag": _sorted_by("ElementID"),
+    "t_operation": _sorted_by("Object_ID"),
+    "t_operationparams": _sorted_by("OperationID", "Pos"),
+    "t_connector": _sorted_by("Start_Object_ID", "End_Object_ID"),
+    "t_connectortag": _sorted_by("ElementID"),
+    "t_diagram": _sorted_by("Diagram_ID"),
+    "t_diagramobjects": _sorted_by("Diagram_ID", "Sequence"),
+    "t_diagramlinks": _sorted_by("DiagramID"),
+    "t_xref": _sorted_by("Client"),
+}
+
 
 # Defines a specific (vendor, version) adapter; values must be stable and lowercase for matching.
 # Invariant: this class should not perform I/O or DB creation—only routing/config.
@@ -33,6 +212,9 @@ class Sparx171(InputAdapter):
 
     VENDOR = "sparx"
     VERSION = "17.1"
+    COLUMN_TYPES = _SPARX_171_COLUMN_TYPES
+    PRIMARY_KEYS = _SPARX_171_PRIMARY_KEYS
+    LAYOUTS = _SPARX_171_LAYOUTS
 
     # Call only after `cls.matches(vendor, version)` is True.
     # Returns adapter-scoped options; user inputs are ignored in favor of class constants.
@@ -19,7 +19,7 @@ Responsibilities
 
 Notes
 -----
-- Requires `argv[1]` to be a path to evidence.jsonl (no runtime arg validation here).
+- `build_index(jsonl_path)` is the entry point; the CLI passes `argv[1]`.
 - Uses WAL mode and `synchronous=NORMAL` (faster writes, slightly less durable on power loss).
 - Deletes a non-SQLite file at the target path if found (double-check directories).
 """
@@ -27,22 +27,19 @@ Notes
 import json
 import sqlite3
 import sys
+from collections.abc import Iterator
 from pathlib import Path
 
 from app.core import paths
 
-# Requires argv[1] to be a path to evidence.jsonl; raises IndexError if missing.
-# Prefer validating the argument upstream or guard with a usage message here.
-jsonl_path = Path(sys.argv[1]).resolve()
-
-# Assumes layout: .../<model_id>/evidence/evidence.jsonl → up two levels to `<model_id>`.
-# If this layout changes, resolution will break—keep directory structure stable.
-model_dir = (
-    jsonl_path.parent.parent
-)  # .../<model_id>/evidence/evidence.jsonl -> .../<model_id>
-
-sqlite_path = (model_dir / "rag.sqlite").resolve()
-sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+# Use `INSERT OR REPLACE` keyed by `doc_id`—new rows with the same `doc_id` overwrite old ones.
+# Ensure `doc_id` is stable per evidence card to avoid accidental churn.
+insert_sql = """
+INSERT OR REPLACE INTO doc
+(doc_id, model_id, vendor, version, mml, probe_id, doc_type, subject_type, subject_id,
+ title, ctx_hdr, body_text, json_metadata)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+"""
 
 
 def _is_sqlite_file(p: Path) -> bool:
@@ -59,38 +56,9 @@ def _is_sqlite_file(p: Path) -> bool:
         return False
 
 
-# Defensive: remove a bogus file sitting at rag.sqlite before creating the DB.
-# Side effect: potential data loss if a non-SQLite file is present—ensure `model_dir` is correct.
-if sqlite_path.exists() and not _is_sqlite_file(sqlite_path):
-    sqlite_path.unlink()
-
-con = sqlite3.connect(sqlite_path.as_posix())
-
-# WAL improves concurrent read performance. With `synchronous=NORMAL`, writes are faster but
-# slightly less durable on power loss. Adjust if you need stronger durability guarantees.
-con.execute("PRAGMA journal_mode=WAL;")
-con.execute("PRAGMA synchronous=NORMAL;")
-
-
-# Load the canonical schema text (no path math). Expect DDL to be idempotent or use IF NOT EXISTS.
-# Raises if the schema text is invalid or incompatible with existing tables.
-con.executescript(paths.schema_sql_text())
-
-ins = con.cursor()
-
-# Use `INSERT OR REPLACE` keyed by `doc_id`—new rows with the same `doc_id` overwrite old ones.
-# Ensure `doc_id` is stable per evidence card to avoid accidental churn.
-insert_sql = """
-INSERT OR REPLACE INTO doc
-(doc_id, model_id, vendor, version, mml, probe_id, doc_type, subject_type, subject_id,
- title, ctx_hdr, body_text, json_metadata)
-VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-"""
-
-
 # Single-pass generator over JSONL; memory efficient for large files.
 # Expects each line to be a JSON object; blank lines are skipped.
-def iter_rows():
+def iter_rows(jsonl_path: Path) -> Iterator[tuple]:
     """Yield parameter tuples for `INSERT OR REPLACE` from evidence.jsonl lines.
 
     Notes
@@ -125,11 +93,54 @@ def iter_rows():
             )
 
 
-# Stream rows into a single transaction; commit below makes it atomic.
-# For very large inputs, consider chunking and periodic commits to reduce lock time.
-ins.executemany(insert_sql, iter_rows())
-con.commit()
-print("Writing per-model RAG DB:", sqlite_path)
-print("Docs:", con.execute("SELECT COUNT(*) FROM doc").fetchone()[0])
-print("FTS:", con.execute("SELECT COUNT(*) FROM doc_fts").fetchone()[0])
-con.close()
+def build_index(jsonl_path: Path) -> Path:
+    """Load `<model_dir>/evidence/evidence.jsonl` into `<model_dir>/rag.sqlite`.
+
+    Returns the SQLite path. Used by the pipeline in-process and by the CLI.
+    """
+    jsonl_path = Path(jsonl_path).resolve()
+
+    # Assumes layout: .../<model_id>/evidence/evidence.jsonl → up two levels to
+    # `<model_id>`. If this layout changes, resolution will break—keep directory
+    # structure stable.
+    model_dir = jsonl_path.parent.parent
+
+    sqlite_path = (model_dir / "rag.sqlite").resolve()
+    sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Defensive: remove a bogus file sitting at rag.sqlite before creating the DB.
+    # Side effect: potential data loss if a non-SQLite file is present—ensure
+    # `model_dir` is correct.
+    if sqlite_path.exists() and not _is_sqlite_file(sqlite_path):
+        sqlite_path.unlink()
+
+    con = sqlite3.connect(sqlite_path.as_posix())
+    try:
+        # WAL improves concurrent read performance. With `synchronous=NORMAL`,
+        # writes are faster but slightly less durable on power loss. Adjust if you
+        # need stronger durability guarantees.
+        con.execute("PRAGMA journal_mode=WAL;")
+        con.execute("PRAGMA synchronous=NORMAL;")
+
+        # Load the canonical schema text (no path math). Expect DDL to be
+        # idempotent or use IF NOT EXISTS.
+        # Raises if the schema text is invalid or incompatible with existing tables.
+        con.executescript(paths.schema_sql_text())
+
+        # Stream rows into a single transaction; commit below makes it atomic.
+        # For very large inputs, consider chunking and periodic commits to reduce
+        # lock time.
+        con.cursor().executemany(insert_sql, iter_rows(jsonl_path))
+        con.commit()
+        print("Writing per-model RAG DB:", sqlite_path)
+        print("Docs:", con.execute("SELECT COUNT(*) FROM doc").fetchone()[0])
+        print("FTS:", con.execute("SELECT COUNT(*) FROM doc_fts").fetchone()[0])
+    finally:
+        con.close()
+    return sqlite_path
+
+
+if __name__ == "__main__":
+    # Requires argv[1] to be a path to evidence.jsonl; raises IndexError if missing.
+    # Prefer validating the argument upstream or guard with a usage message here.
+    build_index(Path(sys.argv[1]))
@@ -10,7 +10,7 @@ and RAG bootstrapping — ensuring robustness and consistent job status updates.
 
 Responsibilities
 ----------------
-- Open and manage per-model DuckDB connections.
+- Hand out pooled read cursors on per-model DuckDB databases.
 - Run synchronous predicate evaluations for model maturity scoring.
 - Execute post-ingest side effects safely (e.g., Parquet mirroring, RAG bootstrap).
 - Orchestrate background pipeline jobs and maintain job status.
@@ -24,12 +24,14 @@ Notes
 from __future__ import annotations
 
 import logging
+from contextlib import AbstractContextManager
 from pathlib import Path
 
-import duckdb
+from duckdb import DuckDBPyConnection
 
 from app.core import paths
 from app.core.jobs_db import get_job, update_status
+from app.core.model_connections import model_connections
 from app.core.orchestrator import run as orchestrate_run
 from app.criteria.protocols import Context
 from app.criteria.runner import run_predicates
@@ -39,11 +41,9 @@ from app.evidence.writer import mirror_jsonl_to_parquet
 log = logging.getLogger("maturity.service.analysis")
 
 
-def _open_model_db(model_dir: Path) -> duckdb.DuckDBPyConnection:
-    """Open the DuckDB database for the given model directory with caching enabled."""
-    con = duckdb.connect(str(model_dir / "model.duckdb"))
-    con.execute("PRAGMA enable_object_cache=true;")
-    return con
+def _open_model_db(model_id: str) -> AbstractContextManager[DuckDBPyConnection]:
+    """Pooled read cursor on the model's DuckDB (`core.model_connections`)."""
+    return model_connections.cursor(model_id)
 
 
 def run_sync_predicates(
@@ -71,8 +71,10 @@ def run_sync_predicates(
         overwrite=True,
         build_rag=False,
         run_predicates=False,
+        vendor=vendor,
+        version=version,
     )
-    with _open_model_db(model_dir) as con:
+    with _open_model_db(model_id) as con:
         ctx = Context(
             vendor=vendor,
             version=version,
@@ -103,8 +105,14 @@ def post_ingest_best_effort(*, model_id: str) -> None:
         )
 
     try:
+        # Evidence already exists (sync predicates); the IR is unchanged, so
+        # the stage manifest skips it and only the RAG index is built.
         orchestrate_run(
-            model_id=model_id, xml_path=None, overwrite=False, build_rag=True
+            model_id=model_id,
+            xml_path=None,
+            overwrite=False,
+            build_rag=True,
+            run_predicates=False,
         )
     except Exception:
         log.warning(
@@ -112,19 +120,29 @@ def post_ingest_best_effort(*, model_id: str) -> None:
         )
 
 
-def run_pipeline_job(job_id: str, model_id: str) -> None:
+def run_pipeline_job(
+    job_id: str,
+    model_id: str,
+    *,
+    ingested: bool = False,
+    executor: str | None = None,
+) -> None:
     """
     Execute the full analysis pipeline (ingest → predicates → RAG) as a background job.
 
     Notes
     -----
+    - `ingested=True` skips the ingest step (the streaming upload already
+      published `t_*` into model.duckdb); IR, predicates and RAG still run.
+    - `executor` picks how stages run ("inprocess" | "subprocess", see
+      `orchestrator.run`); None uses `settings.PIPELINE_EXECUTOR`.
     - Updates the job row status in `jobs_db` as it progresses.
     - Reports all failures via `update_status` instead of raising.
     - Safe for background thread or task execution.
     """
     try:
         update_status(job_id, "running", progress=10)
-        xml_path = paths.model_dir(model_id) / "model.xml"
+        xml_path = paths.xml_path(model_id)
         if not xml_path.exists():
             update_status(
                 job_id, "failed", progress=100, message=f"missing xml: {xml_path}"
@@ -138,12 +156,13 @@ def run_pipeline_job(job_id: str, model_id: str) -> None:
 
         orchestrate_run(
             model_id=model_id,
-            xml_path=xml_path,
+            xml_path=None if ingested else xml_path,
             overwrite=False,
             build_rag=True,
             run_predicates=True,
             vendor=vendor,
             version=version,
+            executor=executor,
         )
         update_status(job_id, "succeeded", progress=100)
 
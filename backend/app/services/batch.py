@@ -0,0 +1,218 @@
+# ------------------------------------------------------------
+# Module: app/services/batch.py
+# Purpose: Run the model pipeline over a directory or glob of exports in parallel.
+# ------------------------------------------------------------
+
+"""Batch pipeline runs for onboarding many exports at once.
+
+Each export becomes a regular job in `jobs.sqlite` and runs the same pipeline
+as an API upload (`analysis.run_pipeline_job`). Jobs are spread over a process
+pool that is bounded by the CPU count and by how many per-job memory budgets
+fit into available memory.
+
+Responsibilities
+----------------
+- Expand a directory or glob into model exports (plain or compressed).
+- Hash exports in the pool; skip any whose sha256 already has a succeeded job
+  (and repeats of the same content inside the batch).
+- Size the pool from cores, available memory and `BATCH_JOB_MEM`, and tell
+  each job's DuckDB connections how many jobs share the machine
+  (`DUCKDB_JOBS`, see `app.core.resources`).
+- Store each export under its model directory, run the job, and collect the
+  outcome in one consolidated report (JSON).
+
+Notes
+-----
+- Idempotency key matches the API: `(sha256, vendor, version)`.
+- A failing model never stops the batch; it is reported with its message.
+- Each worker runs its pipeline in-process (or spawns per-stage children
+  with `PIPELINE_EXECUTOR=subprocess`, see `orchestrator.run`); memory, not
+  CPU, is usually the tighter bound.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from app.core import paths
+from app.core.config import settings
+from app.core.jobs_db import (
+    create_job,
+    ensure_initialized,
+    find_succeeded_by_sha,
+    get_job,
+    update_status,
+)
+from app.core.orchestrator import EXECUTORS
+from app.core.resources import available_cpus, available_memory, parse_size
+from app.ingest.xml_source import codec_of, sha256_xml
+from app.services.analysis import run_pipeline_job
+
+log = logging.getLogger("maturity.services.batch")
+
+# File names picked up when the batch source is a directory.
+EXPORT_PATTERNS = ("*.xml", "*.xml.gz", "*.xml.zst", "*.zip")
+# Under DATA_DIR; one JSON report per batch run.
+REPORTS_DIR = "batches"
+
+def plan_workers(jobs: int, requested: int | None = None) -> int:
+    """Concurrent jobs: min(requested, cores, memory / BATCH_JOB_MEM, jobs), >= 1."""
+    cores = max(1, int(available_cpus()))
+    limit = min(requested or settings.BATCH_WORKERS or cores, cores)
+    memory = available_memory()
+    if memory is not None:
+        limit = min(limit, memory // parse_size(settings.BATCH_JOB_MEM))
+    return max(1, min(limit, jobs))
+
+
+def collect_exports(source: str | Path) -> list[Path]:
+    """Exports named by a directory (top level, `EXPORT_PATTERNS`) or a glob."""
+    src = Path(source)
+    if src.is_dir():
+        found = {p for pattern in EXPORT_PATTERNS for p in src.glob(pattern)}
+    else:
+        found = {Path(p) for p in glob.glob(str(source), recursive=True)}
+    return sorted(p.resolve() for p in found if p.is_file())
+
+
+def _init_worker(jobs: int) -> None:
+    """Size DuckDB for `jobs` concurrent pipelines (here and in step subprocesses)."""
+    os.environ["MBSE_DUCKDB_JOBS"] = str(jobs)
+    settings.DUCKDB_JOBS = jobs
+
+
+def _process(
+    xml: str, sha: str, vendor: str, version: str, executor: str | None = None
+) -> dict[str, Any]:
+    """Worker: create the job, store the export, run the pipeline."""
+    t0 = time.perf_counter()
+    # Another batch (or the API) may have finished this model meanwhile.
+    existing = find_succeeded_by_sha(sha, vendor, version)
+    if existing and existing.get("status") == "succeeded":
+        return {
+            "status": "skipped",
+            "job_id": existing["id"],
+            "model_id": existing["model_id"],
+        }
+
+    model_id = sha[:8]
+    job_id = create_job(sha, model_id, vendor, version)
+    try:
+        paths.ensure_model_dirs(model_id)
+        shutil.copyfile(xml, paths.replace_xml_path(model_id, codec_of(xml)))
+        # Reports its own failures on the job row.
+        run_pipeline_job(job_id, model_id, executor=executor)
+    except Exception as e:
+        message = f"{type(e).__name__}: {e}"
+        update_status(job_id, "failed", progress=100, message=message)
+    row = get_job(job_id) or {}
+    return {
+        "status": row.get("status", "failed"),
+        "job_id": job_id,
+        "model_id": model_id,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "message": row.get("message"),
+    }
+
+
+def run_batch(
+    source: str | Path,
+    *,
+    vendor: str,
+    version: str,
+    workers: int | None = None,
+    report_path: Path | None = None,
+    executor: str | None = None,
+) -> dict[str, Any]:
+    """Run the pipeline for every export in `source`; return the batch report.
+
+    The report is also written to `report_path` (default:
+    `DATA_DIR/batches/batch-<timestamp>.json`). Entry statuses:
+    "succeeded" | "failed" | "skipped" (already succeeded) | "duplicate"
+    (same content as an earlier file in this batch). `executor` is passed to
+    every job's pipeline run (None: `settings.PIPELINE_EXECUTOR`); raises
+    `ValueError` for an unknown one before any job starts.
+    """
+    executor = executor or settings.PIPELINE_EXECUTOR
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"unknown pipeline executor '{executor}' (expected {EXECUTORS})"
+        )
+    ensure_initialized()
+    exports = collect_exports(source)
+    n_workers = plan_workers(len(exports), workers)
+    started = time.time()
+    log.info(
+        "batch start source=%s exports=%d workers=%d job_mem=%s",
+        source,
+        len(exports),
+        n_workers,
+        settings.BATCH_JOB_MEM,
+    )
+
+    entries: list[dict[str, Any]] = [{"xml": str(p)} for p in exports]
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(n_workers,)
+    ) as pool:
+        shas = list(pool.map(sha256_xml, exports))
+        seen: dict[str, str] = {}
+        futures = {}
+        for entry, xml, sha in zip(entries, exports, shas, strict=True):
+            entry["sha256"] = sha
+            if sha in seen:
+                entry.update(status="duplicate", duplicate_of=seen[sha])
+                continue
+            seen[sha] = str(xml)
+            existing = find_succeeded_by_sha(sha, vendor, version)
+            if existing and existing.get("status") == "succeeded":
+                entry.update(
+                    status="skipped",
+                    job_id=existing["id"],
+                    model_id=existing["model_id"],
+                )
+                continue
+            futures[str(xml)] = pool.submit(
+                _process, str(xml), sha, vendor, version, executor
+            )
+        for entry in entries:
+            future = futures.get(entry["xml"])
+            if future is None:
+                continue
+            try:
+                entry.update(future.result())
+            except Exception as e:  # worker crashed (e.g. killed by the OOM killer)
+                entry.update(status="failed", message=f"{type(e).__name__}: {e}")
+            log.info("batch model xml=%s status=%s", entry["xml"], entry["status"])
+
+    totals: dict[str, int] = {}
+    for entry in entries:
+        totals[entry["status"]] = totals.get(entry["status"], 0) + 1
+    report = {
+        "source": str(source),
+        "vendor": vendor,
+        "version": version,
+        "workers": n_workers,
+        "executor": executor,
+        "job_mem": settings.BATCH_JOB_MEM,
+        "started_at": int(started * 1000),
+        "finished_at": int(time.time() * 1000),
+        "seconds": round(time.time() - started, 3),
+        "totals": totals,
+        "models": entries,
+    }
+    if report_path is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(started))
+        report_path = paths.DATA_DIR / REPORTS_DIR / f"batch-{stamp}.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    report["report_path"] = str(report_path)
+    log.info("batch done totals=%s report=%s", totals, report_path)
+    return report
@@ -28,19 +28,20 @@ from pathlib import Path
 
 from app.core import paths
 from app.core.jobs_db import get_job
+from app.ingest.xml_source import SNIFF_BYTES, sniff
 
 
 # Write or ensure existence of a model XML file for a given model ID.
 def persist_model_xml(model_id: str, data: bytes, *, overwrite: bool = False) -> Path:
     """
-    Ensure the model’s XML file exists under `data/models/<model_id>/model.xml`.
+    Ensure the model’s export exists under `data/models/<model_id>/`.
 
     Parameters
     ----------
     model_id : str
         Unique model identifier.
     data : bytes
-        Raw XML content to write.
+        XML content to write: plain, gzip, zstd or a single-entry zip.
     overwrite : bool, optional
         If True, replaces any existing XML file. Defaults to False.
 
@@ -52,14 +53,18 @@ def persist_model_xml(model_id: str, data: bytes, *, overwrite: bool = False) ->
     Notes
     -----
     - Creates parent directories if missing.
+    - Compressed exports are stored as received (`model.xml.gz`, ...); the
+      parser decompresses them while streaming.
     - Safe to call multiple times (idempotent unless `overwrite=True`).
     """
     model_dir = paths.model_dir(model_id)
     model_dir.mkdir(parents=True, exist_ok=True)
-    xml_path = model_dir / "model.xml"
+    existing = paths.xml_path(model_id)
+    if existing.exists() and not overwrite:
+        return existing
 
-    if overwrite or not xml_path.exists():
-        xml_path.write_bytes(data)
+    xml_path = paths.replace_xml_path(model_id, sniff(data[:SNIFF_BYTES]))
+    xml_path.write_bytes(data)
     return xml_path
 
 
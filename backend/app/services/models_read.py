@@ -25,12 +25,11 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import duckdb
-
 from app.core import paths
 from app.core.jobs_db import (
     _connect as _jobs_connect,  # TODO: replace with public helper
 )
+from app.core.model_connections import model_connections
 from app.criteria.protocols import Context
 from app.criteria.runner import run_predicates
 
@@ -90,17 +89,16 @@ def read_model_summary(model_id: str) -> tuple[int, list, str, str]:
 
     Notes
     -----
-    - Enables DuckDB object cache for repeated predicate runs.
+    - Reads through the pooled read connection (`model_connections`),
+      so repeated requests skip the open and keep the object cache warm.
     - Pulls vendor/version from the latest job row when available.
     """
     model_dir: Path = paths.model_dir(model_id)
-    db_path: Path = paths.duckdb_path(model_id)
     job = get_latest_job(model_id) or {}
     vendor = str(job.get("vendor", ""))
     version = str(job.get("version", ""))
 
-    with duckdb.connect(str(db_path)) as con:
-        con.execute("PRAGMA enable_object_cache=true;")
+    with model_connections.cursor(model_id) as con:
         ctx = Context(
             vendor=vendor,
             version=version,
@@ -0,0 +1,295 @@
+# ------------------------------------------------------------
+# Module: app/services/upload_stream.py
+# Purpose: Pipeline an upload into disk, SHA-256 and the XML parser as chunks arrive.
+# ------------------------------------------------------------
+
+"""Streaming upload → ingest.
+
+Each chunk of an upload is written to a staging file as received (compressed
+uploads stay compressed), inflated when it is gzip/zstd, folded into a
+running SHA-256 of the XML and handed to a parser thread over a small bounded
+queue. The parser
+thread runs the fast row engine over that queue and writes Parquet per table,
+so by the time the last byte lands most of the model is already ingested and
+memory per upload stays at a few chunks (plus the table being parsed).
+
+Responsibilities
+----------------
+- Stage XML and Parquet under `MODELS_DIR/.incoming/<token>/` until the
+  content hash (and so the model id) is known.
+- Enforce the upload size limit while streaming (no full-buffer read), and
+  `MAX_XML_MB` on the decompressed XML.
+- Hash the decompressed XML, so raw and compressed uploads share a model id.
+- Keep parsing optional: a parse failure is recorded, the XML is still kept,
+  and the caller falls back to the regular subprocess ingest.
+- Move staged files into the model directory and publish `t_*` in DuckDB.
+- Honor lean ingest (`column_manifest`): drop columns while parsing, or parse
+  everything and publish lean copies of the cold tables on commit.
+
+Notes
+-----
+- The one-pass engines buffer rows for the `<Table>` currently being parsed,
+  so peak memory is bounded by the largest table, not the whole file.
+- The queue applies backpressure: a slow parser slows the upload, it does not
+  grow memory.
+- A zip archive can only be read once its central directory (at the end) has
+  arrived, so zip uploads are inflated and parsed after the body lands.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import queue
+import shutil
+import threading
+import uuid
+import zipfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core import paths
+from app.core.config import settings
+from app.core.model_connections import model_connections
+from app.core.stage_manifest import StageManifest
+from app.ingest.column_manifest import COLD_DIR, ColumnManifest, project_parquet
+from app.ingest.column_types import ColumnTypes
+from app.ingest.duckdb_connection import open_duckdb
+from app.ingest.loader_duckdb import extension_config, publish_parquet
+from app.ingest.normalize_rows import normalized_rows_fast
+from app.ingest.parquet_layout import ParquetLayouts
+from app.ingest.xml_source import SNIFF_BYTES, XML, ZIP, Inflater, open_xml, sniff
+from app.utils.timing import log_timer
+
+log = logging.getLogger("maturity.services.upload_stream")
+
+CHUNK_BYTES = 1024 * 1024
+# Chunks buffered between the request and the parser thread (backpressure bound).
+QUEUE_CHUNKS = 8
+
+
+class UploadTooLarge(Exception):
+    """Raised when the streamed body (or its inflated XML) exceeds a size limit."""
+
+
+class _QueueReader:
+    """Blocking binary reader over a queue of byte chunks (None = EOF)."""
+
+    def __init__(self, q: queue.Queue[bytes | None]):
+        self._q = q
+        self._buf = b""
+        self.eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self.eof and (size < 0 or len(self._buf) < size):
+            chunk = self._q.get()
+            if chunk is None:
+                self.eof = True
+            else:
+                self._buf += chunk
+        if size < 0:
+            out, self._buf = self._buf, b""
+        else:
+            out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
+class StreamingIngest:
+    """One in-flight upload: staging file, running hash and parser thread."""
+
+    def __init__(
+        self,
+        column_types: ColumnTypes | None = None,
+        keep_columns: ColumnManifest | None = None,
+        cold: bool = False,
+        layouts: ParquetLayouts | None = None,
+    ):
+        self.staging = paths.MODELS_DIR / ".incoming" / uuid.uuid4().hex
+        self.parquet_dir = self.staging / "parquet"
+        self.parquet_dir.mkdir(parents=True, exist_ok=True)
+        # Stored as received; named after its codec on commit.
+        self.raw_path = self.staging / "upload.bin"
+        self.size = 0
+        self.xml_size = 0
+        self.codec: str | None = None
+        self._head = b""
+        self._inflater: Inflater | None = None
+        self._limit = settings.MAX_UPLOAD_MB * 1024 * 1024
+        self._xml_limit = settings.MAX_XML_MB * 1024 * 1024
+        self._sha = hashlib.sha256()
+        # Closed by `consume` once the body has landed, or by `abort`.
+        self._files = contextlib.ExitStack()
+        self._out = self._files.enter_context(self.raw_path.open("wb"))
+        self._q: queue.Queue[bytes | None] = queue.Queue(maxsize=QUEUE_CHUNKS)
+        # Extension mode follows settings, like the subprocess ingest.
+        self._config, self._column_types = extension_config(None, column_types)
+        self._keep_columns = keep_columns
+        self._layouts = layouts
+        # Cold: parse every column now, publish lean copies on commit.
+        self._cold = cold and keep_columns is not None
+        self._written: dict[str, tuple[Path, int]] | None = None
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._parse, name="upload-parse", daemon=True
+        )
+        self._thread.start()
+
+    # ---- parser thread ----
+    def _parse(self) -> None:
+        # Deferred import: pyarrow is only required on this path.
+        from app.ingest.columnar_writer import write_parquet_tables
+
+        con = open_duckdb(Path(":memory:"), threads=1)
+        reader = _QueueReader(self._q)
+        try:
+            with log_timer("upload-stream-parse", logger=log):
+                _schema, row_iter = normalized_rows_fast(
+                    reader,
+                    config=self._config,
+                    keep_columns=None if self._cold else self._keep_columns,
+                )
+                self._written = write_parquet_tables(
+                    row_iter,
+                    self.parquet_dir,
+                    con,
+                    batch_rows=settings.INGEST_BATCH_ROWS,
+                    column_types=self._column_types,
+                    store=settings.INGEST_PARQUET_STORE,
+                    layouts=self._layouts,
+                )
+        except BaseException as e:  # recorded; caller falls back to a full ingest
+            self._error = e
+            log.warning("upload-stream parse failed; will re-ingest", exc_info=True)
+            # Drain so the producer never blocks on a dead consumer.
+            while not reader.eof and self._q.get() is not None:
+                pass
+        finally:
+            con.close()
+
+    # ---- request side ----
+    def _put(self, chunk: bytes | None) -> None:
+        self._q.put(chunk)
+
+    def _emit(self, data: bytes) -> None:
+        """Hash XML bytes and hand them to the parser (blocks on backpressure)."""
+        if not data:
+            return
+        self.xml_size += len(data)
+        if self.xml_size > self._xml_limit:
+            raise UploadTooLarge(f"inflated XML exceeds {settings.MAX_XML_MB} MB")
+        self._sha.update(data)
+        self._put(data)
+
+    def _start(self, head: bytes) -> bytes:
+        """Pick the codec from the first bytes; return XML decoded from `head`."""
+        self.codec = sniff(head)
+        if self.codec == ZIP:
+            return b""  # inflated in `_inflate_zip` once the body has landed
+        self._inflater = Inflater(self.codec)
+        return self._inflater.feed(head)
+
+    def _inflate_zip(self) -> None:
+        try:
+            with open_xml(self.raw_path) as f:
+                for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+                    self._emit(chunk)
+        except zipfile.BadZipFile as e:
+            raise ValueError("corrupt zip upload") from e
+
+    def _absorb(self, chunk: bytes) -> None:
+        """Write one chunk to disk, inflate it and emit the XML (worker thread)."""
+        self._out.write(chunk)
+        if self.codec is None:
+            self._head += chunk
+            if len(self._head) < SNIFF_BYTES:
+                return
+            data, self._head = self._start(self._head), b""
+        elif self._inflater is not None:
+            data = self._inflater.feed(chunk)
+        else:
+            return
+        self._emit(data)
+
+    async def feed(self, chunk: bytes) -> None:
+        """Write, inflate, hash and hand one chunk to the parser; enforce limits.
+
+        The file write and inflation run in the threadpool, off the event
+        loop. Raises `UploadTooLarge` past a size limit and `ValueError` on
+        corrupt compressed data.
+        """
+        self.size += len(chunk)
+        if self.size > self._limit:
+            raise UploadTooLarge(f"upload exceeds {settings.MAX_UPLOAD_MB} MB")
+        await run_in_threadpool(self._absorb, chunk)
+
+    async def consume(self, chunks: AsyncIterator[bytes]) -> str:
+        """Feed every chunk, wait for the parser, and return the XML's SHA-256."""
+        try:
+            async for chunk in chunks:
+                if chunk:
+                    await self.feed(chunk)
+            await run_in_threadpool(self._files.close)
+            if self.codec is None:  # body shorter than the sniff window
+                await run_in_threadpool(self._emit, self._start(self._head))
+            if self._inflater is not None:
+                await run_in_threadpool(self._emit, self._inflater.flush())
+            else:
+                await run_in_threadpool(self._inflate_zip)
+        except BaseException:
+            await run_in_threadpool(self.abort)
+            raise
+        await run_in_threadpool(self._put, None)
+        await run_in_threadpool(self._thread.join)
+        return self._sha.hexdigest()
+
+    @property
+    def parsed(self) -> bool:
+        """True when the parser consumed the whole upload and wrote Parquet."""
+        return self._error is None and bool(self._written)
+
+    def abort(self) -> None:
+        """Stop the parser and remove everything staged for this upload."""
+        self._files.close()
+        self._put(None)
+        self._thread.join()
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+    def commit(self, model_id: str) -> Path:
+        """Move staged files into the model directory and publish `t_*`.
+
+        Returns the persisted export path (`model.xml`, or `model.xml.gz` etc.
+        for compressed uploads). When parsing failed, only the export is moved
+        (the caller's pipeline then runs the regular ingest). Either way the
+        model's recorded stages are forgotten, so the pipeline reruns them.
+        """
+        model_dir = paths.ensure_model_dirs(model_id)
+        # A re-upload under the same model id replaces the export and tables;
+        # nothing recorded against the old ones may be skipped.
+        StageManifest(model_dir).begin("ingest")
+        xml_path = paths.replace_xml_path(model_id, self.codec or XML)
+        shutil.move(str(self.raw_path), xml_path)
+        if self.parsed:
+            assert self._written is not None
+            dst = model_dir / "parquet"
+            written: dict[str, tuple[Path, int]] = {}
+            for table, (src, rows) in self._written.items():
+                target = (dst / COLD_DIR if self._cold else dst) / src.name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(src), target)
+                written[table] = (target, rows)
+            if self._cold:
+                assert self._keep_columns is not None
+                con = open_duckdb(Path(":memory:"), threads=1)
+                try:
+                    written = project_parquet(
+                        con, written, dst, self._keep_columns, self._layouts
+                    )
+                finally:
+                    con.close()
+            with model_connections.rebuilding(model_id):
+                publish_parquet(model_dir, written)
+        shutil.rmtree(self.staging, ignore_errors=True)
+        return xml_path
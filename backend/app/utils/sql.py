@@ -0,0 +1,23 @@
+# ------------------------------------------------------------
+# Module: app/utils/sql.py
+# Purpose: Provide SQL text helpers shared by the DuckDB modules.
+# ------------------------------------------------------------
+
+"""Small helpers for building DuckDB SQL text.
+
+Responsibilities
+----------------
+- Quote identifiers (table and column names) for DuckDB statements.
+
+Notes
+-----
+- No DuckDB import: layout, schema and adapter-facing modules can use it
+  without depending on a connection.
+"""
+
+from __future__ import annotations
+
+
+def quote_ident(name: str) -> str:
+    """Quote an identifier for DuckDB (escaping internal double quotes)."""
+    return '"' + name.replace('"', '""') + '"'
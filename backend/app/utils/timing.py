@@ -14,6 +14,7 @@ Responsibilities
 - Provide a consistent context manager for timing and logging operations.
 - Log start, success, and failure messages with elapsed durations.
 - Support optional contextual data in structured log output.
+- Let benchmarks collect every timed block as a span (`record_timers`).
 
 Notes
 -----
@@ -25,8 +26,15 @@ Notes
 from __future__ import annotations
 
 import logging
+import threading
 import time
+from collections.abc import Iterator
 from contextlib import contextmanager
+from typing import Any
+
+# Span lists of active `record_timers` blocks (usually none).
+_recorders: list[list[dict[str, Any]]] = []
+_recorders_lock = threading.Lock()
 
 
 def now_ns() -> int:
@@ -56,6 +64,44 @@ def ms_since(t0_ns: int) -> float:
     return (time.perf_counter_ns() - t0_ns) / 1_000_000.0
 
 
+@contextmanager
+def record_timers() -> Iterator[list[dict[str, Any]]]:
+    """Collect every `log_timer` block that finishes while this block is open.
+
+    Yields a list that receives one span per finished timer, in completion
+    order: `{"label", "start", "end", "seconds", "ok", "ctx"}` (start/end are
+    `perf_counter()` values, so spans can be matched against other samples).
+
+    Notes
+    -----
+    - Process-wide: timers from every thread are recorded; timers in child
+      processes are not.
+    - Nested timers are all recorded; callers decide which labels to sum.
+    """
+    spans: list[dict[str, Any]] = []
+    with _recorders_lock:
+        _recorders.append(spans)
+    try:
+        yield spans
+    finally:
+        with _recorders_lock:
+            _recorders.remove(spans)
+
+
+def _record(msg: str, t0: float, t1: float, ok: bool, ctx: dict[str, Any]) -> None:
+    span = {
+        "label": msg,
+        "start": t0,
+        "end": t1,
+        "seconds": t1 - t0,
+        "ok": ok,
+        "ctx": ctx,
+    }
+    with _recorders_lock:
+        for spans in _recorders:
+            spans.append(span)
+
+
 @contextmanager
 def log_timer(msg: str, logger: logging.Logger | None = None, **ctx):
     """Context manager for timing and structured logging around a code block.
@@ -94,6 +140,8 @@ def log_timer(msg: str, logger: logging.Logger | None = None, **ctx):
         yield
     except Exception:
         dt = time.perf_counter() - t0
+        if _recorders:
+            _record(msg, t0, t0 + dt, False, ctx)
         if ctx:
             log.error("%s failed after %.3fs %s", msg, dt, ctx, exc_info=True)
         else:
@@ -101,6 +149,8 @@ def log_timer(msg: str, logger: logging.Logger | None = None, **ctx):
         raise
     else:
         dt = time.perf_counter() - t0
+        if _recorders:
+            _record(msg, t0, t0 + dt, True, ctx)
         if ctx:
             log.info("%s ok in %.3fs %s", msg, dt, ctx)
         else:
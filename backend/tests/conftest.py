@@ -0,0 +1,9 @@
+import pytest
+
+from app.core import paths
+
+
+@pytest.fixture(autouse=True)
+def _private_parquet_store(tmp_path, monkeypatch):
+    """Keep the shared Parquet store inside each test's temp directory."""
+    monkeypatch.setattr(paths, "PARQUET_STORE_DIR", tmp_path / "store")
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from app.core import paths
+from app.ingest import loader_duckdb
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_model_connections_pool_lru_ttl_and_rebuild(tmp_path, monkeypatch):
+    """Pooled handles are reused, evicted LRU, expired and invalidated."""
+    import threading
+
+    from app.core.model_connections import ModelConnections
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    for model in ("a", "b", "c"):
+        (tmp_path / model).mkdir()
+        con = duckdb.connect(str(tmp_path / model / "model.duckdb"))
+        con.execute(f"CREATE TABLE t AS SELECT '{model}' AS m")
+        con.close()
+
+    now = [0.0]
+    pool = ModelConnections(max_open=2, idle_ttl=10, clock=lambda: now[0])
+    with pool.cursor("a") as cur:
+        assert cur.execute("SELECT m FROM t").fetchone() == ("a",)
+    with pool.cursor("b"), pool.cursor("a"):
+        pass
+    with pool.cursor("c"):
+        pass
+    assert pool.stats()["open"] == ["a", "c"]  # "b" was least recently used
+
+    # A rebuild starts only once the model's outstanding cursors are returned.
+    entered = threading.Event()
+
+    def _rebuild():
+        with pool.rebuilding("c"):
+            entered.set()
+
+    with pool.cursor("c"):
+        worker = threading.Thread(target=_rebuild)
+        worker.start()
+        assert not entered.wait(0.2)
+    worker.join(5)
+    assert entered.is_set() and pool.stats()["open"] == ["a"]
+    with pool.cursor("c"):
+        pass
+
+    # A rebuild closes the handle and keeps the model out of the pool meanwhile.
+    with pool.rebuilding("a"):
+        assert pool.stats()["open"] == ["c"]
+        con = duckdb.connect(str(tmp_path / "a" / "model.duckdb"))
+        con.execute("CREATE OR REPLACE TABLE t AS SELECT 'a2' AS m")
+        con.close()
+    with pool.cursor("a") as cur:
+        assert cur.execute("SELECT m FROM t").fetchone() == ("a2",)
+
+    now[0] += 11
+    assert pool.sweep() == 2 and pool.stats()["open"] == []
+    with pytest.raises(FileNotFoundError), pool.cursor("missing"):
+        pass
+    pool.close_all()
+
+
+def test_model_reads_while_inprocess_pipeline_writes(tmp_path, monkeypatch):
+    """Pooled reads work during a run that holds the model's write connection."""
+    from app.core import orchestrator
+    from app.core.model_connections import model_connections
+    from app.criteria import runner
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    real_run = runner.run_and_summarize
+    seen = []
+
+    def _run_and_read(db, ctx):
+        with model_connections.cursor("live") as cur:
+            seen.append(cur.execute("SELECT count(*) FROM duckdb_views()").fetchone())
+        return real_run(db, ctx)
+
+    monkeypatch.setattr(runner, "run_and_summarize", _run_and_read)
+    try:
+        orchestrator.run(
+            model_id="live", xml_path=SAMPLE, build_rag=False, executor="inprocess"
+        )
+        # A pooled handle from before a rerun is closed, not shared, by it.
+        with model_connections.cursor("live"):
+            pass
+        assert "live" in model_connections.stats()["open"]
+        orchestrator.run(
+            model_id="live",
+            xml_path=SAMPLE,
+            overwrite=True,
+            build_rag=False,
+            executor="inprocess",
+        )
+        assert "live" not in model_connections.stats()["open"]
+        assert len(seen) == 2 and all(n[0] > 0 for n in seen)
+    finally:
+        model_connections.close_all()
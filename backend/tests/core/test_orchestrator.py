@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from app.core import paths
+from app.ingest import loader_duckdb
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_inprocess_pipeline_runs_all_stages(tmp_path, monkeypatch):
+    """The in-process executor ingests, builds IR, evaluates and indexes."""
+    import json
+
+    from app.core import orchestrator
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+
+    res = orchestrator.run(
+        model_id="inproc",
+        xml_path=SAMPLE,
+        vendor="sparx",
+        version="17.1",
+        executor="inprocess",
+    )
+    assert list(res.timings) == ["ingest", "ir", "predicates", "rag"]
+    summary = json.loads((tmp_path / "inproc" / "summary.json").read_text())
+    assert summary["counts"]["predicates_total"] > 0
+    assert (tmp_path / "inproc" / "rag.sqlite").exists()
+
+    # Nothing changed: every stage is skipped by its recorded fingerprint.
+    again = orchestrator.run(
+        model_id="inproc",
+        xml_path=SAMPLE,
+        vendor="sparx",
+        version="17.1",
+        executor="inprocess",
+    )
+    assert again.timings == {}
+    assert again.skipped == ("ingest", "ir", "predicates", "rag")
+
+
+def test_inprocess_parallel_ingest_forks_before_duckdb_opens(tmp_path, monkeypatch):
+    """Parse workers are forked before the shared connection is opened."""
+    from app.core import orchestrator
+    from app.ingest import duckdb_connection
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(orchestrator.settings, "INGEST_ENGINE", "parallel")
+    opened, parsed_before_open = [], []
+    real_open, real_parse = duckdb_connection.open_duckdb, loader_duckdb.parse_parallel
+
+    def _open(path, *args, **kwargs):
+        opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    def _parse(*args, **kwargs):
+        parsed_before_open.append(not opened)
+        return real_parse(*args, **kwargs)
+
+    monkeypatch.setattr(duckdb_connection, "open_duckdb", _open)
+    monkeypatch.setattr(loader_duckdb, "open_duckdb", _open)
+    monkeypatch.setattr(loader_duckdb, "parse_parallel", _parse)
+    res = orchestrator.run(
+        model_id="par", xml_path=SAMPLE, build_rag=False, executor="inprocess"
+    )
+    assert parsed_before_open == [True]
+    assert opened == [tmp_path / "par" / "model.duckdb"]
+    assert list(res.timings) == ["ingest", "ir", "predicates"]
+
+
+def test_pipeline_resumes_after_failed_stage(tmp_path, monkeypatch):
+    """A failed stage is not recorded; the rerun resumes there."""
+    from app.core import orchestrator
+    from app.criteria import runner
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+
+    def _boom(db, ctx):
+        raise RuntimeError("predicates crashed")
+
+    with monkeypatch.context() as m:
+        m.setattr(runner, "run_and_summarize", _boom)
+        with pytest.raises(RuntimeError, match="crashed"):
+            orchestrator.run(model_id="resume", xml_path=SAMPLE, executor="inprocess")
+
+    res = orchestrator.run(
+        model_id="resume", xml_path=SAMPLE, build_rag=False, executor="inprocess"
+    )
+    assert res.skipped == ("ingest", "ir")
+    assert list(res.timings) == ["predicates"]
+
+    # Changing a setting that shapes ingest output reruns everything.
+    monkeypatch.setattr(orchestrator.settings, "INGEST_EXTENSIONS", "json")
+    res = orchestrator.run(
+        model_id="resume", xml_path=SAMPLE, build_rag=False, executor="inprocess"
+    )
+    assert list(res.timings) == ["ingest", "ir", "predicates"]
+
+
+def test_out_of_band_load_reruns_recorded_stages(tmp_path, monkeypatch):
+    """A loader run outside the pipeline forgets the stages built on old tables."""
+    from app.core import orchestrator
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    opts = {"model_id": "oob", "build_rag": False, "executor": "inprocess"}
+    orchestrator.run(xml_path=SAMPLE, **opts)
+    assert orchestrator.run(xml_path=None, **opts).timings == {}
+
+    loader_duckdb.ingest_xml(SAMPLE, model_id="oob")
+    assert list(orchestrator.run(xml_path=None, **opts).timings) == [
+        "ir",
+        "predicates",
+    ]
@@ -0,0 +1,33 @@
+import duckdb
+
+
+def test_resource_profile_splits_cgroup_limits(tmp_path, monkeypatch):
+    """cgroup v2 limits are read and divided across jobs x connections."""
+    from app.core import resources
+    from app.core.config import settings
+
+    (tmp_path / "cpu.max").write_text("800000 100000\n")
+    (tmp_path / "memory.max").write_text("8000000000\n")
+    (tmp_path / "memory.current").write_text("1000\n")
+    assert resources.cgroup_cpus(tmp_path) == 8.0
+    assert resources.cgroup_memory(tmp_path) == (8_000_000_000, 1000)
+
+    monkeypatch.setattr(resources, "available_cpus", lambda: 8.0)
+    monkeypatch.setattr(resources, "total_memory", lambda: 8_000_000_000)
+    monkeypatch.setattr(settings, "DUCKDB_THREADS", None)
+    monkeypatch.setattr(settings, "DUCKDB_MEM", None)
+    monkeypatch.setattr(settings, "DUCKDB_MEM_FRACTION", 0.5)
+    monkeypatch.setattr(settings, "DUCKDB_TEMP_DIR", tmp_path / "spill")
+    resources._resolve.cache_clear()
+    try:
+        profile = resources.resolve_profile(jobs=2, share=2)
+        assert profile.threads == 2
+        assert profile.memory_limit == "1000MB"
+        assert profile.temp_directory.parent == tmp_path / "spill"
+
+        con = duckdb.connect()
+        resources.apply_profile(con, profile)
+        assert con.execute("SELECT current_setting('threads')").fetchone()[0] == 2
+        con.close()
+    finally:
+        resources._resolve.cache_clear()
@@ -0,0 +1,23 @@
+from app.core import paths
+
+
+def test_ir_code_version_covers_modules_build_ir_imports():
+    """Editing any app.ingest module that build_ir pulls in invalidates IR."""
+    import ast
+
+    from app.core.stage_manifest import STAGE_CODE
+
+    listed = set(STAGE_CODE["ir"])
+    todo, seen = ["ingest/build_ir.py"], set()
+    while todo:
+        rel = todo.pop()
+        if rel in seen:
+            continue
+        seen.add(rel)
+        tree = ast.parse((paths.APP_ROOT / rel).read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                name = node.module if node.level == 0 else f"app.ingest.{node.module}"
+                if name.startswith("app.ingest."):
+                    todo.append(name.removeprefix("app.").replace(".", "/") + ".py")
+    assert seen <= listed
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from app.core import paths
+from app.ingest import loader_duckdb
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+@pytest.fixture
+def helper_predicate(tmp_path, monkeypatch):
+    """Models under tmp_path, plus a stub predicate that declares `HELPERS`."""
+    from app.core import jobs_db
+    from app.criteria import loader, runner
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(paths, "JOBS_DB", tmp_path / "jobs.sqlite")
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    jobs_db.ensure_initialized()
+
+    def _uses_blocks(db, ctx):
+        (n,) = db.execute("SELECT count(*) FROM irx.blocks").fetchone()
+        return True, {"blocks": n}
+
+    loaded = runner.discover(None, strict=True)
+    loaded.append(("mml_1", "uses_blocks", _uses_blocks))
+    declared = {"mml_1:uses_blocks": ("blocks",)}
+    monkeypatch.setattr(runner, "discover", lambda groups, strict: loaded)
+    monkeypatch.setattr(runner, "declared_helpers", lambda groups=None: declared)
+    monkeypatch.setattr(loader, "declared_helpers", lambda groups=None: declared)
+    return "mml_1:uses_blocks"
+
+
+def test_helpers_are_built_by_pipeline_and_only_checked_on_reads(
+    tmp_path, monkeypatch, helper_predicate
+):
+    """A HELPERS predicate reads helpers the pipeline built; reads never build."""
+    from app.core import orchestrator
+    from app.core.model_connections import model_connections
+    from app.criteria import runner
+    from app.ingest import build_ir
+    from app.services.models_read import read_model_summary
+
+    orchestrator.run(
+        model_id="helpers", xml_path=SAMPLE, build_rag=False, executor="inprocess"
+    )
+
+    def _no_build(*args, **kwargs):
+        raise AssertionError("read path built helpers")
+
+    monkeypatch.setattr(build_ir, "build_helpers", _no_build)
+    try:
+        _level, evidence, _vendor, _version = read_model_summary("helpers")
+        uses_blocks = next(e for e in evidence if e.predicate == helper_predicate)
+        assert uses_blocks.passed and uses_blocks.details["blocks"] > 0
+
+        # Dropped behind the pipeline's back: reads fail clearly, not rebuild.
+        model_connections.invalidate("helpers")
+        con = duckdb.connect(str(tmp_path / "helpers" / "model.duckdb"))
+        con.execute("DROP TABLE irx.blocks")
+        con.close()
+        with pytest.raises(runner.PredicateCrashed, match="missing or stale"):
+            read_model_summary("helpers")
+    finally:
+        model_connections.close_all()
+
+
+def test_sync_predicates_get_declared_helpers(helper_predicate):
+    """The sync analyze path evaluates HELPERS predicates without a predicates stage."""
+    from app.core.model_connections import model_connections
+    from app.services.analysis import run_sync_predicates
+
+    try:
+        _level, evidence = run_sync_predicates(
+            model_id="sync", vendor="sparx", version="17.1", xml_path=SAMPLE
+        )
+    finally:
+        model_connections.close_all()
+    uses_blocks = next(e for e in evidence if e.predicate == helper_predicate)
+    assert uses_blocks.passed and uses_blocks.details["blocks"] > 0
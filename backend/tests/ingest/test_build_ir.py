@@ -0,0 +1,182 @@
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from app.ingest.loader_duckdb import load_xml_to_duckdb
+from app.input_adapters.sparx.v17_1.adapter import Sparx171
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_canonical_columns_feed_helpers(tmp_path):
+    """Typed ingest writes canonical columns; IR views derive them otherwise."""
+    from app.ingest.build_ir import build_helpers, create_ir_views
+
+    def _helpers(model_dir):
+        con = duckdb.connect(str(model_dir / "model.duckdb"))
+        try:
+            create_ir_views(con)
+            build_helpers(con)
+            return {
+                t: sorted(
+                    tuple(map(str, r))
+                    for r in con.execute(f"SELECT * FROM irx.{t}").fetchall()
+                )
+                for t in ("blocks", "ports", "trace_edges")
+            }
+        finally:
+            con.close()
+
+    load_xml_to_duckdb(
+        SAMPLE, tmp_path / "typed", column_types=Sparx171.column_types()
+    )
+    con = duckdb.connect(str(tmp_path / "typed" / "model.duckdb"), read_only=True)
+    try:
+        cols = dict(
+            con.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_name = 't_object'"
+            ).fetchall()
+        )
+        odd = con.execute(
+            "SELECT count(*) FROM t_object "
+            "WHERE stereotype_lc <> LOWER(TRIM(Stereotype)) "
+            "OR name_trim <> TRIM(Name) OR ea_uuid IS NULL"
+        ).fetchone()[0]
+    finally:
+        con.close()
+    assert cols["ea_uuid"] == "UUID" and cols["ea_guid"] == "VARCHAR"
+    assert cols["stereotype_lc"] == cols["name_trim"] == "VARCHAR"
+    assert odd == 0
+
+    load_xml_to_duckdb(SAMPLE, tmp_path / "untyped")
+    typed = _helpers(tmp_path / "typed")
+    assert typed["blocks"]
+    assert typed == _helpers(tmp_path / "untyped")
+
+
+def test_helpers_build_on_demand_and_reuse_unchanged_sources(tmp_path):
+    """Only requested helpers are built; unchanged sources reuse them."""
+    from app.ingest.build_ir import build_helpers, create_ir_views
+    from app.ingest.duckdb_utils import tag_source
+
+    load_xml_to_duckdb(SAMPLE, tmp_path)
+    con = duckdb.connect(str(tmp_path / "model.duckdb"))
+    try:
+        create_ir_views(con)
+        first = build_helpers(con, ["blocks", "gen_edges"])
+        irx = {
+            r[0]
+            for r in con.execute(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = 'irx'"
+            ).fetchall()
+        }
+        assert irx == {"_helpers", "blocks", "gen_edges"}
+
+        # Sentinel rows survive as long as the helpers are reused.
+        con.execute("INSERT INTO irx.blocks (block_oid) VALUES (-1)")
+        con.execute("INSERT INTO irx.gen_edges VALUES (-1, -1)")
+        create_ir_views(con)
+        assert build_helpers(con, ["blocks", "gen_edges"]) == first
+        assert con.execute(
+            "SELECT count(*) FROM irx.blocks WHERE block_oid = -1"
+        ).fetchone()[0] == 1
+
+        # Republishing t_object rebuilds blocks; connector helpers stay as built.
+        tag_source(con, "t_object", "VIEW", "republished")
+        assert build_helpers(con, ["blocks", "gen_edges"]) == first
+        sentinels = [
+            con.execute(f"SELECT count(*) FROM irx.{t} WHERE {c} = -1").fetchone()[0]
+            for t, c in (("blocks", "block_oid"), ("gen_edges", "child_oid"))
+        ]
+        assert sentinels == [0, 1]
+        with pytest.raises(ValueError):
+            build_helpers(con, ["no_such_helper"])
+    finally:
+        con.close()
+
+
+def test_helpers_build_concurrently_with_materialized_counts(tmp_path):
+    """Stale helpers build side by side; counts come from the build itself."""
+    from app.ingest.build_ir import HELPER_REGISTRY, build_helpers, create_ir_views
+
+    load_xml_to_duckdb(SAMPLE, tmp_path)
+    con = duckdb.connect(str(tmp_path / "model.duckdb"))
+    try:
+        create_ir_views(con)
+        counts = build_helpers(con, parallel=len(HELPER_REGISTRY))
+        actual = {
+            f"irx.{t}": con.execute(f"SELECT count(*) FROM irx.{t}").fetchone()[0]
+            for t in HELPER_REGISTRY
+        }
+        assert list(counts) == list(actual)
+        assert counts == actual and counts["irx.blocks"] > 0
+        # Tables come from the declared shells, not the query's inferred types.
+        types = dict(
+            con.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = 'irx' AND table_name = 'blocks'"
+            ).fetchall()
+        )
+        assert types["block_oid"] == "BIGINT" and types["block_guid"] == "UUID"
+
+        # Forgetting the catalog makes every helper stale again: the existing
+        # tables are replaced and refilled in the same waves.
+        con.execute("DELETE FROM irx._helpers")
+        assert build_helpers(con, parallel=len(HELPER_REGISTRY)) == counts
+    finally:
+        con.close()
+
+
+def test_closure_helpers_walk_hierarchies():
+    """Closures cover every ancestor once (nearest depth) and stop on cycles."""
+    from app.ingest.build_ir import build_helpers
+
+    con = duckdb.connect()
+    try:
+        con.execute("CREATE SCHEMA ir")
+        con.execute(
+            "CREATE TABLE ir.t_connector AS SELECT * FROM (VALUES "
+            "(1, 1, 2), (2, 2, 3), (3, 4, 2), (4, 4, 5), (5, 5, 3), "
+            "(6, 6, 7), (7, 7, 6)) v(Connector_ID, Start_Object_ID, End_Object_ID)"
+        )
+        con.execute(
+            "ALTER TABLE ir.t_connector ADD COLUMN Connector_Type VARCHAR "
+            "DEFAULT 'Generalization'"
+        )
+        con.execute("ALTER TABLE ir.t_connector ADD COLUMN stereotype_lc VARCHAR")
+        con.execute(
+            "CREATE TABLE ir.t_package AS SELECT * FROM (VALUES "
+            "(1, 0, 'Root'), (2, 1, 'A'), (3, 2, 'B'), (9, 99, 'Orphan'), "
+            "(20, 21, 'Loop'), (21, 20, 'Pool')) "
+            "v(Package_ID, Parent_ID, name_trim)"
+        )
+        con.execute(
+            "CREATE TABLE ir.t_object AS SELECT * FROM (VALUES "
+            "(10, 11), (11, 12), (12, 0), (13, 0), (14, 15), (15, 14)) "
+            "v(Object_ID, ParentID)"
+        )
+        counts = build_helpers(
+            con, ["gen_closure", "package_closure", "containment_closure"]
+        )
+        assert list(counts)[:2] == ["irx.gen_edges", "irx.gen_closure"]
+
+        gen = con.execute("SELECT * FROM irx.gen_closure").fetchall()
+        assert gen == [
+            (1, 2, 1), (1, 3, 2), (2, 3, 1), (4, 2, 1), (4, 3, 2),
+            (4, 5, 1), (5, 3, 1), (6, 7, 1), (7, 6, 1),
+        ]
+        packages = con.execute("SELECT * FROM irx.package_closure").fetchall()
+        assert packages == [
+            (1, 1, 0), (2, 1, 1), (2, 2, 0), (3, 1, 2), (3, 2, 1), (3, 3, 0),
+            (9, 9, 0), (20, 20, 0), (20, 21, 1), (21, 20, 1), (21, 21, 0),
+        ]
+        contained = con.execute("SELECT * FROM irx.containment_closure").fetchall()
+        assert contained == [
+            (10, 11, 1), (10, 12, 2), (11, 12, 1), (14, 15, 1), (15, 14, 1),
+        ]
+        assert counts["irx.gen_closure"] == len(gen)
+    finally:
+        con.close()
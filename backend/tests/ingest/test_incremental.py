@@ -0,0 +1,133 @@
+import logging
+import subprocess
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from app.ingest import incremental, loader_duckdb
+from app.ingest.errors import DuckDBError
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_incremental_ingest_applies_row_delta(tmp_path, monkeypatch, caplog):
+    """A revision applied as a delta matches a full ingest and logs the changes."""
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(incremental, "MODELS_DIR", tmp_path)
+    # Revision: rename the first object, drop the first connector row.
+    xml = SAMPLE.read_text(encoding="utf-8")
+    name = '<Column name="Name" value="'
+    at = xml.index(name, xml.index('<Table name="t_object"')) + len(name)
+    xml = xml[:at] + "Renamed " + xml[at:]
+    row = xml.index("<Row>", xml.index('<Table name="t_connector"'))
+    xml = xml[:row] + xml[xml.index("</Row>", row) + len("</Row>") :]
+    revision = tmp_path / "revision.xml"
+    revision.write_text(xml, encoding="utf-8")
+    opts = {"vendor": "sparx", "version": "17.1", "storage": "table"}
+
+    loader_duckdb.ingest_xml(SAMPLE, model_id="base", **opts)
+    with caplog.at_level(logging.INFO, logger=incremental.log.name):
+        res = incremental.ingest_xml_delta(revision, "base", model_id="rev", **opts)
+    full = loader_duckdb.ingest_xml(revision, model_id="full", **opts)
+
+    assert res["changed_tables"] == ["t_connector", "t_object"]
+    assert res["tables"] == full["tables"]
+    assert "table=t_object status=changed inserted=0 updated=1" in caplog.text
+    assert "table=t_connector status=changed inserted=0 updated=0 deleted=1" in (
+        caplog.text
+    )
+    assert not (tmp_path / "rev" / "changes.json").exists()
+
+    def _rows(model_id):
+        con = duckdb.connect(str(tmp_path / model_id / "model.duckdb"), read_only=True)
+        try:
+            return {
+                t: sorted(con.execute(f"SELECT * FROM {t}").fetchall(), key=str)
+                for t in full["tables"]
+            }
+        finally:
+            con.close()
+
+    assert _rows("rev") == _rows("full")
+
+
+def test_incremental_ingest_sees_base_wal_and_matches_lean_columns(
+    tmp_path, monkeypatch
+):
+    """Uncheckpointed base commits reach the copy; lean deltas keep lean columns."""
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(incremental, "MODELS_DIR", tmp_path)
+    opts = {"vendor": "sparx", "version": "17.1", "storage": "table"}
+    loader_duckdb.ingest_xml(SAMPLE, model_id="base", **opts)
+
+    base_db = tmp_path / "base" / "model.duckdb"
+    con = duckdb.connect(str(base_db))
+    con.execute("PRAGMA disable_checkpoint_on_shutdown")
+    con.execute("CREATE TABLE t_extra AS SELECT 1 AS x")
+    con.close()
+    assert base_db.with_name("model.duckdb.wal").exists()
+
+    res = incremental.ingest_xml_delta(
+        SAMPLE, "base", model_id="rev", columns="lean", extensions="json", **opts
+    )
+    loader_duckdb.ingest_xml(
+        SAMPLE, model_id="full", columns="lean", extensions="json", **opts
+    )
+    assert "t_extra" in res["changed_tables"]
+
+    def _columns(model_id):
+        db = tmp_path / model_id / "model.duckdb"
+        con = duckdb.connect(str(db), read_only=True)
+        try:
+            return con.execute(
+                "SELECT table_name, column_name, data_type "
+                "FROM information_schema.columns ORDER BY ALL"
+            ).fetchall()
+        finally:
+            con.close()
+
+    assert _columns("rev") == _columns("full")
+
+
+def test_view_storage_classifies_tables_by_signature(tmp_path, monkeypatch):
+    """Views are not diffed: store-linked tables are unchanged, others changed."""
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(incremental, "MODELS_DIR", tmp_path)
+    xml = SAMPLE.read_text(encoding="utf-8")
+    at = xml.index('<Column name="Name" value="', xml.index('<Table name="t_object"'))
+    revision = tmp_path / "revision.xml"
+    revision.write_text(xml[:at] + xml[at:].replace('value="', 'value="X', 1))
+    opts = {"vendor": "sparx", "version": "17.1", "storage": "view", "store": True}
+
+    # The columnar sink writes the same store entries as the revision's parse.
+    loader_duckdb.ingest_xml(SAMPLE, model_id="base", output="columnar", **opts)
+    res = incremental.ingest_xml_delta(revision, "base", model_id="rev", **opts)
+    assert res["changed_tables"] == ["t_object"]
+
+
+def test_copy_base_refuses_a_base_open_in_another_process(tmp_path, monkeypatch):
+    """A base held open elsewhere is not copied file by file (it may be mid-write)."""
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path)
+    loader_duckdb.ingest_xml(SAMPLE, model_id="base", storage="table")
+    base_db = tmp_path / "base" / "model.duckdb"
+    holder = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import duckdb, sys; con = duckdb.connect(sys.argv[1]); "
+            "print('ready', flush=True); sys.stdin.read()",
+            str(base_db),
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "ready"
+        with pytest.raises(DuckDBError):
+            incremental.copy_base(base_db, tmp_path / "copy.duckdb")
+        assert not (tmp_path / "copy.duckdb").exists()
+    finally:
+        holder.communicate("")
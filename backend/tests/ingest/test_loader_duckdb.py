@@ -0,0 +1,215 @@
+import gzip
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pytest
+
+from app.ingest import parquet_store
+from app.ingest.column_manifest import COLD_DIR, ingest_manifest
+from app.ingest.duckdb_utils import copy_arrow_to_parquet
+from app.ingest.loader_duckdb import compute_model_id, load_xml_to_duckdb
+from app.ingest.parquet_layout import ParquetLayout, layouts_from_spec
+from app.input_adapters.sparx.v17_1.adapter import Sparx171
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_load_xml_to_duckdb_engines_agree(tmp_path):
+    """Both engines produce identical per-table row counts."""
+    two = load_xml_to_duckdb(SAMPLE, tmp_path / "two", engine="two_pass")
+    one = load_xml_to_duckdb(SAMPLE, tmp_path / "one", engine="one_pass")
+
+    assert two == one
+    assert two["t_object"] > 0
+
+
+def test_columnar_output_matches_jsonl(tmp_path):
+    """Arrow→Parquet output loads the same tables and rows as the JSONL path."""
+    jsonl = load_xml_to_duckdb(SAMPLE, tmp_path / "jsonl", output="jsonl")
+    columnar = load_xml_to_duckdb(SAMPLE, tmp_path / "col", output="columnar")
+
+    assert columnar == jsonl
+    assert not (tmp_path / "col" / "jsonl").exists()
+
+
+def test_table_storage_materializes_native_tables(tmp_path):
+    """Table storage loads t_* into model.duckdb and can replace earlier views."""
+    model_dir = tmp_path / "m"
+    views = load_xml_to_duckdb(SAMPLE, model_dir, output="columnar", storage="view")
+    tables = load_xml_to_duckdb(SAMPLE, model_dir, output="columnar", storage="table")
+
+    con = duckdb.connect(str(model_dir / "model.duckdb"), read_only=True)
+    try:
+        kinds = dict(
+            con.execute(
+                "SELECT table_name, table_type FROM information_schema.tables "
+                "WHERE table_schema = 'main'"
+            ).fetchall()
+        )
+        rows = con.execute("SELECT COUNT(*) FROM t_object").fetchone()[0]
+    finally:
+        con.close()
+
+    assert tables == views
+    assert set(kinds) == set(tables)
+    assert set(kinds.values()) == {"BASE TABLE"}
+    assert rows == tables["t_object"]
+
+
+def test_adapter_column_types_applied(tmp_path):
+    """Sparx 17.1 types IDs, GUIDs and flags identically in both output modes."""
+    types = Sparx171.column_types()
+    for output in ("jsonl", "columnar"):
+        model_dir = tmp_path / output
+        load_xml_to_duckdb(SAMPLE, model_dir, output=output, column_types=types)
+        con = duckdb.connect(str(model_dir / "model.duckdb"), read_only=True)
+        try:
+            cols = dict(
+                con.execute(
+                    "SELECT column_name, data_type FROM information_schema.columns "
+                    "WHERE table_name = 't_object'"
+                ).fetchall()
+            )
+            guid = con.execute("SELECT ea_guid FROM t_object LIMIT 1").fetchone()[0]
+        finally:
+            con.close()
+
+        assert cols["Object_ID"] == "BIGINT"
+        assert cols["ParentID"] == "BIGINT"
+        assert cols["IsRoot"] == "BOOLEAN"
+        assert cols["CreatedDate"] == "TIMESTAMP"
+        assert guid == guid.upper() and "{" not in guid
+
+
+def test_adapter_layouts_sort_rows_and_cut_row_groups(tmp_path):
+    """Tables are written sorted by their lookup keys, in the declared row groups."""
+    types = Sparx171.column_types()
+    layouts = layouts_from_spec(Sparx171.layouts())
+    for output in ("jsonl", "columnar"):
+        model_dir = tmp_path / output
+        load_xml_to_duckdb(
+            SAMPLE, model_dir, output=output, column_types=types, layouts=layouts
+        )
+        con = duckdb.connect()
+        try:
+            pq = (model_dir / "parquet" / "t_connector.parquet").as_posix()
+            keys = con.execute(
+                f"SELECT Start_Object_ID, End_Object_ID FROM read_parquet('{pq}')"
+            ).fetchall()
+            pq = (model_dir / "parquet" / "t_package.parquet").as_posix()
+            ids = con.execute(f"SELECT Package_ID FROM read_parquet('{pq}')").fetchall()
+        finally:
+            con.close()
+        assert keys == sorted(keys) and len(keys) > 1
+        assert ids == sorted(ids)
+
+    # Row groups follow the layout, each with its own min/max statistics.
+    layout = ParquetLayout(sort_by=("id",), row_group_size=2048)
+    data = pa.table({"id": pa.array(range(5000, 0, -1), type=pa.int64())})
+    con = duckdb.connect()
+    try:
+        pq = (tmp_path / "ids.parquet").as_posix()
+        assert copy_arrow_to_parquet(con, data, pq, layout=layout) == 5000
+        groups = con.execute(
+            "SELECT row_group_num_rows, stats_min_value, stats_max_value "
+            f"FROM parquet_metadata('{pq}') ORDER BY row_group_id"
+        ).fetchall()
+    finally:
+        con.close()
+    assert groups == [
+        (2048, "1", "2048"),
+        (2048, "2049", "4096"),
+        (904, "4097", "5000"),
+    ]
+
+    # The default layout keeps the store keys written before layouts existed.
+    assert ParquetLayout().signature(["id"]) == ""
+    assert parquet_store.store_key("d", "*", layout.signature(["id"])) != (
+        parquet_store.store_key("d", "*")
+    )
+
+
+def test_gzip_export_ingests_like_plain_xml(tmp_path):
+    """A .xml.gz export streams through every engine with the plain-XML model id."""
+    packed = tmp_path / "Car_System.xml.gz"
+    packed.write_bytes(gzip.compress(SAMPLE.read_bytes()))
+
+    plain = load_xml_to_duckdb(SAMPLE, tmp_path / "plain")
+    for engine in ("two_pass", "fast", "parallel"):
+        assert load_xml_to_duckdb(packed, tmp_path / engine, engine=engine) == plain
+    assert compute_model_id(packed) == compute_model_id(SAMPLE)
+
+
+def test_lean_ingest_keeps_manifest_columns(tmp_path):
+    """Lean models keep only manifest columns; predicates and helpers agree."""
+    from app.criteria.mml_2 import predicate_block_has_port
+    from app.ingest.build_ir import build_helpers, create_ir_views
+
+    manifest = ingest_manifest(Sparx171.primary_keys())
+    assert {"object_id", "stereotype", "pdata1"} <= manifest["t_object"]
+    assert manifest["t_xref"] == {"ea_guid", "xrefid"}
+
+    full = load_xml_to_duckdb(SAMPLE, tmp_path / "full")
+    for engine in ("two_pass", "fast", "parallel"):
+        lean = load_xml_to_duckdb(
+            SAMPLE, tmp_path / engine, engine=engine, keep_columns=manifest
+        )
+        assert lean == full
+    cold = load_xml_to_duckdb(
+        SAMPLE, tmp_path / "cold", engine="fast", keep_columns=manifest, cold=True
+    )
+    assert cold == full
+
+    def _probe(model):
+        con = duckdb.connect(str(tmp_path / model / "model.duckdb"))
+        try:
+            info = con.execute("PRAGMA table_info(t_object)").fetchall()
+            cols = {r[1].lower() for r in info}
+            create_ir_views(con)
+            helpers = build_helpers(con)
+            return cols, helpers, predicate_block_has_port._core(con, None)["counts"]
+        finally:
+            con.close()
+
+    full_cols, *full_results = _probe("full")
+    for model in ("fast", "cold"):
+        cols, *results = _probe(model)
+        assert cols <= manifest["t_object"] and cols < full_cols
+        assert results == full_results
+    cold_pq = tmp_path / "cold/parquet" / COLD_DIR / "t_object.parquet"
+    con = duckdb.connect()
+    desc = con.execute(f"SELECT * FROM '{cold_pq.as_posix()}' LIMIT 0").description
+    assert {d[0].lower() for d in desc} == full_cols
+
+
+@pytest.mark.parametrize("mode", ["map", "json"])
+def test_packed_extensions_match_extension_columns(tmp_path, mode):
+    """Packed extension modes hold the same attributes as Extension_* columns."""
+    wide = load_xml_to_duckdb(SAMPLE, tmp_path / "wide", engine="fast")
+    sql = {
+        "map": "SELECT Connector_ID, extensions['Start_Object_ID'] FROM t_connector",
+        "json": "SELECT Connector_ID, extensions->>'Start_Object_ID' FROM t_connector",
+    }[mode]
+
+    def _query(model, query):
+        con = duckdb.connect(str(tmp_path / model / "model.duckdb"))
+        try:
+            info = con.execute("PRAGMA table_info(t_connector)").fetchall()
+            cols = {r[1] for r in info}
+            return cols, sorted(con.execute(query).fetchall(), key=str)
+        finally:
+            con.close()
+
+    wide_cols, expected = _query(
+        "wide", "SELECT Connector_ID, Extension_Start_Object_ID FROM t_connector"
+    )
+    for engine in ("two_pass", "fast", "parallel"):
+        counts = load_xml_to_duckdb(
+            SAMPLE, tmp_path / engine, engine=engine, extensions=mode
+        )
+        assert counts == wide
+        cols, rows = _query(engine, sql)
+        assert "extensions" in cols
+        assert not any(c.startswith("Extension_") for c in cols)
+        assert rows == expected
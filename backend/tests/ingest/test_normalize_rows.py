@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from app.ingest.normalize_rows import (
+    normalized_rows,
+    normalized_rows_fast,
+    normalized_rows_one_pass,
+)
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_one_pass_matches_two_pass_rows():
+    """The one-pass engine yields the same rows and schema as the two-pass engine."""
+    schema_2, rows_2 = normalized_rows(SAMPLE)
+    rows_2 = list(rows_2)
+    schema_1, rows_1 = normalized_rows_one_pass(SAMPLE)
+    rows_1 = list(rows_1)
+
+    assert schema_1 == schema_2
+    assert rows_1 == rows_2
+
+
+def test_fast_engine_matches_one_pass_rows():
+    """The tag-filtered fast engine yields the same rows and schema as one-pass."""
+    schema_1, rows_1 = normalized_rows_one_pass(SAMPLE)
+    rows_1 = list(rows_1)
+    schema_f, rows_f = normalized_rows_fast(SAMPLE)
+    rows_f = list(rows_f)
+
+    assert schema_f == schema_1
+    assert rows_f == rows_1
@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import duckdb
+
+from app.ingest.loader_duckdb import load_xml_to_duckdb
+from app.input_adapters.sparx.v17_1.adapter import Sparx171
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_parallel_engine_matches_one_pass(tmp_path):
+    """Byte-range parsing in worker processes loads the same rows and types."""
+    types = Sparx171.column_types()
+    one = load_xml_to_duckdb(
+        SAMPLE,
+        tmp_path / "one",
+        engine="one_pass",
+        output="columnar",
+        column_types=types,
+    )
+    par = load_xml_to_duckdb(
+        SAMPLE, tmp_path / "par", engine="parallel", workers=2, column_types=types
+    )
+    assert par == one
+
+    def _snapshot(model_dir):
+        con = duckdb.connect(str(model_dir / "model.duckdb"), read_only=True)
+        try:
+            cols = con.execute(
+                "SELECT table_name, column_name, data_type "
+                "FROM information_schema.columns ORDER BY ALL"
+            ).fetchall()
+            objects = con.execute("SELECT * FROM t_object ORDER BY 1").fetchall()
+        finally:
+            con.close()
+        return cols, objects
+
+    assert _snapshot(tmp_path / "par") == _snapshot(tmp_path / "one")
+
+
+def test_parallel_prescan_uses_config_and_prefixed_root(tmp_path):
+    """The prescan honours the workers' SchemaConfig and `prefix:Root` names."""
+    from app.ingest.parallel_parse import parse_parallel
+    from app.ingest.schema_config import SchemaConfig
+    from app.ingest.table_index import scan_table_ranges
+
+    text = SAMPLE.read_text(encoding="cp1252")
+    text = text.replace('<Package name="Data"', '<xmi:XMI xmlns:xmi="urn:x" n="Data"')
+    text = text.replace("</Package>", "</xmi:XMI>")
+    text = text.replace('<Table name="', '<Tbl key="').replace("</Table>", "</Tbl>")
+    xml = tmp_path / "prefixed.xml"
+    xml.write_text(text, encoding="cp1252")
+    config = SchemaConfig(table_tag="Tbl", table_name_attr="key")
+
+    index = scan_table_ranges(xml, config)
+    assert index.epilog == b"</xmi:XMI>"
+    written, _schema = parse_parallel(xml, tmp_path / "pq", workers=2, config=config)
+    expected = load_xml_to_duckdb(SAMPLE, tmp_path / "plain")
+    assert {t: rows for t, (_p, rows) in written.items() if rows} == expected
+
+
+def test_parallel_engine_matches_fast_row_for_row(tmp_path):
+    """Every table the parallel engine loads holds the fast engine's rows."""
+    # Same sink on both sides: the JSONL sink infers types the columnar one keeps.
+    fast = load_xml_to_duckdb(
+        SAMPLE, tmp_path / "fast", engine="fast", output="columnar"
+    )
+    par = load_xml_to_duckdb(SAMPLE, tmp_path / "par", engine="parallel", workers=3)
+    assert par == fast
+
+    def _rows(model_dir):
+        con = duckdb.connect(str(model_dir / "model.duckdb"), read_only=True)
+        try:
+            return {
+                t: sorted(con.execute(f"SELECT * FROM {t}").fetchall(), key=str)
+                for t in fast
+            }
+        finally:
+            con.close()
+
+    assert _rows(tmp_path / "par") == _rows(tmp_path / "fast")
+
+
+def test_workers_decode_with_the_prolog_encoding_and_merge_repeated_tables(
+    tmp_path,
+):
+    """Each worker's document keeps the windows-1252 declaration of the export."""
+    from app.ingest.parallel_parse import parse_parallel
+
+    def _table(name, *values):
+        rows = "".join(
+            f'<Row><Column name="Name" value="{v}"/></Row>' for v in values
+        )
+        return f'<Table name="{name}">{rows}</Table>'
+
+    text = (
+        '<?xml version="1.0" encoding="windows-1252"?>\n<Package name="Data">'
+        + _table("t_object", "Café €")
+        + _table("t_package", "Größe")
+        + _table("t_object", "Naïve")
+        + "</Package>"
+    )
+    xml = tmp_path / "cp1252.xml"
+    xml.write_bytes(text.encode("cp1252"))
+
+    written, _schema = parse_parallel(xml, tmp_path / "pq", workers=2)
+    assert {t: rows for t, (_p, rows) in written.items()} == {
+        "t_object": 2,
+        "t_package": 1,
+    }
+    con = duckdb.connect()
+    try:
+
+        def _names(table):
+            pq = written[table][0].as_posix()
+            sql = f"SELECT Name FROM read_parquet('{pq}') ORDER BY Name"
+            return [r[0] for r in con.execute(sql).fetchall()]
+
+        assert _names("t_object") == ["Café €", "Naïve"]
+        assert _names("t_package") == ["Größe"]
+    finally:
+        con.close()
@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+
+from app.core import paths
+from app.ingest import parquet_store
+from app.ingest.duckdb_utils import copy_arrow_to_parquet
+from app.ingest.loader_duckdb import load_xml_to_duckdb
+from app.input_adapters.sparx.v17_1.adapter import Sparx171
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_parquet_store_shares_identical_tables(tmp_path):
+    """A re-ingest links every table to the stored files instead of rewriting."""
+    types = Sparx171.column_types()
+    for output in ("jsonl", "columnar"):
+        first = load_xml_to_duckdb(
+            SAMPLE, tmp_path / f"{output}-a", output=output, column_types=types
+        )
+        stored = sorted(paths.PARQUET_STORE_DIR.glob("*/*.parquet"))
+        second = load_xml_to_duckdb(
+            SAMPLE, tmp_path / f"{output}-b", output=output, column_types=types
+        )
+
+        assert second == first
+        assert sorted(paths.PARQUET_STORE_DIR.glob("*/*.parquet")) == stored
+        for table in first:
+            a = tmp_path / f"{output}-a" / "parquet" / f"{table}.parquet"
+            b = tmp_path / f"{output}-b" / "parquet" / f"{table}.parquet"
+            assert a.stat().st_ino == b.stat().st_ino
+
+    # Nothing is pruned while models still link to the entries.
+    assert parquet_store.prune() == 0
+
+
+def test_parquet_store_prune_is_safe_next_to_ingests(tmp_path, monkeypatch, capsys):
+    """Entries are published already linked; prune takes only orphans."""
+    real_link = parquet_store._link
+
+    def _link_racing_prune(src, dst):
+        parquet_store.prune()  # a concurrent maintenance run
+        real_link(src, dst)
+
+    monkeypatch.setattr(parquet_store, "_link", _link_racing_prune)
+
+    def _write(path):
+        copy_arrow_to_parquet(duckdb.connect(), pa.table({"x": [1, 2, 3]}), path)
+        return 3
+
+    dst = tmp_path / "model" / "t_x.parquet"
+    assert parquet_store.materialize("ab" * 32, dst, _write) == (3, False)
+    entry = parquet_store.store_path("ab" * 32)
+    assert entry.stat().st_nlink == 2
+    assert parquet_store.materialize("ab" * 32, dst, _write) == (3, True)
+
+    dst.unlink()  # the only model linking the entry is gone
+    monkeypatch.setattr(sys, "argv", ["parquet-store", "prune"])
+    parquet_store.main()
+    assert "removed 1 " in capsys.readouterr().out
+    assert parquet_store.link_cached("ab" * 32, dst) is None
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+from app.ingest.table_index import TableIndex, TableRange, scan_table_ranges
+
+
+def test_partition_balances_bytes_and_keeps_tables_together():
+    """Bins get similar byte loads; a table's ranges never split across bins."""
+    ranges = [
+        TableRange("t_big", 0, 900),
+        TableRange("t_a", 900, 1200),
+        TableRange("t_b", 1200, 1500),
+        TableRange("t_a", 1500, 1800),
+        TableRange("t_c", 1800, 2100),
+    ]
+    index = TableIndex(Path("x.xml"), b"<R>", b"</R>", ranges)
+
+    bins = index.partition(2)
+    # Largest first, each group into the lightest bin: t_big, t_a, t_b, t_c.
+    assert [[r.name for r in b] for b in bins] == [
+        ["t_big", "t_c"],
+        ["t_a", "t_b", "t_a"],
+    ]
+    loads = [sum(r.size for r in b) for b in bins]
+    assert loads == [1200, 900]
+    for b in bins:
+        assert [r.start for r in b] == sorted(r.start for r in b)
+
+    assert len(index.partition(10)) == len(index.groups()) == 4
+    assert index.partition(0) == [sorted(ranges, key=lambda r: r.start)]
+
+
+def test_scan_handles_prefixed_root_self_closing_and_repeated_tables(tmp_path):
+    """Ranges cover `<Table/>` and repeated blocks; the prolog keeps the root."""
+    decl = b'<?xml version="1.0" encoding="windows-1252"?>'
+    blocks = [
+        b'<Table name="t_a"><Row><Column name="id" value="1"/></Row></Table>',
+        b'<Table name="t_empty"/>',
+        b"<Table name='t_a'><Row><Column name=\"id\" value=\"2\"/></Row></Table >",
+    ]
+    root = b'<xmi:XMI xmlns:xmi="urn:x">'
+    xml = tmp_path / "tables.xml"
+    xml.write_bytes(decl + b"\n" + root + b"\n" + b"\n".join(blocks) + b"\n</xmi:XMI>")
+
+    index = scan_table_ranges(xml)
+    assert index.prolog == decl + b"\n" + root
+    assert index.epilog == b"</xmi:XMI>"
+    assert [r.name for r in index.ranges] == ["t_a", "t_empty", "t_a"]
+    data = xml.read_bytes()
+    assert [data[r.start : r.end] for r in index.ranges] == blocks
+    assert [len(g) for g in index.groups().values()] == [2, 1]
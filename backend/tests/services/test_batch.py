@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from app.core import paths
+from app.ingest import loader_duckdb
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_batch_dedupes_isolates_failures_and_skips_reruns(tmp_path, monkeypatch):
+    """A batch runs each distinct export once and reports every file."""
+    import json
+
+    from app.services import batch
+
+    monkeypatch.setattr(paths, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path / "data" / "models")
+    monkeypatch.setattr(paths, "JOBS_DB", tmp_path / "data" / "jobs.sqlite")
+    monkeypatch.setattr(loader_duckdb, "MODELS_DIR", tmp_path / "data" / "models")
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    (exports / "a.xml").write_bytes(SAMPLE.read_bytes())
+    (exports / "b.xml").write_bytes(SAMPLE.read_bytes())
+    (exports / "broken.xml").write_text("<Package><Table name=", encoding="utf-8")
+
+    report = batch.run_batch(exports, vendor="sparx", version="17.1", workers=2)
+    by_name = {Path(m["xml"]).name: m for m in report["models"]}
+    assert report["totals"] == {"succeeded": 1, "duplicate": 1, "failed": 1}
+    assert by_name["a.xml"]["status"] == "succeeded"
+    assert by_name["b.xml"]["duplicate_of"] == by_name["a.xml"]["xml"]
+    assert by_name["broken.xml"]["message"]
+    model_dir = paths.MODELS_DIR / by_name["a.xml"]["model_id"]
+    assert (model_dir / "summary.json").exists()
+    written = json.loads(Path(report["report_path"]).read_text(encoding="utf-8"))
+    assert written["totals"] == report["totals"]
+
+    # Content that already succeeded is skipped; the broken export is retried.
+    again = batch.run_batch(exports, vendor="sparx", version="17.1", workers=2)
+    assert again["totals"] == {"skipped": 1, "duplicate": 1, "failed": 1}
+
+
+def test_batch_passes_the_executor_to_every_job(tmp_path, monkeypatch):
+    """`--batch --executor` reaches each job's pipeline run; unknown ones fail early."""
+    import pytest
+
+    from app.core.jobs_db import ensure_initialized
+    from app.services import batch
+
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path / "models")
+    monkeypatch.setattr(paths, "JOBS_DB", tmp_path / "jobs.sqlite")
+    ensure_initialized()
+    calls = []
+    monkeypatch.setattr(
+        batch, "run_pipeline_job", lambda job_id, mid, **kw: calls.append(kw)
+    )
+
+    batch._process(str(SAMPLE), "ab" * 32, "sparx", "17.1", "subprocess")
+    assert calls == [{"executor": "subprocess"}]
+
+    with pytest.raises(ValueError, match="executor"):
+        batch.run_batch(tmp_path, vendor="sparx", version="17.1", executor="thread")
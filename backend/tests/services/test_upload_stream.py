@@ -0,0 +1,168 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import zipfile
+from pathlib import Path
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import analyze
+from app.core import paths
+from app.main import app
+from app.services import jobs as jobs_service
+from app.services import upload_stream
+
+SAMPLE = Path(__file__).resolve().parents[2] / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_stream_upload_ingests_while_receiving(tmp_path, monkeypatch):
+    """Raw-body upload hashes, persists and publishes t_* before the job runs."""
+    jobs = []
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(paths, "PARQUET_STORE_DIR", tmp_path / ".store")
+    monkeypatch.setattr(analyze, "find_succeeded_by_sha", lambda *a: None)
+    monkeypatch.setattr(analyze, "create_job", lambda sha, mid, v, r: f"job-{mid}")
+    monkeypatch.setattr(jobs_service, "get_job", lambda job_id: None)
+    monkeypatch.setattr(
+        analyze, "run_pipeline_job", lambda job_id, mid, **kw: jobs.append(kw)
+    )
+
+    def _body():
+        data = SAMPLE.read_bytes()
+        for i in range(0, len(data), 4096):
+            yield data[i : i + 4096]
+
+    client = TestClient(app)
+    res = client.post(
+        "/v1/analyze/upload/stream",
+        params={"vendor": "sparx", "version": "17.1"},
+        content=_body(),
+    )
+
+    assert res.status_code == 202
+    mid = res.json()["model_id"]
+    model_dir = tmp_path / mid
+    assert (model_dir / "model.xml").read_bytes() == SAMPLE.read_bytes()
+    assert jobs == [{"ingested": True}]
+    con = duckdb.connect(str(model_dir / "model.duckdb"), read_only=True)
+    try:
+        assert con.execute("SELECT COUNT(*) FROM t_object").fetchone()[0] > 0
+    finally:
+        con.close()
+    assert not any((tmp_path / ".incoming").iterdir())
+
+
+def _zipped(data: bytes) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("Car_System.xml", data)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize(
+    ("pack", "stored"),
+    [(gzip.compress, "model.xml.gz"), (_zipped, "model.zip")],
+)
+def test_compressed_upload_keeps_xml_model_id(tmp_path, monkeypatch, pack, stored):
+    """Compressed uploads are stored as sent, parsed, and hashed as plain XML."""
+    jobs = []
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(paths, "PARQUET_STORE_DIR", tmp_path / ".store")
+    monkeypatch.setattr(analyze, "find_succeeded_by_sha", lambda *a: None)
+    monkeypatch.setattr(analyze, "create_job", lambda sha, mid, v, r: f"job-{mid}")
+    monkeypatch.setattr(jobs_service, "get_job", lambda job_id: None)
+    monkeypatch.setattr(
+        analyze, "run_pipeline_job", lambda job_id, mid, **kw: jobs.append(kw)
+    )
+    xml = SAMPLE.read_bytes()
+    body = pack(xml)
+
+    client = TestClient(app)
+    res = client.post(
+        "/v1/analyze/upload/stream",
+        params={"vendor": "sparx", "version": "17.1"},
+        content=[body[i : i + 1024] for i in range(0, len(body), 1024)],
+    )
+
+    assert res.status_code == 202
+    mid = res.json()["model_id"]
+    assert mid == hashlib.sha256(xml).hexdigest()[:8]
+    assert (tmp_path / mid / stored).read_bytes() == body
+    assert paths.xml_path(mid) == (tmp_path / mid / stored).resolve()
+    assert jobs == [{"ingested": True}]
+
+
+def test_stream_upload_inflates_off_the_event_loop(tmp_path, monkeypatch):
+    """Chunk writes and inflation run in the threadpool, not on the event loop."""
+    on_loop = []
+
+    class _Inflater(upload_stream.Inflater):
+        def feed(self, data: bytes) -> bytes:
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return super().feed(data)
+
+    monkeypatch.setattr(upload_stream, "Inflater", _Inflater)
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(analyze, "find_succeeded_by_sha", lambda *a: None)
+    monkeypatch.setattr(analyze, "create_job", lambda sha, mid, v, r: f"job-{mid}")
+    monkeypatch.setattr(jobs_service, "get_job", lambda job_id: None)
+    monkeypatch.setattr(analyze, "run_pipeline_job", lambda job_id, mid, **kw: None)
+    body = gzip.compress(SAMPLE.read_bytes())
+
+    client = TestClient(app)
+    res = client.post(
+        "/v1/analyze/upload/stream",
+        params={"vendor": "sparx", "version": "17.1"},
+        content=[body[i : i + 1024] for i in range(0, len(body), 1024)],
+    )
+
+    assert res.status_code == 202
+    assert on_loop and not any(on_loop)
+
+
+def test_reupload_under_same_model_id_reruns_ir_and_predicates(tmp_path, monkeypatch):
+    """New tables published by a re-upload are never scored with old evidence."""
+    from app.core import orchestrator
+
+    runs = []
+    monkeypatch.setattr(paths, "MODELS_DIR", tmp_path)
+    monkeypatch.setattr(analyze, "find_succeeded_by_sha", lambda *a: None)
+    monkeypatch.setattr(analyze, "create_job", lambda sha, mid, v, r: f"job-{mid}")
+    monkeypatch.setattr(jobs_service, "get_job", lambda job_id: None)
+
+    def _pipeline(job_id, mid, *, ingested=False):
+        # What run_pipeline_job does after a streamed ingest.
+        assert ingested
+        runs.append(
+            orchestrator.run(
+                model_id=mid, xml_path=None, build_rag=False, executor="inprocess"
+            )
+        )
+
+    monkeypatch.setattr(analyze, "run_pipeline_job", _pipeline)
+    # First version went through the full pipeline, so every stage is recorded.
+    orchestrator.run(
+        model_id="same", xml_path=SAMPLE, build_rag=False, executor="inprocess"
+    )
+    revised = SAMPLE.read_bytes().replace(b'value="Car"', b'value="Truck"', 1)
+    res = TestClient(app).post(
+        "/v1/analyze/upload/stream",
+        params={"vendor": "sparx", "version": "17.1", "model_id": "same"},
+        content=revised,
+    )
+
+    assert res.status_code == 202
+    assert [list(r.timings) for r in runs] == [["ir", "predicates"]]
+    con = duckdb.connect(str(tmp_path / "same" / "model.duckdb"), read_only=True)
+    try:
+        names = {r[0] for r in con.execute("SELECT Name FROM t_object").fetchall()}
+    finally:
+        con.close()
+    assert "Truck" in names and "Car" not in names
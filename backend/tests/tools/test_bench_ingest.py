@@ -0,0 +1,39 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[2]
+SAMPLE = BACKEND / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_bench_ingest_reports_every_stage_and_compares(tmp_path):
+    """tools/bench_ingest.py: one run on the sample writes a comparable report."""
+    report = tmp_path / "bench.json"
+    res = subprocess.run(
+        [
+            sys.executable,
+            "tools/bench_ingest.py",
+            "--xml",
+            str(SAMPLE),
+            "--repeat",
+            "1",
+            "--out",
+            str(report),
+            "--compare",
+            str(report),
+        ],
+        cwd=BACKEND,
+        env={**os.environ, "PYTHONPATH": str(BACKEND)},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert res.returncode == 0, res.stderr
+
+    (run,) = json.loads(report.read_text(encoding="utf-8"))["runs"]
+    assert run["rows"] > 0 and run["helper_rows"] > 0
+    assert {"stream", "parquet_copy", "views", "ir_helpers"} <= set(run["stages"])
+    # Compared against itself: every stage at ratio 1.
+    assert "x 1.00" in res.stdout and "REGRESSION" not in res.stdout
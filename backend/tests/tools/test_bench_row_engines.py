@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.ingest.normalize_rows import ENGINES
+
+BACKEND = Path(__file__).resolve().parents[2]
+SAMPLE = BACKEND / "samples/sparx/v17_1/Car_System.xml"
+
+
+def test_bench_row_engines_times_every_engine_once(tmp_path):
+    """tools/bench_row_engines.py: each engine parses the sample to the same rows."""
+    res = subprocess.run(
+        [
+            sys.executable,
+            "tools/bench_row_engines.py",
+            "--xml",
+            str(SAMPLE),
+            "--repeat",
+            "1",
+            "--json",
+        ],
+        cwd=BACKEND,
+        env={**os.environ, "PYTHONPATH": str(BACKEND)},
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert res.returncode == 0, res.stderr
+
+    results = json.loads(res.stdout)["results"]
+    assert [r["engine"] for r in results] == sorted(ENGINES)
+    assert len({r["rows"] for r in results}) == 1 and results[0]["rows"] > 0
+    assert all(r["events"] > 0 and r["seconds"] > 0 for r in results)
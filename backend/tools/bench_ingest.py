@@ -0,0 +1,361 @@
+# ------------------------------------------------------------
+# Module: tools/bench_ingest.py
+# Purpose: Benchmark ingest_xml → build_ir per stage; JSON results for diffs.
+# ------------------------------------------------------------
+
+"""Run `ingest_xml` then `build_ir.build_ir` and report every stage.
+
+Each input (sample exports via `--xml`, synthetic models via `--scale`, see
+`tools/gen_sparx_model.py`) is ingested into a throwaway data directory while
+`log_timer` spans are recorded (`app.utils.timing.record_timers`) and a
+sampler thread tracks the resident set size. Spans are folded into stages:
+
+    discover      discover-columns (two-pass engine only)
+    stream        stream-rows* / parse-parallel (the row engine)
+    jsonl_write   write-jsonl
+    parquet_copy  convert-parquet / write-parquet-columnar / parse-parallel
+    views         publish-tables (views or native tables)
+    analyze       analyze (loader)
+    ir_views      ir-views
+    ir_helpers    ir-helpers
+    ir_analyze    ir-analyze
+
+For every stage: wall seconds, rows/s (ingested rows; helper rows for
+`ir_helpers`), MB/s of input XML, and peak RSS while the stage ran. Every
+registered helper is built (the pipeline builds only those predicates declare).
+
+Notes
+-----
+- Row engines are lazy: rows are parsed while the sink pulls them, so
+  `stream` overlaps `jsonl_write` / `parquet_copy`. Parse-only throughput is
+  what `tools/bench_row_engines.py` measures.
+- RSS comes from `/proc/self/statm`; where it is unavailable only the
+  process peak (`ru_maxrss`) is reported. Worker processes of the parallel
+  engine are not included.
+- `--compare base.json` prints per-stage ratios against an earlier run and
+  exits 1 when a stage got slower than `--tolerance` allows.
+
+Usage
+-----
+    PYTHONPATH=. python tools/bench_ingest.py --xml samples/sparx/v17_1/Car_System.xml
+    PYTHONPATH=. python tools/bench_ingest.py --scale 10 100 --out bench.json
+    PYTHONPATH=. python tools/bench_ingest.py --scale 10 --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from app.core import paths
+from app.core.config import settings
+from app.ingest import build_ir, loader_duckdb
+from app.utils.timing import record_timers
+
+# (stage, timer labels) in pipeline order.
+STAGES = (
+    ("discover", ("discover-columns",)),
+    (
+        "stream",
+        ("stream-rows", "stream-rows-one-pass", "stream-rows-fast", "parse-parallel"),
+    ),
+    ("jsonl_write", ("write-jsonl",)),
+    ("parquet_copy", ("convert-parquet", "write-parquet-columnar", "parse-parallel")),
+    ("views", ("publish-tables",)),
+    ("analyze", ("analyze",)),
+    ("ir_views", ("ir-views",)),
+    ("ir_helpers", ("ir-helpers",)),
+    ("ir_analyze", ("ir-analyze",)),
+)
+SAMPLE_SECONDS = 0.005
+_MB = 1024 * 1024
+
+
+class RssSampler:
+    """Background thread sampling this process's RSS as `(time, bytes)` pairs."""
+
+    def __init__(self, interval: float = SAMPLE_SECONDS):
+        self.interval = interval
+        self.samples: list[tuple[float, int]] = []
+        self._page = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss", daemon=True)
+        self.available = Path("/proc/self/statm").exists()
+
+    def _rss(self) -> int:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * self._page
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.samples.append((time.perf_counter(), self._rss()))
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> RssSampler:
+        if self.available:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        if self.available:
+            self._thread.join()
+
+    def peak(self, start: float, end: float) -> int | None:
+        """Highest RSS sampled in `[start, end]` (None without samples).
+
+        A span shorter than the interval gets the last sample before it.
+        """
+        window = [b for t, b in self.samples if start <= t <= end]
+        if not window:
+            window = [b for t, b in self.samples if t < start][-1:]
+        return max(window) if window else None
+
+
+@contextmanager
+def _scratch_data_dir() -> Iterator[Path]:
+    """Point model and Parquet-store paths at a temp dir for one run."""
+    root = Path(tempfile.mkdtemp(prefix="bench-ingest-"))
+    saved = (loader_duckdb.MODELS_DIR, paths.PARQUET_STORE_DIR)
+    loader_duckdb.MODELS_DIR = root / "models"
+    paths.PARQUET_STORE_DIR = root / "parquet_store"
+    try:
+        yield root
+    finally:
+        loader_duckdb.MODELS_DIR, paths.PARQUET_STORE_DIR = saved
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _helper_rows(db_path: Path) -> int:
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        return sum(
+            con.execute(f'SELECT COUNT(*) FROM irx."{t}"').fetchone()[0]
+            for t in build_ir.HELPER_REGISTRY
+        )
+    finally:
+        con.close()
+
+
+def _rate(amount: float, seconds: float) -> float | None:
+    return round(amount / seconds, 1) if seconds > 0 else None
+
+
+def bench_one(xml: Path, ingest_args: dict[str, Any]) -> dict[str, Any]:
+    """Ingest and build IR for `xml` once; return totals and per-stage metrics."""
+    xml_mb = xml.stat().st_size / _MB
+    with _scratch_data_dir(), RssSampler() as rss, record_timers() as spans:
+        t0 = time.perf_counter()
+        result = loader_duckdb.ingest_xml(xml, model_id="bench", **ingest_args)
+        t1 = time.perf_counter()
+        db_path = build_ir.build_ir(
+            Path(result["duckdb_path"]).parent, helpers=build_ir.HELPER_REGISTRY
+        )
+        t2 = time.perf_counter()
+        helper_rows = _helper_rows(db_path)
+
+    rows = sum(result["tables"].values())
+    stages: dict[str, Any] = {}
+    for stage, labels in STAGES:
+        hits = [s for s in spans if s["label"] in labels]
+        if not hits:
+            continue
+        seconds = sum(s["seconds"] for s in hits)
+        peaks = [p for s in hits if (p := rss.peak(s["start"], s["end"])) is not None]
+        stage_rows = helper_rows if stage == "ir_helpers" else rows
+        stages[stage] = {
+            "seconds": round(seconds, 4),
+            "rows_per_s": _rate(stage_rows, seconds),
+            "mb_per_s": _rate(xml_mb, seconds),
+            "peak_rss_mb": round(max(peaks) / _MB, 1) if peaks else None,
+        }
+    overall = rss.peak(t0, t2)
+    return {
+        "xml": str(xml),
+        "xml_mb": round(xml_mb, 2),
+        "rows": rows,
+        "helper_rows": helper_rows,
+        "ingest_s": round(t1 - t0, 4),
+        "ir_s": round(t2 - t1, 4),
+        "wall_s": round(t2 - t0, 4),
+        "rows_per_s": _rate(rows, t2 - t0),
+        "mb_per_s": _rate(xml_mb, t2 - t0),
+        "peak_rss_mb": round(overall / _MB, 1) if overall else None,
+        "stages": stages,
+    }
+
+
+def _generate(scale: float, seed: int, out_dir: Path) -> Path:
+    """Write a synthetic export at `scale` (see tools/gen_sparx_model.py)."""
+    # Sibling tool; importable because tools/ is this script's directory.
+    from gen_sparx_model import ModelSpec, generate
+
+    xml = out_dir / f"synthetic-x{scale:g}-s{seed}.xml"
+    with open(xml, "w", encoding="cp1252", newline="") as f:
+        generate(f, ModelSpec(seed=seed).scaled(scale))
+    return xml
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(base: dict[str, Any], head: dict[str, Any], tolerance: float) -> bool:
+    """Print per-stage time ratios head/base; True when nothing regressed."""
+    ok = True
+    if base.get("settings") != head.get("settings"):
+        print(f"note: settings differ (baseline {base.get('settings')})")
+    base_runs = {Path(r["xml"]).name: r for r in base["runs"]}
+    for run in head["runs"]:
+        old = base_runs.get(Path(run["xml"]).name)
+        if old is None:
+            print(f"{Path(run['xml']).name}: not in baseline")
+            continue
+        print(f"{Path(run['xml']).name}")
+        pairs = [("wall", old["wall_s"], run["wall_s"])] + [
+            (stage, old["stages"][stage]["seconds"], m["seconds"])
+            for stage, m in run["stages"].items()
+            if stage in old["stages"]
+        ]
+        for name, was, now in pairs:
+            ratio = now / was if was else float("inf")
+            # Sub-10ms stages are noise; only flag real slowdowns.
+            slow = ratio > 1 + tolerance and now - was > 0.01
+            ok = ok and not slow
+            flag = "  REGRESSION" if slow else ""
+            print(f"  {name:13} {was:>9.4f} -> {now:>9.4f}  x{ratio:5.2f}{flag}")
+    return ok
+
+
+def _print_table(report: dict[str, Any]) -> None:
+    for run in report["runs"]:
+        print(
+            f"{run['xml']}  {run['xml_mb']} MB  rows={run['rows']:,}  "
+            f"wall={run['wall_s']:.3f}s  peak_rss={run['peak_rss_mb']} MB"
+        )
+        print(f"  {'stage':13} {'seconds':>9} {'rows/s':>12} {'MB/s':>9} {'rss MB':>8}")
+        for stage, m in run["stages"].items():
+            print(
+                f"  {stage:13} {m['seconds']:>9.4f} {m['rows_per_s'] or 0:>12,.0f} "
+                f"{m['mb_per_s'] or 0:>9.1f} {m['peak_rss_mb'] or 0:>8.1f}"
+            )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark ingest and IR stages.")
+    ap.add_argument("--xml", type=Path, nargs="*", default=[], help="Exports to ingest")
+    ap.add_argument(
+        "--scale",
+        type=float,
+        nargs="*",
+        default=[],
+        help="Also benchmark synthetic models at these scales (e.g. 10 100)",
+    )
+    ap.add_argument("--seed", type=int, default=0, help="Seed for synthetic models")
+    ap.add_argument(
+        "--engine",
+        choices=loader_duckdb.ENGINE_CHOICES,
+        help="Row engine (default: settings.INGEST_ENGINE)",
+    )
+    ap.add_argument(
+        "--output",
+        choices=loader_duckdb.OUTPUTS,
+        help="Row sink (default: settings.INGEST_OUTPUT)",
+    )
+    ap.add_argument(
+        "--storage",
+        choices=loader_duckdb.STORAGES,
+        help="t_* as views or tables (default: settings.INGEST_STORAGE)",
+    )
+    ap.add_argument("--repeat", type=int, default=1, help="Runs per input (best kept)")
+    ap.add_argument("--out", type=Path, help="Write the JSON report here")
+    ap.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    ap.add_argument("--compare", type=Path, help="Baseline JSON report to diff against")
+    ap.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed slowdown per stage for --compare (default: 0.10 = 10%%)",
+    )
+    args = ap.parse_args()
+    if not args.xml and not args.scale:
+        ap.error("Provide --xml and/or --scale.")
+
+    # Stage timers log at INFO; the report is the output.
+    logging.disable(logging.INFO)
+
+    ingest_args = {
+        "overwrite": True,
+        "engine": args.engine,
+        "output": args.output,
+        "storage": args.storage,
+    }
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="bench-xml-") as gen_dir:
+        inputs = list(args.xml) + [
+            _generate(s, args.seed, Path(gen_dir)) for s in args.scale
+        ]
+        for xml in inputs:
+            results = [bench_one(xml, ingest_args) for _ in range(max(1, args.repeat))]
+            best = min(results, key=lambda r: r["wall_s"])
+            if xml.parent == Path(gen_dir):
+                best["xml"] = xml.name  # temp path means nothing in a report
+            runs.append(best)
+
+    report = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "duckdb": duckdb.__version__,
+        "cpus": os.cpu_count(),
+        "settings": {
+            "engine": args.engine or settings.INGEST_ENGINE,
+            "output": args.output or settings.INGEST_OUTPUT,
+            "storage": args.storage or settings.INGEST_STORAGE,
+            "columns": settings.INGEST_COLUMNS,
+            "extensions": settings.INGEST_EXTENSIONS,
+            "parquet_store": settings.INGEST_PARQUET_STORE,
+        },
+        "process_peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+        "runs": runs,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_table(report)
+    if args.compare:
+        base = json.loads(args.compare.read_text(encoding="utf-8"))
+        if not compare(base, report, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
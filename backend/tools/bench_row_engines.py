@@ -0,0 +1,94 @@
+# ------------------------------------------------------------
+# Module: tools/bench_row_engines.py
+# Purpose: Microbenchmark XML row engines (events/second, rows/second).
+# ------------------------------------------------------------
+
+"""Time each registered row engine over the same XML and report throughput.
+
+"Events" are the XML elements the engines have to interpret (tables, rows,
+columns, extensions); they are counted once up front so every engine is
+measured against the same denominator.
+
+Usage
+-----
+    XML=samples/sparx/v17_1/DellSat-77_System.xml
+    PYTHONPATH=. python tools/bench_row_engines.py --xml "$XML"
+    PYTHONPATH=. python tools/bench_row_engines.py --xml "$XML" --engines one_pass fast
+    PYTHONPATH=. python tools/bench_row_engines.py --xml "$XML" --repeat 5 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+
+from lxml.etree import iterparse
+
+from app.ingest.normalize_rows import ENGINES, get_engine
+
+
+def count_events(xml_path: Path) -> int:
+    """Number of XML elements in the document (one 'event' per element)."""
+    n = 0
+    for _event, elem in iterparse(str(xml_path), events=("end",)):
+        n += 1
+        elem.clear()
+    return n
+
+
+def bench(xml_path: Path, engine: str, repeat: int) -> dict:
+    """Best-of-`repeat` wall time for fully consuming one engine's row stream."""
+    run = get_engine(engine)
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        _schema, row_iter = run(xml_path)
+        rows = sum(1 for _ in row_iter)
+        best = min(best, time.perf_counter() - t0)
+    return {"engine": engine, "seconds": round(best, 4), "rows": rows}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark XML row engines.")
+    ap.add_argument("--xml", type=Path, required=True, help="XML export to parse")
+    ap.add_argument(
+        "--engines",
+        nargs="+",
+        choices=sorted(ENGINES),
+        default=sorted(ENGINES),
+        help="Engines to run (default: all)",
+    )
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per engine (best kept)")
+    ap.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = ap.parse_args()
+
+    # Engine logs (timers, stream summaries) would swamp the report.
+    logging.disable(logging.INFO)
+
+    events = count_events(args.xml)
+    results = []
+    for name in args.engines:
+        r = bench(args.xml, name, max(1, args.repeat))
+        r["events"] = events
+        r["events_per_s"] = round(events / r["seconds"]) if r["seconds"] else None
+        r["rows_per_s"] = round(r["rows"] / r["seconds"]) if r["seconds"] else None
+        results.append(r)
+
+    if args.json:
+        print(json.dumps({"xml": str(args.xml), "results": results}, indent=2))
+        return
+    print(f"xml={args.xml} events={events}")
+    print(f"{'engine':10} {'seconds':>9} {'events/s':>12} {'rows/s':>10}")
+    for r in results:
+        print(
+            f"{r['engine']:10} {r['seconds']:>9.4f} "
+            f"{r['events_per_s']:>12,} {r['rows_per_s']:>10,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,849 @@
+# ------------------------------------------------------------
+# Module: tools/gen_sparx_model.py
+# Purpose: Generate synthetic Sparx EA 17.1 table exports at any scale.
+# ------------------------------------------------------------
+
+"""Write a realistic, deterministic Sparx 17.1 XML export of a SysML model.
+
+The export has the same 14 `t_*` tables, column names, value formats and
+`<Extension>` GUID references as a real one (see
+`samples/sparx/v17_1/DellSat-77_System.xml`), filled with a model of blocks,
+ports, part properties, requirements, generalization chains, port
+connectors, trace links and diagrams. Sizes are configurable, so every
+pipeline stage can be benchmarked at 10x, 100x or 1000x production scale
+without customer data.
+
+Notes
+-----
+- Deterministic: the same options and `--seed` give byte-identical output.
+  Every random choice hashes `(seed, tag, index)`, so rows can be produced
+  in any order without keeping earlier rows (no RNG state, no model in RAM).
+- Streaming: rows are written as they are generated; memory stays flat
+  whatever the size. `.gz` outputs are gzip-compressed on the fly.
+- `--scale` multiplies the model-level counts (blocks, traces, requirements,
+  diagrams); per-block ratios stay fixed. At 1x the model is roughly the size
+  of the DellSat sample. Explicit counts override the scaled ones.
+- Generalizations form chains of `--gen-depth` levels (block i specializes
+  block i-1 inside each chain); `--connector-density` is port connectors per
+  port.
+
+Usage
+-----
+    PYTHONPATH=. python tools/gen_sparx_model.py --out /tmp/x10.xml --scale 10
+    PYTHONPATH=. python tools/gen_sparx_model.py --out /tmp/x1000.xml.gz --scale 1000
+    PYTHONPATH=. python tools/gen_sparx_model.py --out - --blocks 5 --seed 7 | head
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import IO
+
+# Table order of a Sparx 17.1 export.
+TABLES = (
+    "t_package",
+    "t_object",
+    "t_objectconstraint",
+    "t_objectproperties",
+    "t_attribute",
+    "t_attributetag",
+    "t_operation",
+    "t_operationparams",
+    "t_connector",
+    "t_connectortag",
+    "t_diagram",
+    "t_diagramobjects",
+    "t_diagramlinks",
+    "t_xref",
+)
+
+VALUE_TYPES = (
+    "Real", "Integer", "Boolean", "String", "Power", "Mass", "Voltage", "Current",
+)  # fmt: skip
+NOUNS = (
+    "Controller", "Sensor", "Actuator", "Battery", "Receiver", "Transmitter",
+    "Computer", "Camera", "Antenna", "Thruster", "Radiator", "Gyroscope",
+    "Converter", "Harness", "Valve", "Pump", "Bus", "Panel", "Tracker", "Heater",
+)  # fmt: skip
+PORT_STEREOTYPES = ("ProxyPort", "ProxyPort", "ProxyPort", "FullPort", None)
+# (stereotype, Connector_Type, target) of trace links; target "block" or "req".
+TRACE_KINDS = (
+    ("satisfy", "Dependency", "req"),
+    ("trace", "Abstraction", "req"),
+    ("refine", "Abstraction", "req"),
+    ("verify", "Dependency", "req"),
+    ("allocate", "Abstraction", "block"),
+)
+# Fixed package ids; structure subpackages follow.
+ROOT, REQUIREMENTS, STRUCTURE, TYPES, VIEWS = 1, 2, 3, 4, 5
+_TOP_PACKAGES = (
+    (ROOT, "Model", 0),
+    (REQUIREMENTS, "Requirements", ROOT),
+    (STRUCTURE, "Structure", ROOT),
+    (TYPES, "Types", ROOT),
+    (VIEWS, "Views", ROOT),
+)
+# Objects shown per block-definition / requirement diagram.
+DIAGRAM_WINDOW = 12
+STAMP = "2025-10-22 08:27:14"
+NONE = "<none>"
+
+Row = tuple[list[tuple[str, object]], dict[str, str] | None]
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    """Sizes of the generated model (defaults: 1x, about the DellSat sample)."""
+
+    blocks: int = 60
+    ports_per_block: int = 3
+    parts_per_block: int = 2
+    attributes_per_block: int = 2
+    operations_per_block: int = 1
+    connector_density: float = 0.5
+    gen_depth: int = 3
+    traces: int = 40
+    requirements: int = 40
+    diagrams: int = 90
+    blocks_per_package: int = 25
+    seed: int = 0
+
+    def scaled(self, factor: float) -> ModelSpec:
+        """Copy with the model-level counts multiplied by `factor`."""
+        return replace(
+            self,
+            blocks=max(1, round(self.blocks * factor)),
+            traces=round(self.traces * factor),
+            requirements=round(self.requirements * factor),
+            diagrams=round(self.diagrams * factor),
+        )
+
+
+class _Model:
+    """Id layout and random-access choices for one `ModelSpec`."""
+
+    def __init__(self, spec: ModelSpec):
+        self.spec = spec
+        s = spec
+        self.n_ports = s.blocks * s.ports_per_block
+        self.n_parts = s.blocks * s.parts_per_block
+        self.n_iface = max(1, s.blocks // 10)
+        self.subpackages = -(-s.blocks // max(1, s.blocks_per_package))
+        # Object_ID ranges, in t_object order.
+        self.o_vt = 1
+        self.o_iface = self.o_vt + len(VALUE_TYPES)
+        self.o_block = self.o_iface + self.n_iface
+        self.o_port = self.o_block + s.blocks
+        self.o_part = self.o_port + self.n_ports
+        self.o_req = self.o_part + self.n_parts
+        self.o_pkg = self.o_req + s.requirements
+        # Connector_ID ranges, in t_connector order.
+        k = s.gen_depth + 1
+        self.n_gen = s.blocks - -(-s.blocks // k) if s.gen_depth > 0 else 0
+        self.n_wires = round(s.connector_density * self.n_ports)
+        self.c_gen = 1
+        self.c_wire = self.c_gen + self.n_gen
+        self.c_assoc = self.c_wire + self.n_wires
+        self.c_trace = self.c_assoc + self.n_parts
+
+    # ---- deterministic randomness ----
+    def pick(self, tag: str, i: int, n: int) -> int:
+        """Uniform choice in `range(n)` for `(seed, tag, i)`."""
+        h = hashlib.blake2b(f"{self.spec.seed}:{tag}:{i}".encode(), digest_size=8)
+        return int.from_bytes(h.digest(), "big") % n
+
+    def guid(self, kind: str, i: int) -> str:
+        """Sparx-style GUID, e.g. `{00F22088-F793-4cc7-85A8-14870A2DCBF5}`."""
+        h = hashlib.blake2b(
+            f"{self.spec.seed}:{kind}:{i}".encode(), digest_size=16
+        ).hexdigest()
+        g = h.upper()  # Sparx keeps the version group lower-case
+        return f"{{{g[:8]}-{g[8:12]}-4{h[13:16]}-{g[16:20]}-{g[20:]}}}"
+
+    # ---- ids and ownership ----
+    def block_package(self, b: int) -> int:
+        return len(_TOP_PACKAGES) + 1 + b // max(1, self.spec.blocks_per_package)
+
+    def port_block(self, p: int) -> int:
+        return p // self.spec.ports_per_block
+
+    def part_block(self, q: int) -> int:
+        return q // self.spec.parts_per_block
+
+    def part_type(self, q: int) -> int:
+        return self.pick("part-type", q, self.spec.blocks)
+
+    def port_stereotype(self, p: int) -> str | None:
+        return PORT_STEREOTYPES[self.pick("port-stereo", p, len(PORT_STEREOTYPES))]
+
+    def gen_connector(self, b: int) -> int | None:
+        """Connector_ID of block `b`'s generalization (None for chain roots)."""
+        k = self.spec.gen_depth + 1
+        if self.spec.gen_depth <= 0 or b % k == 0:
+            return None
+        return self.c_gen + b - -(-b // k)
+
+    def wire_ends(self, j: int) -> tuple[int, int]:
+        """(source port, target port) of port connector `j` (different blocks)."""
+        src = j % self.n_ports
+        dst = self.pick("wire", j, self.n_ports)
+        if self.spec.blocks > 1 and self.port_block(dst) == self.port_block(src):
+            dst = (dst + self.spec.ports_per_block) % self.n_ports
+        return src, dst
+
+    def trace(self, t: int) -> tuple[str, str, int, int, str, int]:
+        """(stereotype, type, source block, target oid, target kind, target idx)."""
+        stereo, ctype, target = TRACE_KINDS[self.pick("trace", t, len(TRACE_KINDS))]
+        src = self.pick("trace-src", t, self.spec.blocks)
+        if target == "req" and self.spec.requirements > 0:
+            r = self.pick("trace-req", t, self.spec.requirements)
+            return stereo, ctype, src, self.o_req + r, "req", r
+        b = self.pick("trace-dst", t, self.spec.blocks)
+        return stereo, ctype, src, self.o_block + b, "block", b
+
+
+def _esc(value: object) -> str:
+    s = str(value)
+    if "&" in s or "<" in s or ">" in s or '"' in s:
+        s = (
+            s.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;")
+        )
+    return s
+
+
+def _write_table(out: IO[str], name: str, rows: Iterable[Row]) -> int:
+    """Write one `<Table>` in Sparx layout; return its row count."""
+    out.write(f'\t<Table name="{name}">\n')
+    n = 0
+    for cols, ext in rows:
+        parts = ["\t\t<Row>\n"]
+        for col, value in cols:
+            if value is not None:  # Sparx omits empty columns
+                parts.append(f'\t\t\t<Column name="{col}" value="{_esc(value)}"/>\n')
+        if ext:
+            attrs = " ".join(f'{k}="{v}"' for k, v in ext.items())
+            parts.append(f"\t\t\t<Extension {attrs}/>\n")
+        parts.append("\t\t</Row>\n")
+        out.write("".join(parts))
+        n += 1
+    out.write("\t</Table>\n")
+    return n
+
+
+# ---------- tables ----------
+def _packages(m: _Model) -> Iterator[Row]:
+    pkgs = list(_TOP_PACKAGES) + [
+        (len(_TOP_PACKAGES) + 1 + k, f"Subsystem {k + 1}", STRUCTURE)
+        for k in range(m.subpackages)
+    ]
+    for pid, name, parent in pkgs:
+        yield (
+            [
+                ("Package_ID", pid),
+                ("Name", name),
+                ("Parent_ID", parent),
+                ("CreatedDate", STAMP),
+                ("ModifiedDate", STAMP),
+                ("ea_guid", m.guid("package", pid)),
+                ("IsControlled", 0),
+                ("Version", "1.0"),
+                ("Protected", 0),
+                ("UseDTD", 0),
+                ("LogXML", 0),
+            ],
+            {"Parent_ID": m.guid("package", parent)} if parent else None,
+        )
+
+
+def _object(
+    m: _Model,
+    oid: int,
+    otype: str,
+    name: str,
+    package: int,
+    guid: str,
+    stereotype: str | None = None,
+    parent: tuple[int, str] | None = None,
+    pdata1: str | None = None,
+    gen_type: str = "Java",
+) -> Row:
+    cols: list[tuple[str, object]] = [
+        ("Object_ID", oid),
+        ("Object_Type", otype),
+        ("Diagram_ID", 0),
+        ("Name", name),
+        ("Author", "generator"),
+        ("Version", "1.0"),
+        ("Package_ID", package),
+        ("Stereotype", stereotype),
+        ("NType", 0),
+        ("Complexity", 1),
+        ("Effort", 0),
+        ("Backcolor", -1),
+        ("BorderStyle", 0),
+        ("BorderWidth", -1),
+        ("Fontcolor", -1),
+        ("Bordercolor", -1),
+        ("CreatedDate", STAMP),
+        ("ModifiedDate", STAMP),
+        ("Status", "Proposed"),
+        ("Abstract", 0),
+        ("Tagged", 0),
+        ("PDATA1", pdata1),
+        ("GenType", gen_type),
+        ("Phase", "1.0"),
+        ("Scope", "Public"),
+        ("Classifier", 0),
+        ("ea_guid", guid),
+        ("ParentID", parent[0] if parent else 0),
+        ("IsRoot", 0),
+        ("IsLeaf", 0),
+        ("IsSpec", 0),
+        ("IsActive", 0),
+    ]
+    ext = {"Package_ID": m.guid("package", package)}
+    if parent:
+        ext["ParentID"] = parent[1]
+    if pdata1 and pdata1.startswith("{"):
+        ext["PDATA1"] = pdata1
+    return cols, ext
+
+
+def _objects(m: _Model) -> Iterator[Row]:
+    s = m.spec
+    for i, name in enumerate(VALUE_TYPES):
+        yield _object(
+            m, m.o_vt + i, "DataType", name, TYPES, m.guid("vt", i), "ValueType"
+        )
+    for i in range(m.n_iface):
+        yield _object(
+            m, m.o_iface + i, "Class", f"Interface {i + 1}", TYPES,
+            m.guid("iface", i), "InterfaceBlock",
+        )  # fmt: skip
+    for b in range(s.blocks):
+        name = f"{NOUNS[m.pick('noun', b, len(NOUNS))]} {b + 1}"
+        yield _object(
+            m, m.o_block + b, "Class", name, m.block_package(b),
+            m.guid("block", b), "block",
+        )  # fmt: skip
+    for p in range(m.n_ports):
+        b = m.port_block(p)
+        yield _object(
+            m, m.o_port + p, "Port", f"p{p % s.ports_per_block + 1}",
+            m.block_package(b), m.guid("port", p), m.port_stereotype(p),
+            parent=(m.o_block + b, m.guid("block", b)),
+            pdata1=m.guid("iface", m.pick("port-type", p, m.n_iface)),
+            gen_type=NONE,
+        )  # fmt: skip
+    for q in range(m.n_parts):
+        b, t = m.part_block(q), m.part_type(q)
+        yield _object(
+            m, m.o_part + q, "Part", f"part{q % s.parts_per_block + 1}",
+            m.block_package(b), m.guid("part", q), "PartProperty",
+            parent=(m.o_block + b, m.guid("block", b)),
+            pdata1=m.guid("block", t),
+        )  # fmt: skip
+    for r in range(s.requirements):
+        yield _object(
+            m, m.o_req + r, "Requirement", f"Requirement {r + 1}", REQUIREMENTS,
+            m.guid("req", r), "requirement", gen_type=NONE,
+        )  # fmt: skip
+    for k, (pid, name, parent) in enumerate(
+        [p for p in _TOP_PACKAGES if p[2]]
+        + [
+            (len(_TOP_PACKAGES) + 1 + k, f"Subsystem {k + 1}", STRUCTURE)
+            for k in range(m.subpackages)
+        ]
+    ):
+        yield _object(
+            m, m.o_pkg + k, "Package", name, parent, m.guid("package", pid),
+            pdata1=str(pid),
+        )  # fmt: skip
+
+
+def _constraints(m: _Model) -> Iterator[Row]:
+    for b in range(0, m.spec.blocks, 10):
+        yield (
+            [
+                ("Object_ID", m.o_block + b),
+                ("Constraint", f"mass <= {100 + m.pick('mass', b, 900)}"),
+                ("ConstraintType", "Invariant"),
+                ("Weight", "0.000000"),
+            ],
+            {"Object_ID": m.guid("block", b)},
+        )
+
+
+def _properties(m: _Model) -> Iterator[Row]:
+    pid = 0
+    for r in range(m.spec.requirements):
+        for prop, value in (
+            ("id", f"REQ-{r + 1}"),
+            ("text", f"The system shall satisfy condition {r + 1}."),
+        ):
+            pid += 1
+            yield (
+                [
+                    ("PropertyID", pid),
+                    ("Object_ID", m.o_req + r),
+                    ("Property", prop),
+                    ("Value", value),
+                    ("ea_guid", m.guid("objprop", pid)),
+                ],
+                {"Object_ID": m.guid("req", r)},
+            )
+
+
+def _attributes(m: _Model) -> Iterator[Row]:
+    per = m.spec.attributes_per_block
+    for a in range(m.spec.blocks * per):
+        b = a // per
+        vt = m.pick("attr-type", a, len(VALUE_TYPES))
+        yield (
+            [
+                ("Object_ID", m.o_block + b),
+                ("Name", f"value{a % per + 1}"),
+                ("Scope", "Public"),
+                ("IsStatic", 0),
+                ("IsCollection", 0),
+                ("IsOrdered", 0),
+                ("AllowDuplicates", 0),
+                ("Derived", 0),
+                ("ID", a + 1),
+                ("Pos", a % per),
+                ("Const", 0),
+                ("Classifier", m.o_vt + vt),
+                ("Type", VALUE_TYPES[vt]),
+                ("ea_guid", m.guid("attr", a)),
+                ("StyleEx", "IsLiteral=0;"),
+            ],
+            {"Object_ID": m.guid("block", b), "Classifier": m.guid("vt", vt)},
+        )
+
+
+def _attribute_tags(m: _Model) -> Iterator[Row]:
+    for n, a in enumerate(range(0, m.spec.blocks * m.spec.attributes_per_block, 4)):
+        yield (
+            [
+                ("PropertyID", n + 1),
+                ("ElementID", a + 1),
+                ("Property", "unit"),
+                ("VALUE", "SI"),
+                ("ea_guid", m.guid("attrtag", n)),
+            ],
+            {"ElementID": m.guid("attr", a)},
+        )
+
+
+def _operations(m: _Model) -> Iterator[Row]:
+    per = m.spec.operations_per_block
+    for o in range(m.spec.blocks * per):
+        b = o // per
+        yield (
+            [
+                ("OperationID", o + 1),
+                ("Object_ID", m.o_block + b),
+                ("Name", f"operate{o % per + 1}"),
+                ("Scope", "Public"),
+                ("Pure", 0),
+                ("IsRoot", 0),
+                ("IsLeaf", 0),
+                ("IsQuery", 0),
+                ("ea_guid", m.guid("op", o)),
+            ],
+            {"Object_ID": m.guid("block", b)},
+        )
+
+
+def _operation_params(m: _Model) -> Iterator[Row]:
+    for o in range(m.spec.blocks * m.spec.operations_per_block):
+        vt = m.pick("param-type", o, len(VALUE_TYPES))
+        yield (
+            [
+                ("OperationID", o + 1),
+                ("Name", "setpoint"),
+                ("Type", VALUE_TYPES[vt]),
+                ("Pos", 0),
+                ("Const", 0),
+                ("Kind", "in"),
+                ("Classifier", m.o_vt + vt),
+                ("ea_guid", m.guid("param", o)),
+            ],
+            {"OperationID": m.guid("op", o), "Classifier": m.guid("vt", vt)},
+        )
+
+
+def _connector(
+    m: _Model,
+    cid: int,
+    ctype: str,
+    start: tuple[int, str],
+    end: tuple[int, str],
+    stereotype: str | None = None,
+    direction: str = "Source -> Destination",
+    source_aggregate: int = 0,
+) -> Row:
+    return (
+        [
+            ("Connector_ID", cid),
+            ("Direction", direction),
+            ("Connector_Type", ctype),
+            ("SourceIsAggregate", source_aggregate),
+            ("SourceIsOrdered", 0),
+            ("DestIsAggregate", 0),
+            ("DestIsOrdered", 0),
+            ("Start_Object_ID", start[0]),
+            ("End_Object_ID", end[0]),
+            ("Start_Edge", 0),
+            ("End_Edge", 0),
+            ("PtStartX", 0),
+            ("PtStartY", 0),
+            ("PtEndX", 0),
+            ("PtEndY", 0),
+            ("SeqNo", 0),
+            ("HeadStyle", 0),
+            ("LineStyle", 0),
+            ("RouteStyle", 0),
+            ("IsBold", 0),
+            ("LineColor", 0),
+            ("Stereotype", stereotype),
+            ("DiagramID", 0),
+            ("ea_guid", m.guid("connector", cid)),
+        ],
+        {"Start_Object_ID": start[1], "End_Object_ID": end[1]},
+    )
+
+
+def _connectors(m: _Model) -> Iterator[Row]:
+    s = m.spec
+
+    def block(b: int) -> tuple[int, str]:
+        return m.o_block + b, m.guid("block", b)
+
+    for b in range(s.blocks):
+        cid = m.gen_connector(b)
+        if cid is not None:
+            yield _connector(m, cid, "Generalization", block(b), block(b - 1))
+    for j in range(m.n_wires):
+        src, dst = m.wire_ends(j)
+        yield _connector(
+            m, m.c_wire + j, "Connector",
+            (m.o_port + src, m.guid("port", src)),
+            (m.o_port + dst, m.guid("port", dst)),
+            direction="Unspecified",
+        )  # fmt: skip
+    for q in range(m.n_parts):
+        yield _connector(
+            m, m.c_assoc + q, "Association",
+            block(m.part_block(q)), block(m.part_type(q)), source_aggregate=2,
+        )  # fmt: skip
+    for t in range(s.traces):
+        stereo, ctype, src, dst_oid, kind, dst = m.trace(t)
+        yield _connector(
+            m, m.c_trace + t, ctype, block(src), (dst_oid, m.guid(kind, dst)), stereo
+        )
+
+
+def _connector_tags(m: _Model) -> Iterator[Row]:
+    for n, j in enumerate(range(0, m.n_wires, 10)):
+        cid = m.c_wire + j
+        yield (
+            [
+                ("PropertyID", n + 1),
+                ("ElementID", cid),
+                ("Property", "conveyed"),
+                ("VALUE", "Signal"),
+                ("ea_guid", m.guid("conntag", n)),
+            ],
+            {"ElementID": m.guid("connector", cid)},
+        )
+
+
+def _diagram_content(m: _Model, d: int) -> tuple[str, list[tuple[int, str]], list[int]]:
+    """(kind, shown objects as (oid, guid), shown connector ids) of diagram `d`."""
+    s = m.spec
+    kind = ("bdd", "ibd", "req")[d % 3]
+    if kind == "req" and s.requirements == 0:
+        kind = "bdd"
+    n = d // 3
+    if kind == "ibd":
+        b = n % s.blocks
+        objs = [(m.o_block + b, m.guid("block", b))]
+        ports = range(b * s.ports_per_block, (b + 1) * s.ports_per_block)
+        objs += [(m.o_port + p, m.guid("port", p)) for p in ports]
+        parts = range(b * s.parts_per_block, (b + 1) * s.parts_per_block)
+        objs += [(m.o_part + q, m.guid("part", q)) for q in parts]
+        links = [
+            m.c_wire + j
+            for p in ports
+            for j in range(p, m.n_wires, max(1, m.n_ports))
+        ]
+        return kind, objs, links
+    if kind == "req":
+        start = n * DIAGRAM_WINDOW % s.requirements
+        shown = range(start, min(start + DIAGRAM_WINDOW, s.requirements))
+        return kind, [(m.o_req + r, m.guid("req", r)) for r in shown], []
+    start = n * DIAGRAM_WINDOW % s.blocks
+    shown = range(start, min(start + DIAGRAM_WINDOW, s.blocks))
+    links = [
+        cid
+        for b in shown
+        if b > start and (cid := m.gen_connector(b)) is not None
+    ]
+    return kind, [(m.o_block + b, m.guid("block", b)) for b in shown], links
+
+
+_DIAGRAM_KINDS = {
+    "bdd": ("Logical", "Block Definition", "MDGDgm=SysML1.4::BlockDefinition;"),
+    "ibd": ("CompositeStructure", "Internal Block", "MDGDgm=SysML1.4::InternalBlock;"),
+    "req": ("Custom", "Requirements", "MDGDgm=SysML1.4::Requirement;"),
+}
+
+
+def _diagrams(m: _Model) -> Iterator[Row]:
+    for d in range(m.spec.diagrams):
+        kind = _diagram_content(m, d)[0]
+        dtype, label, style = _DIAGRAM_KINDS[kind]
+        package, parent, ext = VIEWS, 0, {}
+        if kind == "ibd":
+            b = d // 3 % m.spec.blocks
+            package, parent = m.block_package(b), m.o_block + b
+            ext["ParentID"] = m.guid("block", b)
+        ext["Package_ID"] = m.guid("package", package)
+        yield (
+            [
+                ("Diagram_ID", d + 1),
+                ("Package_ID", package),
+                ("ParentID", parent),
+                ("Diagram_Type", dtype),
+                ("Name", f"{label} {d + 1}"),
+                ("Version", "1.0"),
+                ("ShowDetails", 0),
+                ("AttPub", 1),
+                ("AttPri", 1),
+                ("AttPro", 1),
+                ("Orientation", "P"),
+                ("cx", 795),
+                ("cy", 1138),
+                ("Scale", 100),
+                ("CreatedDate", STAMP),
+                ("ModifiedDate", STAMP),
+                ("ShowForeign", 0),
+                ("ShowBorder", 1),
+                ("ShowPackageContents", 0),
+                ("Locked", 0),
+                ("ea_guid", m.guid("diagram", d)),
+                ("StyleEx", style),
+            ],
+            ext,
+        )
+
+
+def _diagram_objects(m: _Model) -> Iterator[Row]:
+    instance = 0
+    for d in range(m.spec.diagrams):
+        for seq, (oid, guid) in enumerate(_diagram_content(m, d)[1]):
+            instance += 1
+            top, left = -40 - 120 * (seq // 4), 40 + 220 * (seq % 4)
+            yield (
+                [
+                    ("Diagram_ID", d + 1),
+                    ("Object_ID", oid),
+                    ("RectTop", top),
+                    ("RectLeft", left),
+                    ("RectRight", left + 180),
+                    ("RectBottom", top - 80),
+                    ("Sequence", seq + 1),
+                    ("ObjectStyle", f"DUID={guid[1:9]};fontsz=100;"),
+                    ("Instance_ID", instance),
+                ],
+                {"Diagram_ID": m.guid("diagram", d), "Object_ID": guid},
+            )
+
+
+def _diagram_links(m: _Model) -> Iterator[Row]:
+    instance = 0
+    for d in range(m.spec.diagrams):
+        for cid in _diagram_content(m, d)[2]:
+            instance += 1
+            yield (
+                [
+                    ("DiagramID", d + 1),
+                    ("ConnectorID", cid),
+                    ("Geometry", "SX=0;SY=0;EX=0;EY=0;EDGE=2;"),
+                    ("Style", "Mode=3;"),
+                    ("Hidden", 0),
+                    ("Instance_ID", instance),
+                ],
+                {
+                    "DiagramID": m.guid("diagram", d),
+                    "ConnectorID": m.guid("connector", cid),
+                },
+            )
+
+
+def _xref(m: _Model, n: int, name: str, xtype: str, desc: str, client: str) -> Row:
+    return (
+        [
+            ("XrefID", m.guid("xref", n)),
+            ("Name", name),
+            ("Type", xtype),
+            ("Visibility", "Public"),
+            ("Partition", 0),
+            ("Description", desc),
+            ("Client", client),
+            ("Supplier", NONE),
+        ],
+        None,
+    )
+
+
+def _stereo(name: str) -> str:
+    return f"@STEREO;Name={name};FQName=SysML1.4::{name};@ENDSTEREO;"
+
+
+_CONJUGATED = (
+    "@PROP=@NAME=isConjugated@ENDNAME;@TYPE=Boolean@ENDTYPE;"
+    "@VALU=0@ENDVALU;@PRMT=@ENDPRMT;@ENDPROP;"
+)
+
+
+def _xrefs(m: _Model) -> Iterator[Row]:
+    s = m.spec
+    n = 0
+    el, conn = "element property", "connector property"
+    groups: list[tuple[str, int, str | None]] = [
+        ("vt", len(VALUE_TYPES), "ValueType"),
+        ("iface", m.n_iface, "InterfaceBlock"),
+        ("block", s.blocks, "block"),
+        ("part", m.n_parts, "PartProperty"),
+        ("req", s.requirements, "requirement"),
+    ]
+    for kind, count, stereo in groups:
+        for i in range(count):
+            n += 1
+            yield _xref(m, n, "Stereotypes", el, _stereo(str(stereo)), m.guid(kind, i))
+    for p in range(m.n_ports):
+        guid = m.guid("port", p)
+        stereo = m.port_stereotype(p)
+        if stereo:
+            n += 1
+            yield _xref(m, n, "Stereotypes", el, _stereo(stereo), guid)
+        n += 1
+        yield _xref(m, n, "CustomProperties", el, _CONJUGATED, guid)
+    for t in range(s.traces):
+        n += 1
+        cid = m.c_trace + t
+        yield _xref(
+            m, n, "Stereotypes", conn, _stereo(m.trace(t)[0]), m.guid("connector", cid)
+        )
+
+
+_TABLE_ROWS = {
+    "t_package": _packages,
+    "t_object": _objects,
+    "t_objectconstraint": _constraints,
+    "t_objectproperties": _properties,
+    "t_attribute": _attributes,
+    "t_attributetag": _attribute_tags,
+    "t_operation": _operations,
+    "t_operationparams": _operation_params,
+    "t_connector": _connectors,
+    "t_connectortag": _connector_tags,
+    "t_diagram": _diagrams,
+    "t_diagramobjects": _diagram_objects,
+    "t_diagramlinks": _diagram_links,
+    "t_xref": _xrefs,
+}
+
+
+def generate(out: IO[str], spec: ModelSpec) -> dict[str, int]:
+    """Stream the export for `spec` to `out`; return rows written per table."""
+    m = _Model(spec)
+    out.write('<?xml version="1.0" encoding="windows-1252" standalone="no" ?>\n')
+    out.write(f'<Package name="Data" guid="{m.guid("export", 0)}">\n')
+    counts = {t: _write_table(out, t, _TABLE_ROWS[t](m)) for t in TABLES}
+    out.write("</Package>\n")
+    return counts
+
+
+def _open(path: str) -> IO[str]:
+    if path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        # Level 1: compression must not become the bottleneck for multi-GB runs.
+        return gzip.open(path, "wt", encoding="cp1252", compresslevel=1, newline="")
+    return open(path, "w", encoding="cp1252", newline="", buffering=1 << 20)
+
+
+def main() -> None:
+    defaults = ModelSpec()
+    ap = argparse.ArgumentParser(description="Generate a synthetic Sparx 17.1 export.")
+    ap.add_argument(
+        "--out", required=True, help="Output file ('-' = stdout, *.gz = gzip)"
+    )
+    ap.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply model-level counts (1x)"
+    )
+    for f in fields(ModelSpec):
+        ap.add_argument(
+            f"--{f.name.replace('_', '-')}",
+            type=type(getattr(defaults, f.name)),
+            default=None,
+            help=f"(default at 1x: {getattr(defaults, f.name)})",
+        )
+    ap.add_argument("--json", action="store_true", help="Print a JSON summary")
+    args = ap.parse_args()
+
+    spec = defaults.scaled(args.scale)
+    overrides = {
+        f.name: getattr(args, f.name)
+        for f in fields(ModelSpec)
+        if getattr(args, f.name) is not None
+    }
+    spec = replace(spec, **overrides)
+    if spec.blocks < 1 or spec.ports_per_block < 0 or spec.parts_per_block < 0:
+        ap.error("--blocks must be >= 1 and per-block counts >= 0")
+
+    t0 = time.perf_counter()
+    out = _open(args.out)
+    try:
+        counts = generate(out, spec)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    seconds = time.perf_counter() - t0
+
+    summary = {
+        "out": args.out,
+        "spec": {f.name: getattr(spec, f.name) for f in fields(ModelSpec)},
+        "rows": counts,
+        "total_rows": sum(counts.values()),
+        "bytes": None if args.out == "-" else Path(args.out).stat().st_size,
+        "seconds": round(seconds, 3),
+    }
+    # stdout may carry the export itself.
+    report = sys.stderr if args.out == "-" else sys.stdout
+    if args.json:
+        print(json.dumps(summary, indent=2), file=report)
+        return
+    print(
+        f"wrote {args.out} rows={summary['total_rows']:,} "
+        f"bytes={summary['bytes'] or 0:,} seconds={seconds:.2f}",
+        file=report,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@
 from __future__ import annotations
 import argparse
 from pathlib import Path
-from app.core.orchestrator import run, compute_model_id
+from app.core.orchestrator import EXECUTORS, compute_model_id, run
+from app.services.batch import run_batch
 
 
 def main() -> None:
@@ -15,8 +16,59 @@ def main() -> None:
     ap.add_argument("--model-id", type=str, help="Stable id (sha256[:8]). If omitted, derived from --xml.", required=False)
     ap.add_argument("--no-rag", action="store_true", help="Skip building rag.sqlite.")
     ap.add_argument("--overwrite", action="store_true", help="Force re-ingest if artifacts already exist.")
+    ap.add_argument(
+        "--executor",
+        choices=EXECUTORS,
+        help="Run stages in this process or one subprocess each "
+        "(default: settings.PIPELINE_EXECUTOR).",
+    )
+    ap.add_argument(
+        "--batch",
+        type=str,
+        help="Directory or glob of exports; runs each as a job in a process pool.",
+    )
+    ap.add_argument(
+        "--workers",
+        type=int,
+        help="Batch: max concurrent models (default: bounded by cores and memory).",
+    )
+    ap.add_argument(
+        "--report",
+        type=Path,
+        help="Batch: JSON report path (default: data/batches/batch-<ts>.json).",
+    )
+    ap.add_argument(
+        "--vendor",
+        type=str,
+        default="sparx",
+        help="Batch: vendor recorded on each job.",
+    )
+    ap.add_argument(
+        "--version",
+        type=str,
+        default="17.1",
+        help="Batch: vendor version recorded on each job.",
+    )
     args = ap.parse_args()
 
+    # Batch mode: one job per export (skips content that already succeeded).
+    if args.batch:
+        report = run_batch(
+            args.batch,
+            vendor=args.vendor,
+            version=args.version,
+            workers=args.workers,
+            report_path=args.report,
+            executor=args.executor,
+        )
+        print(f"\n=== BATCH: {report['totals']} workers={report['workers']} ===")
+        for m in report["models"]:
+            print(f"{m['status']:10} {m.get('model_id') or '-':9} {m['xml']}")
+        print(f"report           {report['report_path']}")
+        if report["totals"].get("failed"):
+            exit(1)
+        return
+
     # Preconditions: require either --xml (to derive id) or --model-id (to reuse artifacts).
     # `ap.error(...)` triggers SystemExit; callers should expect the process to exit here.
     if not args.model_id and not args.xml:
@@ -34,11 +86,14 @@ def main() -> None:
         overwrite=args.overwrite,
         build_rag=not args.no_rag,
         run_predicates=True,
+        executor=args.executor,
     )
 
     print(f"\n=== OK: model_id={res.model_id} ===")
     for k, v in res.artifacts.items():
         print(f"{k:16} {v}")
+    for stage, seconds in res.timings.items():
+        print(f"{stage + ' s':16} {seconds}")
         
 
 if __name__ == "__main__":